@@ -16,6 +16,12 @@ from datetime import datetime, timedelta
 from async_manager import prevent_concurrent_callback, setup_async_safety
 from admin_permissions import SystemAction, PermissionGroup, require_permission, require_any_permission, require_draw_permission_with_time_check
 
+try:
+    from telegram_outbox import get_outbound_queue
+except ImportError:
+    # Giveaway bot running standalone, without the main bot's modules on the path
+    get_outbound_queue = None
+
 from admin_permissions import (
     AdminPermissionManager, 
     SystemAction, 
@@ -412,8 +418,8 @@ class MultiGiveawayIntegration:
             if error:
                 message += f"🐛 Error: {error[:100]}..."
                 
-            await self.app.bot.send_message(
-                chat_id=self.admin_id,
+            await self._notify_admins(
+                self.app.bot, [self.admin_id],
                 text=message,
                 parse_mode='HTML'
             )
@@ -769,8 +775,8 @@ class MultiGiveawayIntegration:
 ⚠️ <b>Impact:</b> Participants may need to be notified of delay."""
 
             # Send to main admin
-            await self.app.bot.send_message(
-                chat_id=self.admin_id,
+            await self._notify_admins(
+                self.app.bot, [self.admin_id],
                 text=error_message,
                 parse_mode='HTML'
             )
@@ -813,8 +819,8 @@ class MultiGiveawayIntegration:
             else:
                 return  # No message to send
             
-            await self.app.bot.send_message(
-                chat_id=admin_channel_id,
+            await self._notify_admins(
+                self.app.bot, [admin_channel_id],
                 text=message,
                 parse_mode='HTML'
             )
@@ -1505,6 +1511,18 @@ Please send only your MT5 account number.
             await update.message.reply_text(f"❌ Error getting pending {giveaway_type} winners")
 
 
+    async def _notify_admins(self, bot, admin_ids, **kwargs):
+        """Send an admin alert through the bot's shared outbound queue (direct sends when standalone)"""
+        if get_outbound_queue is not None:
+            get_outbound_queue(bot).notify_admins(admin_ids, **kwargs)
+            return
+        
+        for admin_id in admin_ids:
+            try:
+                await bot.send_message(chat_id=admin_id, **kwargs)
+            except Exception as e:
+                logging.error(f"Error sending notification to admin {admin_id}: {e}")
+
     async def notify_payment_admins_new_winner(self, context, winner, giveaway_type, executed_by):
         """Notificar a admins con permisos de confirmación - movido desde test_botTTT.py"""
         permission_manager = get_permission_manager(context)
@@ -1543,16 +1561,11 @@ Please send only your MT5 account number.
 
 🎯 <b>Your permission level allows you to confirm this payment.</b>"""
         
-        for admin_id in admins_who_can_confirm:
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id,
-                    text=notification_message,
-                    parse_mode='HTML'
-                )
-                print(f"✅ Payment notification sent to admin {admin_id}")
-            except Exception as e:
-                logging.error(f"Error sending notification to admin {admin_id}: {e}")
+        await self._notify_admins(
+            context.bot, admins_who_can_confirm,
+            text=notification_message,
+            parse_mode='HTML'
+        )
 
 
     @require_permission(SystemAction.CONFIRM_DAILY_PAYMENTS)
@@ -5235,8 +5248,8 @@ Please send only your MT5 account number.
                     prize = giveaway_system.get_prize_amount(giveaway_type)
                     message = f"⚠️ <b>{giveaway_type.upper()} REMINDER</b>\n\nYou have <b>{pending_count}</b> pending {giveaway_type} winner(s) waiting for payment confirmation.\n\n💰 <b>Prize amount:</b> ${prize} USD each\n\nUse `/admin_pending_{giveaway_type}` to view details."
                     
-                    await self.app.bot.send_message(
-                        chat_id=self.admin_id,
+                    await self._notify_admins(
+                        self.app.bot, [self.admin_id],
                         text=message,
                         parse_mode='HTML'
                     )
@@ -5260,8 +5273,8 @@ Please send only your MT5 account number.
                     message += "\n".join(pending_details)
                     message += f"\n\nUse `/admin_pending_winners` to view all details."
                     
-                    await self.app.bot.send_message(
-                        chat_id=self.admin_id,
+                    await self._notify_admins(
+                        self.app.bot, [self.admin_id],
                         text=message,
                         parse_mode='HTML'
                     )
@@ -5400,8 +5413,8 @@ Please send only your MT5 account number.
                 
                 message += f"\n🔧 Please check the system immediately."
                 
-                await self.app.bot.send_message(
-                    chat_id=self.admin_id,
+                await self._notify_admins(
+                    self.app.bot, [self.admin_id],
                     text=message,
                     parse_mode='HTML'
                 )
@@ -5576,8 +5589,8 @@ Please send only your MT5 account number.
                     report_message += f"\n\n🚨 <b>Issues:</b>\n"
                     report_message += "\n".join(f"• {issue}" for issue in health_report['issues'][:3])
                 
-                await self.app.bot.send_message(
-                    chat_id=self.admin_id,
+                await self._notify_admins(
+                    self.app.bot, [self.admin_id],
                     text=report_message,
                     parse_mode='HTML'
                 )
@@ -12,6 +12,12 @@ from async_manager import require_giveaway_lock, require_file_safety
 import threading
 import asyncio
 
+try:
+    from mySQL.account_lookup import get_account_lookup
+except ImportError:
+    # Giveaway bot running standalone, without the main bot's modules on the path
+    get_account_lookup = None
+
 
 
 
@@ -708,7 +714,7 @@ class GiveawaySystem:
                     return True
             
             # VALIDATION 4: Validate MT5 account with API
-            validation_result = self.validate_mt5_account(mt5_account)
+            validation_result = await self.validate_mt5_account_async(mt5_account)
             
             if not validation_result['valid']:
                 error_type = validation_result['error_type']
@@ -807,36 +813,37 @@ class GiveawaySystem:
     def validate_mt5_account(self, account_number):
         """✅ ORIGINAL: Validate MT5 account using API (no changes needed)"""
         try:
-            account_info = self._simulate_mt5_api(account_number)
-            
-            if account_info is None:
-                return {
-                    'valid': False,
-                    'error_type': 'not_found',
-                    'message': 'Account not found'
-                }
-            
-            if not account_info.get('is_live', False):
-                return {
-                    'valid': False,
-                    'error_type': 'not_live',
-                    'message': 'Account is not LIVE'
-                }
-            
-            balance = account_info.get('balance', 0)
-            if balance < self.min_balance:
-                return {
-                    'valid': False,
-                    'error_type': 'insufficient_balance',
-                    'balance': balance,
-                    'message': f'Insufficient balance: ${balance}'
-                }
-            
+            return self._validation_result(self._simulate_mt5_api(account_number))
+        except Exception as e:
+            self.logger.error(f"Error validating MT5 account: {e}")
             return {
-                'valid': True,
-                'balance': balance,
-                'message': 'Valid account'
+                'valid': False,
+                'error_type': 'api_error',
+                'message': 'Validation error'
             }
+    
+    async def validate_mt5_account_async(self, account_number):
+        """Validate against the live MT5 database through the async account lookup (simulated API when standalone)"""
+        if get_account_lookup is None:
+            return self.validate_mt5_account(account_number)
+        
+        try:
+            # Runs on the lookup thread pool with a timeout, so a slow query doesn't stall other users
+            result = await get_account_lookup().verify_account(account_number)
+            
+            if result.get('exists'):
+                account_info = {
+                    'exists': True,
+                    'is_live': result.get('is_real_account', False),
+                    'balance': float(result.get('balance', 0)),
+                    'currency': 'USD'
+                }
+            elif result.get('error'):
+                raise RuntimeError(result['error'])
+            else:
+                account_info = None
+            
+            return self._validation_result(account_info)
             
         except Exception as e:
             self.logger.error(f"Error validating MT5 account: {e}")
@@ -846,6 +853,37 @@ class GiveawaySystem:
                 'message': 'Validation error'
             }
     
+    def _validation_result(self, account_info):
+        """Map account info ({'is_live', 'balance'} or None) to a validation result"""
+        if account_info is None:
+            return {
+                'valid': False,
+                'error_type': 'not_found',
+                'message': 'Account not found'
+            }
+        
+        if not account_info.get('is_live', False):
+            return {
+                'valid': False,
+                'error_type': 'not_live',
+                'message': 'Account is not LIVE'
+            }
+        
+        balance = account_info.get('balance', 0)
+        if balance < self.min_balance:
+            return {
+                'valid': False,
+                'error_type': 'insufficient_balance',
+                'balance': balance,
+                'message': f'Insufficient balance: ${balance}'
+            }
+        
+        return {
+            'valid': True,
+            'balance': balance,
+            'message': 'Valid account'
+        }
+    
     def _simulate_mt5_api(self, account_number):
         """✅ ORIGINAL: MT5 API simulation (no changes needed)"""
         test_accounts = {
@@ -22,7 +22,9 @@ from local_DB.db_manager import TradingBotDatabase
 from local_DB.vfx_Scheduler import VFXMessageScheduler
 from mySQL.mysql_manager import get_mysql_connection
 from configs.config import Config
+from telegram_outbox import get_outbound_queue
 from mySQL.mysql_manager import get_mysql_connection
+from mySQL.account_lookup import get_account_lookup
 
 from tradingSignals.SignalAlgo import SignalBot
 class ForwardedMessageFilter(MessageFilter):
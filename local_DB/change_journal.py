@@ -0,0 +1,126 @@
+import os
+import json
+import glob
+import threading
+from datetime import datetime
+
+class ChangeJournal:
+    """Append-only newline-delimited JSON log of table mutations.
+
+    Each record is a small sequential append. Compaction rotates the active file
+    into a numbered segment, the caller snapshots the table, and the segment is
+    discarded once the snapshot is safely on disk.
+    """
+
+    def __init__(self, path, fsync=False, read_only=False):
+        """Open (or create) the journal at the given path.
+
+        A read-only journal can only be replayed; it never creates, appends to
+        or rotates the files another process is writing.
+        """
+        self.path = path
+        self.fsync = fsync
+        self.read_only = read_only
+        self.records_since_compaction = 0
+        self._lock = threading.Lock()
+
+        if read_only:
+            self._file = None
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _check_writable(self):
+        if self.read_only:
+            raise PermissionError(f"Journal {self.path} is opened read-only")
+
+    def append(self, op, key, fields):
+        """Append a single mutation record."""
+        record = {
+            "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "op": op,
+            "key": key,
+            "fields": fields
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str)
+
+        self._check_writable()
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.records_since_compaction += 1
+
+    def append_many(self, op, changes):
+        """Append one mutation record per (key, fields) pair with a single write."""
+        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        lines = "".join(
+            json.dumps({"ts": ts, "op": op, "key": key, "fields": fields}, ensure_ascii=False, default=str) + "\n"
+            for key, fields in changes
+        )
+        if not lines:
+            return
+
+        self._check_writable()
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.records_since_compaction += len(changes)
+
+    def _segments(self):
+        """Return rotated segment paths, oldest first."""
+        return sorted(
+            glob.glob(f"{self.path}.*.segment"),
+            key=lambda p: int(p.rsplit(".", 2)[-2])
+        )
+
+    def replay(self):
+        """Yield every record from rotated segments and the active journal, in order."""
+        for path in self._segments() + [self.path]:
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final write after a crash; everything before it is intact
+                        print(f"Skipping corrupt journal record {path}:{line_no}")
+
+    def rotate(self):
+        """Move the active journal into a new segment and start an empty one."""
+        self._check_writable()
+        with self._lock:
+            self._file.close()
+            segment = f"{self.path}.{int(datetime.now().timestamp() * 1000)}.segment"
+            while os.path.exists(segment):
+                stamp = int(segment.rsplit(".", 2)[-2]) + 1
+                segment = f"{self.path}.{stamp}.segment"
+            os.replace(self.path, segment)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            self.records_since_compaction = 0
+        return segment
+
+    def discard_through(self, segment):
+        """Delete the given segment and every older one."""
+        stamp = int(segment.rsplit(".", 2)[-2])
+        for path in self._segments():
+            if int(path.rsplit(".", 2)[-2]) <= stamp:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    print(f"Error removing journal segment {path}: {e}")
+
+    def close(self):
+        """Flush and close the active journal file."""
+        with self._lock:
+            if self._file is not None and not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
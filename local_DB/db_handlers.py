@@ -104,15 +104,11 @@ async def notify_admins_duplicate_attempt(context, user_id, registration_summary
         f"<b>🚫 Registration blocked - user already verified</b>"
     )
     
-    for admin_id in ADMIN_USER_ID:
-        try:
-            await context.bot.send_message(
-                chat_id=admin_id,
-                text=admin_message,
-                parse_mode='HTML'
-            )
-        except Exception as e:
-            print(f"Error notifying admin {admin_id}: {e}")
+    get_outbound_queue(context.bot).notify_admins(
+        ADMIN_USER_ID,
+        text=admin_message,
+        parse_mode='HTML'
+    )
 
 async def view_profile_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle the 'View User Profile' button callback."""
@@ -224,14 +220,10 @@ async def confirm_registration_callback(update: Update, context: ContextTypes.DE
     await send_profile_summary_to_admins(context, user_id)
     
     # Notify admin of confirmation
-    for admin_id in ADMIN_USER_ID:
-        try:
-            await context.bot.send_message(
-                chat_id=admin_id,
-                text=f"✅ User {user_id} has confirmed their registration"
-            )
-        except Exception as e:
-            print(f"Error notifying admin {admin_id}: {e}")
+    get_outbound_queue(context.bot).notify_admins(
+        ADMIN_USER_ID,
+        text=f"✅ User {user_id} has confirmed their registration"
+    )
 
 async def edit_registration_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle edit registration button."""
@@ -299,15 +291,10 @@ async def send_daily_signup_report(context: ContextTypes.DEFAULT_TYPE) -> None:
                 report += f"... and {today_users.height - 10} more users"
         
         # Send report to all admins
-        for admin_id in ADMIN_USER_ID:
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id,
-                    text=report
-                )
-                print(f"Successfully sent daily signup report to admin {admin_id}")
-            except Exception as e:
-                print(f"Failed to send report to admin {admin_id}: {e}")
+        get_outbound_queue(context.bot).notify_admins(
+            ADMIN_USER_ID,
+            text=report
+        )
                 
     except Exception as e:
         print(f"Error generating daily signup report: {e}")
@@ -357,15 +344,10 @@ async def send_daily_response_report(context: ContextTypes.DEFAULT_TYPE) -> None
                 report += f"... and {today_responders.height - 10} more users"
         
         # Send report to all admins
-        for admin_id in ADMIN_USER_ID:
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id,
-                    text=report
-                )
-                print(f"Successfully sent daily response report to admin {admin_id}")
-            except Exception as e:
-                print(f"Failed to send report to admin {admin_id}: {e}")
+        get_outbound_queue(context.bot).notify_admins(
+            ADMIN_USER_ID,
+            text=report
+        )
                 
     except Exception as e:
         print(f"Error generating daily response report: {e}")
@@ -429,9 +411,7 @@ If you need to make any changes or have questions, just use your dashboard or co
     context.user_data["response_step"] = "summary_shown"
     
     # Notify admin of completion
-    for admin_id in ADMIN_USER_ID:
-        try:
-            admin_summary = f"""📋 <b>USER REGISTRATION COMPLETED</b>
+    admin_summary = f"""📋 <b>USER REGISTRATION COMPLETED</b>
 
 User: {user_info.get('first_name', 'Unknown')} {user_info.get('last_name', '')}
 ID: {user_id}
@@ -445,22 +425,20 @@ Source: {user_info.get('source_channel', 'Unknown')}
 
 Registration completed at: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}"""
 
-            # Add action buttons for admin
-            admin_keyboard = [
-                [InlineKeyboardButton("View Full Profile", callback_data=f"view_profile_{user_id}")],
-                [InlineKeyboardButton("Add to VIP Signals", callback_data=f"add_vip_signals_{user_id}")],
-                [InlineKeyboardButton("Forward to Copier Team", callback_data=f"forward_copier_{user_id}")]
-            ]
-            admin_reply_markup = InlineKeyboardMarkup(admin_keyboard)
-            
-            await context.bot.send_message(
-                chat_id=admin_id,
-                text=admin_summary,
-                parse_mode='HTML',
-                reply_markup=admin_reply_markup
-            )
-        except Exception as e:
-            print(f"Error notifying admin {admin_id}: {e}")
+    # Add action buttons for admin
+    admin_keyboard = [
+        [InlineKeyboardButton("View Full Profile", callback_data=f"view_profile_{user_id}")],
+        [InlineKeyboardButton("Add to VIP Signals", callback_data=f"add_vip_signals_{user_id}")],
+        [InlineKeyboardButton("Forward to Copier Team", callback_data=f"forward_copier_{user_id}")]
+    ]
+    admin_reply_markup = InlineKeyboardMarkup(admin_keyboard)
+    
+    get_outbound_queue(context.bot).notify_admins(
+        ADMIN_USER_ID,
+        text=admin_summary,
+        parse_mode='HTML',
+        reply_markup=admin_reply_markup
+    )
 
 async def send_profile_summary_to_admins(context, user_id):
     """Send a summary of the user's profile to all admins."""
@@ -523,16 +501,11 @@ async def send_profile_summary_to_admins(context, user_id):
         # User could not be found - notify admins of the issue
         error_details = "\n".join(error_messages) if error_messages else "No detailed error information"
         
-        for admin_id in ADMIN_USER_ID:
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id,
-                    text=f"⚠️ Could not generate summary for user {user_id}:\n\n{error_details}\n\n"
-                         f"The user may need to be manually processed."
-                )
-                print(f"Sent error report to admin {admin_id}")
-            except Exception as e:
-                print(f"Error sending error report to admin {admin_id}: {e}")
+        get_outbound_queue(context.bot).notify_admins(
+            ADMIN_USER_ID,
+            text=f"⚠️ Could not generate summary for user {user_id}:\n\n{error_details}\n\n"
+                 f"The user may need to be manually processed."
+        )
         return
     
     # We have some user info - generate summary
@@ -559,17 +532,12 @@ Registration completed at: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}"""
     reply_markup = InlineKeyboardMarkup(keyboard)
     
     # Send to all admins
-    for admin_id in ADMIN_USER_ID:
-        try:
-            await context.bot.send_message(
-                chat_id=admin_id,
-                text=summary,
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
-            print(f"Sent profile summary to admin {admin_id}")
-        except Exception as e:
-            print(f"Error sending profile summary to admin {admin_id}: {e}")
+    get_outbound_queue(context.bot).notify_admins(
+        ADMIN_USER_ID,
+        text=summary,
+        parse_mode='HTML',
+        reply_markup=reply_markup
+    )
 
 async def view_summary_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle view profile summary button."""
@@ -749,16 +717,11 @@ async def send_registration_notification(context, user_id, account_number, accou
         reply_markup = InlineKeyboardMarkup(keyboard)
         
         # Send to all admins
-        for admin_id in ADMIN_USER_ID:
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id, 
-                    text=report,
-                    reply_markup=reply_markup
-                )
-                print(f"Successfully sent registration notification to admin {admin_id}")
-            except Exception as e:
-                print(f"Failed to send notification to admin {admin_id}: {e}")
+        get_outbound_queue(context.bot).notify_admins(
+            ADMIN_USER_ID,
+            text=report,
+            reply_markup=reply_markup
+        )
     except Exception as e:
         print(f"Error in send_registration_notification: {e}")
 
@@ -785,12 +748,7 @@ async def send_account_notification(context, user_id, account_number):
         )
         
         # Send to all admins
-        for admin_id in ADMIN_USER_ID:
-            try:
-                await context.bot.send_message(chat_id=admin_id, text=report)
-                print(f"Successfully sent notification to admin {admin_id}")
-            except Exception as e:
-                print(f"Failed to send notification to admin {admin_id}: {e}")
+        get_outbound_queue(context.bot).notify_admins(ADMIN_USER_ID, text=report)
     except Exception as e:
         print(f"Error in send_account_notification: {e}")
 
@@ -809,15 +767,11 @@ async def notify_admins_success(context, user_id, account_info, stated_amount, r
     )
     
     # Send to all admins
-    for admin_id in ADMIN_USER_ID:
-        try:
-            await context.bot.send_message(
-                chat_id=admin_id,
-                text=admin_message,
-                parse_mode='HTML'
-            )
-        except Exception as e:
-            print(f"Error notifying admin {admin_id}: {e}")
+    get_outbound_queue(context.bot).notify_admins(
+        ADMIN_USER_ID,
+        text=admin_message,
+        parse_mode='HTML'
+    )
 
 def schedule_followup_messages(context, user_id):
     """Schedule follow-up messages for users who defer deposits."""
@@ -2,28 +2,81 @@ import polars as pl
 from datetime import datetime, timedelta
 import os
 import json
+import time
+import atexit
+import threading
+
+from local_DB.change_journal import ChangeJournal
+from local_DB.storage import get_storage_backend
 
 class TradingBotDatabase:
     """A database manager for the Telegram trading bot using Polars."""
     
-    def __init__(self, data_dir="./bot_data"):
-        """Initialize database with specified data directory."""
+    def __init__(self, data_dir="./bot_data", flush_interval=15.0, flush_threshold=500,
+                 compact_interval=300.0, compact_threshold=5000,
+                 storage_format="parquet", csv_export=False, read_only=False):
+        """Initialize database with specified data directory.
+        
+        Mutations are applied in memory and persisted by a write-behind flusher
+        every `flush_interval` seconds, or sooner once `flush_threshold` rows are dirty.
+        User changes are appended to a journal instead and compacted into a snapshot
+        every `compact_interval` seconds or `compact_threshold` records.
+        
+        Tables are stored with the `storage_format` backend ("csv", "parquet" or "ipc");
+        with `csv_export` a CSV copy is also written on every flush; otherwise use
+        export_csv() for an on-demand copy.
+        
+        With `read_only` (for processes such as the dashboard that share the bot's
+        data_dir) the tables are loaded and the journal replayed, but nothing is
+        journaled, flushed or compacted; only the bot process owns those files.
+        """
         self.data_dir = data_dir
+        self.read_only = read_only
+        self.storage = get_storage_backend(storage_format)
+        self.csv_export = csv_export
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.compact_interval = compact_interval
+        self.compact_threshold = compact_threshold
+        
+        # Guards the dataframes, indexes and dirty-row bookkeeping
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._last_compaction = time.monotonic()
+        self._dirty_rows = {
+            "group_members": set(),
+            "channel_members": set(),
+            "analytics": set()
+        }
         
         # Ensure data directory exists
         os.makedirs(data_dir, exist_ok=True)
         
-        # Define paths for different data files
+        # Define paths for different data files (CSV paths double as the export location)
         self.users_path = os.path.join(data_dir, "users.csv")
+        self.users_journal_path = os.path.join(data_dir, "users.journal")
         self.group_members_path = os.path.join(data_dir, "group_members.csv")
         self.channel_members_path = os.path.join(data_dir, "channel_members.csv")
         self.analytics_path = os.path.join(data_dir, "analytics.csv")
         self.settings_path = os.path.join(data_dir, "settings.json")
         
+        self.table_paths = {
+            table: os.path.join(data_dir, f"{table}{self.storage.extension}")
+            for table in ("users", "group_members", "channel_members", "analytics")
+        }
+        
         # Initialize all dataframes
         self._init_dataframes()
+        # Build user_id -> row position indexes
+        self._rebuild_indexes()
+        # Apply user changes recorded since the last snapshot
+        self._journal = ChangeJournal(self.users_journal_path, read_only=read_only)
+        self._replay_user_journal()
         # Load settings
         self._load_settings()
+        # Start write-behind flusher
+        if not read_only:
+            self._start_flusher()
         
     def _init_dataframes(self):
         """Initialize all dataframes, creating them if they don't exist."""
@@ -105,12 +158,11 @@ class TradingBotDatabase:
         }
             
         # Users table
-        if os.path.exists(self.users_path):
+        if self._table_exists("users"):
             try:
-                # Read existing CSV
-                self.users_df = pl.read_csv(self.users_path)
+                self.users_df = self._read_table("users")
                 
-                print(f"Loaded existing CSV with {self.users_df.height} rows and columns: {self.users_df.columns}")
+                print(f"Loaded existing users table with {self.users_df.height} rows and columns: {self.users_df.columns}")
                 
                 # Add any missing columns with default values
                 for col_name, dtype in users_schema.items():
@@ -182,8 +234,8 @@ class TradingBotDatabase:
                 
             # CRITICAL: Save the updated dataframe with new columns
             try:
-                self.users_df.write_csv(self.users_path)
-                print(f"✅ Saved updated users.csv with new VIP columns")
+                self._write_table("users", self.users_df)
+                print(f"✅ Saved updated users table with new VIP columns")
             except Exception as e:
                 print(f"❌ Error saving updated CSV: {e}")
                 
@@ -193,13 +245,13 @@ class TradingBotDatabase:
                 {col: [] for col in users_schema.keys()},
                 schema=users_schema
             )
-            self.users_df.write_csv(self.users_path)
-            print("Created new users.csv with complete schema")
+            self._write_table("users", self.users_df)
+            print("Created new users table with complete schema")
         
         # Group members table - similar approach for other tables
-        if os.path.exists(self.group_members_path):
+        if self._table_exists("group_members"):
             try:
-                self.group_members_df = pl.read_csv(self.group_members_path)
+                self.group_members_df = self._read_table("group_members")
                 # Apply similar type conversion as for users_df
                 for col_name, dtype in group_members_schema.items():
                     if col_name in self.group_members_df.columns:
@@ -215,18 +267,18 @@ class TradingBotDatabase:
                     {col: [] for col in group_members_schema.keys()},
                     schema=group_members_schema
                 )
-                self.group_members_df.write_csv(self.group_members_path)
+                self._write_table("group_members", self.group_members_df)
         else:
             self.group_members_df = pl.DataFrame(
                 {col: [] for col in group_members_schema.keys()},
                 schema=group_members_schema
             )
-            self.group_members_df.write_csv(self.group_members_path)
+            self._write_table("group_members", self.group_members_df)
         
         # Channel members table
-        if os.path.exists(self.channel_members_path):
+        if self._table_exists("channel_members"):
             try:
-                self.channel_members_df = pl.read_csv(self.channel_members_path)
+                self.channel_members_df = self._read_table("channel_members")
                 # Apply similar type conversion as for users_df
                 for col_name, dtype in channel_members_schema.items():
                     if col_name in self.channel_members_df.columns:
@@ -242,18 +294,18 @@ class TradingBotDatabase:
                     {col: [] for col in channel_members_schema.keys()},
                     schema=channel_members_schema
                 )
-                self.channel_members_df.write_csv(self.channel_members_path)
+                self._write_table("channel_members", self.channel_members_df)
         else:
             self.channel_members_df = pl.DataFrame(
                 {col: [] for col in channel_members_schema.keys()},
                 schema=channel_members_schema
             )
-            self.channel_members_df.write_csv(self.channel_members_path)
+            self._write_table("channel_members", self.channel_members_df)
         
         # Analytics table
-        if os.path.exists(self.analytics_path):
+        if self._table_exists("analytics"):
             try:
-                self.analytics_df = pl.read_csv(self.analytics_path)
+                self.analytics_df = self._read_table("analytics")
                 # Apply similar type conversion as for users_df
                 for col_name, dtype in analytics_schema.items():
                     if col_name in self.analytics_df.columns:
@@ -269,14 +321,295 @@ class TradingBotDatabase:
                     {col: [] for col in analytics_schema.keys()},
                     schema=analytics_schema
                 )
-                self.analytics_df.write_csv(self.analytics_path)
+                self._write_table("analytics", self.analytics_df)
         else:
             self.analytics_df = pl.DataFrame(
                 {col: [] for col in analytics_schema.keys()},
                 schema=analytics_schema
             )
-            self.analytics_df.write_csv(self.analytics_path)
-    
+            self._write_table("analytics", self.analytics_df)
+        
+        # Migrate tables that only exist as legacy CSV into the storage backend
+        for table, path in self.table_paths.items():
+            if not os.path.exists(path):
+                try:
+                    self._write_table(table, getattr(self, f"{table}_df"))
+                except Exception as e:
+                    print(f"❌ Error migrating {table} to {self.storage.name}: {e}")
+
+    # =========================================================================== #
+    # ======================= Storage Backend
+    # =========================================================================== #
+    def _csv_paths(self):
+        """Return the CSV export path of each table."""
+        return {
+            "users": self.users_path,
+            "group_members": self.group_members_path,
+            "channel_members": self.channel_members_path,
+            "analytics": self.analytics_path
+        }
+
+    def _table_exists(self, table):
+        """Whether a table has been persisted in the backend format or as legacy CSV."""
+        return os.path.exists(self.table_paths[table]) or os.path.exists(self._csv_paths()[table])
+
+    def _read_table(self, table, columns=None):
+        """Read a table from the storage backend, falling back to its legacy CSV."""
+        path = self.table_paths[table]
+        if os.path.exists(path):
+            return self.storage.read(path, columns=columns)
+        return pl.read_csv(self._csv_paths()[table], columns=columns)
+
+    def _write_table(self, table, df):
+        """Persist a table with the storage backend, plus its CSV export if enabled."""
+        self.storage.write(df, self.table_paths[table])
+        if self.csv_export and self.storage.name != "csv":
+            df.write_csv(self._csv_paths()[table])
+
+    def read_columns(self, table, columns):
+        """Read only the given columns of a persisted table.
+        
+        Reflects the last flush (or compaction, for users), not unsaved in-memory changes.
+        """
+        return self._read_table(table, columns=columns)
+
+    def export_csv(self, export_dir=None):
+        """Write the current in-memory tables as CSV files and return their paths."""
+        export_dir = export_dir or self.data_dir
+        os.makedirs(export_dir, exist_ok=True)
+        
+        with self._lock:
+            snapshots = {
+                table: getattr(self, f"{table}_df").clone()
+                for table in self.table_paths
+            }
+        
+        exported = {}
+        for table, df in snapshots.items():
+            path = os.path.join(export_dir, f"{table}.csv")
+            df.write_csv(path)
+            exported[table] = path
+        return exported
+
+    # =========================================================================== #
+    # ======================= Row Indexes
+    # =========================================================================== #
+    def _build_index(self, df, key="user_id"):
+        """Map each key to the position of its first row in the dataframe."""
+        index = {}
+        for pos, value in enumerate(df[key].to_list()):
+            if value is not None and value not in index:
+                index[value] = pos
+        return index
+
+    def _rebuild_indexes(self):
+        """Rebuild all row position indexes from the current dataframes."""
+        with self._lock:
+            self._user_index = self._build_index(self.users_df)
+            self._group_index = self._build_index(self.group_members_df)
+            self._channel_index = self._build_index(self.channel_members_df)
+            self._analytics_index = self._build_index(self.analytics_df, key="date")
+
+    def _update_rows(self, df, updates):
+        """Apply {row position: {column: value}} updates with one scatter per column."""
+        columns = {}
+        for pos, values in updates.items():
+            for key, value in values.items():
+                if key in df.columns:
+                    positions, column_values = columns.setdefault(key, ([], []))
+                    positions.append(pos)
+                    column_values.append(value)
+        
+        for key, (positions, column_values) in columns.items():
+            try:
+                # Infer, then cast: a strict dtype on construction would null out e.g. ints for a Utf8 column
+                values = pl.Series(key, column_values, strict=False).cast(df.schema[key])
+                df[positions, key] = values
+            except Exception as e:
+                print(f"Error updating column {key}: {e}")
+
+    def _append_row(self, df, row):
+        """Append a single row to the dataframe, casting it to the dataframe schema.
+        
+        extend() writes into the existing buffers, so the table stays one chunk
+        instead of gaining a chunk per insert as vstack() would.
+        """
+        row_df = pl.DataFrame([row])
+        row_df = row_df.select([
+            pl.col(col).cast(dtype) if col in row_df.columns else pl.lit(None, dtype=dtype).alias(col)
+            for col, dtype in df.schema.items()
+        ])
+        df.extend(row_df)
+        return df.height - 1
+
+    # =========================================================================== #
+    # ======================= Write-Behind Persistence
+    # =========================================================================== #
+    def _mark_dirty(self, table, key):
+        """Record a changed row and wake the flusher if the batch is large enough."""
+        if self.read_only:
+            return
+        
+        with self._lock:
+            self._dirty_rows[table].add(key)
+            pending = sum(len(rows) for rows in self._dirty_rows.values())
+
+        if pending >= self.flush_threshold:
+            self._flush_event.set()
+
+    def pending_writes(self):
+        """Number of rows changed in memory but not yet persisted."""
+        with self._lock:
+            return sum(len(rows) for rows in self._dirty_rows.values())
+
+    def flush(self):
+        """Persist every table that has pending changes."""
+        if self.read_only:
+            return False
+        
+        with self._lock:
+            dirty = {table: rows for table, rows in self._dirty_rows.items() if rows}
+            snapshots = {}
+            for table in dirty:
+                # clone() shares buffers; later in-place updates copy on write
+                snapshots[table] = getattr(self, f"{table}_df").clone()
+                self._dirty_rows[table] = set()
+
+        success = True
+        for table, df in snapshots.items():
+            try:
+                self._write_table(table, df)
+            except Exception as e:
+                print(f"❌ Error flushing {table}: {e}")
+                success = False
+                # Keep the rows dirty so the next flush retries them
+                with self._lock:
+                    self._dirty_rows[table].update(dirty[table])
+
+        return success
+
+    def _flush_worker(self):
+        """Background loop that flushes dirty tables on a timer or size threshold."""
+        while not self._stop_event.is_set():
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            self.flush()
+            if self._should_compact():
+                self.compact()
+
+    def _start_flusher(self):
+        """Start the write-behind flusher thread and flush on interpreter exit."""
+        self._flush_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_worker,
+            name="TradingBotDatabaseFlusher",
+            daemon=True
+        )
+        self._flush_thread.start()
+        atexit.register(self.close)
+
+    def close(self):
+        """Stop the flusher and persist any pending changes."""
+        if self.read_only:
+            return
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        self._flush_event.set()
+        self._flush_thread.join(timeout=5)
+        self.flush()
+        if self._journal.records_since_compaction > 0:
+            self.compact()
+        self._journal.close()
+
+    # =========================================================================== #
+    # ======================= User Change Journal
+    # =========================================================================== #
+    def _journal_user_change(self, op, user_id, fields):
+        """Append a user mutation to the journal and wake the flusher if it should compact."""
+        try:
+            self._journal.append(op, user_id, fields)
+        except Exception as e:
+            print(f"❌ Error writing user journal for {user_id}: {e}")
+            return False
+        
+        if self._journal.records_since_compaction >= self.compact_threshold:
+            self._flush_event.set()
+        return True
+
+    def _replay_user_journal(self):
+        """Apply journaled user changes on top of the loaded snapshot."""
+        changes = {}
+        count = 0
+        
+        for record in self._journal.replay():
+            try:
+                user_id = int(record["key"])
+            except (KeyError, ValueError, TypeError):
+                continue
+            
+            entry = changes.setdefault(user_id, {"insert": False, "fields": {}})
+            if record.get("op") == "insert":
+                entry["insert"] = True
+            entry["fields"].update(record.get("fields") or {})
+            count += 1
+        
+        if not changes:
+            return
+        
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        with self._lock:
+            updates = {}
+            for user_id, entry in changes.items():
+                pos = self._user_index.get(user_id)
+                if pos is None:
+                    fields = dict(entry["fields"], user_id=user_id)
+                    complete_user = self._create_complete_user_record(fields, now)
+                    self._user_index[user_id] = self._append_row(self.users_df, complete_user)
+                else:
+                    updates[pos] = entry["fields"]
+            
+            self._update_rows(self.users_df, updates)
+        
+        # Replayed records still live in the journal until the next compaction,
+        # which only the process that owns the journal may run
+        if not self.read_only:
+            self._journal.records_since_compaction += count
+        print(f"✅ Replayed {count} journal records for {len(changes)} users")
+
+    def _should_compact(self):
+        """Whether the user journal is large or old enough to fold into the snapshot."""
+        pending = self._journal.records_since_compaction
+        if pending == 0:
+            return False
+        if pending >= self.compact_threshold:
+            return True
+        return time.monotonic() - self._last_compaction >= self.compact_interval
+
+    def compact(self):
+        """Fold the user journal into a fresh snapshot and discard the folded records."""
+        if self.read_only:
+            return False
+        
+        with self._compact_lock:
+            with self._lock:
+                snapshot = self.users_df.clone()
+                segment = self._journal.rotate()
+                self._last_compaction = time.monotonic()
+            
+            try:
+                self._write_table("users", snapshot)
+                
+                # Only drop the journal once the snapshot is safely on disk
+                self._journal.discard_through(segment)
+                return True
+            except Exception as e:
+                # The segment stays on disk and is replayed on the next startup
+                print(f"❌ Error compacting users journal: {e}")
+                return False
+
     def _load_settings(self):
         """Load bot settings from JSON file."""
         if os.path.exists(self.settings_path):
@@ -361,55 +694,66 @@ class TradingBotDatabase:
         
         # ENHANCED: Clean and validate data types before storing
         cleaned_data = self._clean_user_data(user_data)
-        
-        # Check if user already exists
-        try:
-            existing = self.users_df.filter(pl.col("user_id") == cleaned_data['user_id'])
-        except Exception as e:
-            print(f"Error filtering dataframe: {e}")
-            existing = pl.DataFrame(schema=self.users_df.schema)
+        user_id = cleaned_data['user_id']
         
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        if existing.height > 0:
-            # User exists, update information
-            for key, value in cleaned_data.items():
-                if key in self.users_df.columns:
-                    try:
-                        # Update column with proper type
-                        self.users_df = self.users_df.with_columns([
-                            pl.when(pl.col("user_id") == cleaned_data['user_id'])
-                            .then(pl.lit(value))
-                            .otherwise(pl.col(key))
-                            .alias(key)
-                        ])
-                    except Exception as e:
-                        print(f"Error updating {key} with value {value}: {e}")
+        with self._lock:
+            pos = self._user_index.get(user_id)
             
-            # Save changes
-            try:
-                self.users_df.write_csv(self.users_path)
-                return True
-            except Exception as e:
-                print(f"Error saving CSV after update: {e}")
-                return False
-        else:
-            # New user, add row with complete data
-            complete_user = self._create_complete_user_record(cleaned_data, now)
-            
-            try:
-                # Create a new dataframe with just this user
-                user_df = pl.DataFrame([complete_user], schema=self.users_df.schema)
-                
-                # Concatenate with main dataframe
-                self.users_df = pl.concat([self.users_df, user_df])
+            if pos is not None:
+                # User exists, update information in place
+                self._update_rows(self.users_df, {pos: cleaned_data})
+                return self._journal_user_change("update", user_id, cleaned_data)
+            else:
+                # New user, add row with complete data
+                complete_user = self._create_complete_user_record(cleaned_data, now)
                 
-                # Save changes
-                self.users_df.write_csv(self.users_path)
-                return True
-            except Exception as e:
-                print(f"Error adding new user: {e}")
-                return False
+                try:
+                    self._user_index[user_id] = self._append_row(self.users_df, complete_user)
+                    return self._journal_user_change("insert", user_id, complete_user)
+                except Exception as e:
+                    print(f"Error adding new user: {e}")
+                    return False
+
+    def update_users(self, updates):
+        """Apply {user_id: fields} to existing users as one batch (one scatter per column, one journal write)."""
+        changes = []
+        
+        with self._lock:
+            positions = {}
+            for user_id, fields in updates.items():
+                pos = self._user_index.get(int(user_id))
+                if pos is None:
+                    continue
+                cleaned_data = self._clean_user_data(dict(fields, user_id=user_id))
+                del cleaned_data["user_id"]
+                positions[pos] = cleaned_data
+                changes.append((int(user_id), cleaned_data))
+            
+            self._update_rows(self.users_df, positions)
+        
+        try:
+            self._journal.append_many("update", changes)
+        except Exception as e:
+            print(f"❌ Error writing user journal for {len(changes)} users: {e}")
+            return 0
+        
+        if self._journal.records_since_compaction >= self.compact_threshold:
+            self._flush_event.set()
+        return len(changes)
+
+    def get_trading_accounts(self):
+        """Map each numeric trading account to the (user_id, account_balance) pairs registered with it."""
+        with self._lock:
+            users = self.users_df.select(["user_id", "trading_account", "account_balance"]).clone()
+        
+        accounts = {}
+        for user_id, trading_account, balance in users.iter_rows():
+            account = str(trading_account or "").strip()
+            if account.isdigit():
+                accounts.setdefault(int(account), []).append((user_id, balance))
+        return accounts
 
     def _clean_user_data(self, user_data):
         """Clean and validate user data types."""
@@ -499,13 +843,11 @@ class TradingBotDatabase:
             # Ensure user_id is an integer
             user_id = int(user_id)
             
-            user = self.users_df.filter(pl.col("user_id") == user_id)
-            if user.height > 0:
-                # Convert to dict for easier use
-                user_dict = {}
-                for col in user.columns:
-                    user_dict[col] = user[col][0]
-                return user_dict
+            with self._lock:
+                pos = self._user_index.get(user_id)
+                if pos is not None:
+                    # Convert to dict for easier use
+                    return self.users_df.row(pos, named=True)
         except Exception as e:
             print(f"Error getting user {user_id}: {e}")
         
@@ -519,19 +861,13 @@ class TradingBotDatabase:
             
             now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # Check if user exists
-            if self.get_user(user_id) is not None:
-                # Update last_active field
-                self.users_df = self.users_df.with_columns([
-                    pl.when(pl.col("user_id") == user_id)
-                    .then(pl.lit(now))
-                    .otherwise(pl.col("last_active"))
-                    .alias("last_active")
-                ])
-                
-                # Save changes
-                self.users_df.write_csv(self.users_path)
-                return True
+            with self._lock:
+                # Check if user exists
+                pos = self._user_index.get(user_id)
+                if pos is not None:
+                    # Update last_active field
+                    self._update_rows(self.users_df, {pos: {"last_active": now}})
+                    return self._journal_user_change("update", user_id, {"last_active": now})
         except Exception as e:
             print(f"Error updating user activity for {user_id}: {e}")
         
@@ -545,35 +881,21 @@ class TradingBotDatabase:
             
             now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # Check if already in group
-            existing = self.group_members_df.filter(pl.col("user_id") == user_id)
-            
-            if existing.height == 0:
-                # Add new group member
-                new_member = {
-                    "user_id": user_id,
-                    "join_date": now,
-                    "is_admin": bool(is_admin),
-                    "is_verified": False,
-                    "last_message_date": now
-                }
-                
-                # Create a new dataframe with just this member
-                member_df = pl.DataFrame([new_member])
-                
-                # Ensure types match
-                for col in self.group_members_df.columns:
-                    if col in member_df.columns:
-                        member_df = member_df.with_columns([
-                            pl.col(col).cast(self.group_members_df.schema[col])
-                        ])
-                
-                # Concatenate with main dataframe
-                self.group_members_df = pl.concat([self.group_members_df, member_df])
-                
-                # Save changes
-                self.group_members_df.write_csv(self.group_members_path)
-                return True
+            with self._lock:
+                # Check if already in group
+                if user_id not in self._group_index:
+                    # Add new group member
+                    new_member = {
+                        "user_id": user_id,
+                        "join_date": now,
+                        "is_admin": bool(is_admin),
+                        "is_verified": False,
+                        "last_message_date": now
+                    }
+                    
+                    self._group_index[user_id] = self._append_row(self.group_members_df, new_member)
+                    self._mark_dirty("group_members", user_id)
+                    return True
         except Exception as e:
             print(f"Error adding user {user_id} to group: {e}")
         
@@ -593,34 +915,20 @@ class TradingBotDatabase:
                 # Set expiry to 30 days from now
                 expiry = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d %H:%M:%S")
             
-            # Check if already in channel
-            existing = self.channel_members_df.filter(pl.col("user_id") == user_id)
-            
-            if existing.height == 0:
-                # Add new channel member
-                new_member = {
-                    "user_id": user_id,
-                    "join_date": now,
-                    "subscription_type": subscription_type,
-                    "expiry_date": expiry or ""
-                }
-                
-                # Create a new dataframe with just this member
-                member_df = pl.DataFrame([new_member])
-                
-                # Ensure types match
-                for col in self.channel_members_df.columns:
-                    if col in member_df.columns:
-                        member_df = member_df.with_columns([
-                            pl.col(col).cast(self.channel_members_df.schema[col])
-                        ])
-                
-                # Concatenate with main dataframe
-                self.channel_members_df = pl.concat([self.channel_members_df, member_df])
-                
-                # Save changes
-                self.channel_members_df.write_csv(self.channel_members_path)
-                return True
+            with self._lock:
+                # Check if already in channel
+                if user_id not in self._channel_index:
+                    # Add new channel member
+                    new_member = {
+                        "user_id": user_id,
+                        "join_date": now,
+                        "subscription_type": subscription_type,
+                        "expiry_date": expiry or ""
+                    }
+                    
+                    self._channel_index[user_id] = self._append_row(self.channel_members_df, new_member)
+                    self._mark_dirty("channel_members", user_id)
+                    return True
         except Exception as e:
             print(f"Error adding user {user_id} to channel: {e}")
         
@@ -632,23 +940,18 @@ class TradingBotDatabase:
             # Ensure user_id is an integer
             user_id = int(user_id)
             
-            # Update users table
-            self.users_df = self.users_df.with_columns([
-                pl.when(pl.col("user_id") == user_id)
-                .then(pl.lit(True))
-                .otherwise(pl.col("is_verified"))
-                .alias("is_verified")
-            ])
-            self.users_df.write_csv(self.users_path)
-            
-            # Update group members table
-            self.group_members_df = self.group_members_df.with_columns([
-                pl.when(pl.col("user_id") == user_id)
-                .then(pl.lit(True))
-                .otherwise(pl.col("is_verified"))
-                .alias("is_verified")
-            ])
-            self.group_members_df.write_csv(self.group_members_path)
+            with self._lock:
+                # Update users table
+                pos = self._user_index.get(user_id)
+                if pos is not None:
+                    self._update_rows(self.users_df, {pos: {"is_verified": True}})
+                    self._journal_user_change("update", user_id, {"is_verified": True})
+                
+                # Update group members table
+                pos = self._group_index.get(user_id)
+                if pos is not None:
+                    self._update_rows(self.group_members_df, {pos: {"is_verified": True}})
+                    self._mark_dirty("group_members", user_id)
             return True
         except Exception as e:
             print(f"Error marking user {user_id} as verified: {e}")
@@ -666,57 +969,29 @@ class TradingBotDatabase:
             messages_sent = int(messages_sent)
             commands_used = int(commands_used)
             
-            # Check if entry for this date already exists
-            existing = self.analytics_df.filter(pl.col("date") == date)
+            counters = {
+                "new_users": new_users,
+                "active_users": active_users,
+                "messages_sent": messages_sent,
+                "commands_used": commands_used
+            }
             
-            if existing.height > 0:
-                # Update existing entry
-                self.analytics_df = self.analytics_df.with_columns([
-                    pl.when(pl.col("date") == date)
-                    .then(pl.col("new_users") + new_users)
-                    .otherwise(pl.col("new_users"))
-                    .alias("new_users"),
-                    
-                    pl.when(pl.col("date") == date)
-                    .then(pl.col("active_users") + active_users)
-                    .otherwise(pl.col("active_users"))
-                    .alias("active_users"),
-                    
-                    pl.when(pl.col("date") == date)
-                    .then(pl.col("messages_sent") + messages_sent)
-                    .otherwise(pl.col("messages_sent"))
-                    .alias("messages_sent"),
-                    
-                    pl.when(pl.col("date") == date)
-                    .then(pl.col("commands_used") + commands_used)
-                    .otherwise(pl.col("commands_used"))
-                    .alias("commands_used")
-                ])
-            else:
-                # Create new entry
-                new_entry = {
-                    "date": date,
-                    "new_users": new_users,
-                    "active_users": active_users,
-                    "messages_sent": messages_sent,
-                    "commands_used": commands_used
-                }
+            with self._lock:
+                # Check if entry for this date already exists
+                pos = self._analytics_index.get(date)
                 
-                # Create a new dataframe with just this entry
-                entry_df = pl.DataFrame([new_entry])
-                
-                # Ensure types match
-                for col in self.analytics_df.columns:
-                    if col in entry_df.columns:
-                        entry_df = entry_df.with_columns([
-                            pl.col(col).cast(self.analytics_df.schema[col])
-                        ])
+                if pos is not None:
+                    # Update existing entry
+                    current = self.analytics_df.row(pos, named=True)
+                    self._update_rows(self.analytics_df, {pos: {
+                        key: (current[key] or 0) + value for key, value in counters.items()
+                    }})
+                else:
+                    # Create new entry
+                    new_entry = {"date": date, **counters}
+                    self._analytics_index[date] = self._append_row(self.analytics_df, new_entry)
                 
-                # Concatenate with main dataframe
-                self.analytics_df = pl.concat([self.analytics_df, entry_df])
-            
-            # Save changes
-            self.analytics_df.write_csv(self.analytics_path)
+                self._mark_dirty("analytics", date)
             return True
         except Exception as e:
             print(f"Error updating analytics: {e}")
@@ -0,0 +1,94 @@
+import os
+from abc import ABC, abstractmethod
+
+import polars as pl
+
+class TableStorage(ABC):
+    """Base class for the on-disk format of the bot_data tables."""
+
+    name = None
+    extension = None
+
+    @abstractmethod
+    def read(self, path, columns=None):
+        """Read a table, optionally projecting only the given columns."""
+
+    @abstractmethod
+    def _write(self, df, path):
+        """Write the table to `path` in this format."""
+
+    def write(self, df, path):
+        """Write a table atomically so readers never see a half-written file."""
+        tmp_path = f"{path}.tmp"
+        self._write(df, tmp_path)
+        os.replace(tmp_path, path)
+
+
+class CsvStorage(TableStorage):
+    """Plain-text CSV tables. Types are re-inferred and re-cast on every load."""
+
+    name = "csv"
+    extension = ".csv"
+
+    def read(self, path, columns=None):
+        return pl.read_csv(path, columns=columns)
+
+    def _write(self, df, path):
+        df.write_csv(path)
+
+
+class ParquetStorage(TableStorage):
+    """Compressed columnar tables with the schema embedded in the file."""
+
+    name = "parquet"
+    extension = ".parquet"
+
+    def __init__(self, compression="zstd"):
+        self.compression = compression
+
+    def read(self, path, columns=None):
+        return pl.read_parquet(path, columns=columns)
+
+    def _write(self, df, path):
+        df.write_parquet(path, compression=self.compression)
+
+
+class IpcStorage(TableStorage):
+    """Arrow IPC (Feather v2) tables.
+
+    Memory mapping is off by default: a mapped file cannot be replaced on Windows
+    while any dataframe still references it.
+    """
+
+    name = "ipc"
+    extension = ".arrow"
+
+    def __init__(self, memory_map=False, compression="uncompressed"):
+        self.memory_map = memory_map
+        self.compression = compression
+
+    def read(self, path, columns=None):
+        return pl.read_ipc(path, columns=columns, memory_map=self.memory_map)
+
+    def _write(self, df, path):
+        df.write_ipc(path, compression=self.compression)
+
+
+STORAGE_BACKENDS = {
+    "csv": CsvStorage,
+    "parquet": ParquetStorage,
+    "ipc": IpcStorage
+}
+
+
+def get_storage_backend(storage_format):
+    """Return a storage backend instance for a format name or pass an instance through."""
+    if isinstance(storage_format, TableStorage):
+        return storage_format
+
+    try:
+        return STORAGE_BACKENDS[storage_format]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown storage format '{storage_format}', expected one of {list(STORAGE_BACKENDS)}"
+        )
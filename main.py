@@ -318,9 +318,9 @@ async def debug_vip_status_command(update: Update, context: ContextTypes.DEFAULT
         # Get real-time balance for comparison
         if user_info.get('trading_account'):
             try:
-                mysql_db = get_mysql_connection()
-                if mysql_db and mysql_db.is_connected():
-                    account_info = mysql_db.verify_account_exists(user_info.get('trading_account'))
+                lookup = get_account_lookup()
+                if await lookup.available():
+                    account_info = await lookup.verify_account(user_info.get('trading_account'))
                     if account_info['exists']:
                         real_time_balance = float(account_info.get('balance', 0))
                         debug_msg += f"• real_time_balance: {real_time_balance}\n"
@@ -438,9 +438,9 @@ async def show_account_dashboard(update, context, user_info, is_command=False):
     
     if trading_account and trading_account != "Not provided":
         try:
-            mysql_db = get_mysql_connection()
-            if mysql_db and mysql_db.is_connected():
-                account_info = mysql_db.verify_account_exists(trading_account)
+            lookup = get_account_lookup()
+            if await lookup.is_connected():
+                account_info = await lookup.verify_account(trading_account, allow_mirror=False)
                 if account_info['exists']:
                     real_time_balance = float(account_info.get('balance', 0))
                     balance_source = "real-time MySQL"
@@ -699,9 +699,9 @@ async def my_vip_services_callback(update: Update, context: ContextTypes.DEFAULT
     real_time_balance = 0.0
     if user_info and user_info.get("trading_account"):
         try:
-            mysql_db = get_mysql_connection()
-            if mysql_db and mysql_db.is_connected():
-                account_info = mysql_db.verify_account_exists(user_info.get("trading_account"))
+            lookup = get_account_lookup()
+            if await lookup.available():
+                account_info = await lookup.verify_account(user_info.get("trading_account"))
                 if account_info['exists']:
                     real_time_balance = float(account_info.get('balance', 0))
         except Exception as e:
@@ -1912,9 +1912,9 @@ async def show_comprehensive_user_profile(query, context, user_id):
     
     if trading_account:
         try:
-            mysql_db = get_mysql_connection()
-            if mysql_db and mysql_db.is_connected():
-                account_info = mysql_db.verify_account_exists(trading_account)
+            lookup = get_account_lookup()
+            if await lookup.available():
+                account_info = await lookup.verify_account(trading_account)
                 if account_info['exists']:
                     real_time_balance = float(account_info.get('balance', 0))
         except Exception as e:
@@ -2552,19 +2552,15 @@ async def admin_check_balance_callback(update: Update, context: ContextTypes.DEF
     
     try:
         # Get fresh balance from MySQL
-        mysql_db = get_mysql_connection()
-        if mysql_db and mysql_db.is_connected():
-            account_info = mysql_db.verify_account_exists(trading_account)
+        lookup = get_account_lookup()
+        if await lookup.is_connected():
+            account_info = await lookup.verify_account(trading_account, allow_mirror=False)
             if account_info['exists']:
                 current_balance = float(account_info.get('balance', 0))
                 account_name = account_info.get('name', 'Unknown')
                 
                 # Update local database
-                db.add_user({
-                    "user_id": user_id,
-                    "account_balance": current_balance,
-                    "last_balance_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                })
+                store_fresh_balance(user_id, current_balance, user_info)
                 
                 # Show results
                 balance_message = (
@@ -3893,7 +3889,7 @@ async def test_account_command(update: Update, context: ContextTypes.DEFAULT_TYP
     
     # Test verification
     try:
-        verification_result = auth.verify_account(account_number, user_id)
+        verification_result = await auth.verify_account(account_number, user_id)
         await update.message.reply_text(f"Verification result: {verification_result}")
     except Exception as e:
         await update.message.reply_text(f"Verification error: {e}")
@@ -4011,8 +4007,8 @@ async def send_hourly_welcome(context: ContextTypes.DEFAULT_TYPE) -> None:
     
     # Send to channel
     try:
-        await context.bot.send_message(
-            chat_id=MAIN_CHANNEL_ID, 
+        await get_outbound_queue(context.bot).send(
+            MAIN_CHANNEL_ID,
             text=message,
             parse_mode='HTML'
         )
@@ -4056,8 +4052,8 @@ async def send_giveaway_message(context: ContextTypes.DEFAULT_TYPE) -> None:
     
     # Send to channel
     try:
-        await context.bot.send_message(
-            chat_id=MAIN_CHANNEL_ID, 
+        await get_outbound_queue(context.bot).send(
+            MAIN_CHANNEL_ID,
             text=message,
             parse_mode='HTML'
         )
@@ -4078,8 +4074,8 @@ async def send_interval_message(context: ContextTypes.DEFAULT_TYPE) -> None:
     
     try:
         # Send to channel with HTML parsing enabled
-        await context.bot.send_message(
-            chat_id=MAIN_CHANNEL_ID, 
+        await get_outbound_queue(context.bot).send(
+            MAIN_CHANNEL_ID,
             text=message,
             parse_mode='HTML'  # Enable HTML formatting
         )
@@ -4102,8 +4098,8 @@ async def send_strategy_interval_message(context: ContextTypes.DEFAULT_TYPE) ->
         print(f"Retrieved strategy interval message: {message[:50]}...")
         
         # Send to strategy channel with HTML parsing enabled
-        await context.bot.send_message(
-            chat_id=STRATEGY_CHANNEL_ID, 
+        await get_outbound_queue(context.bot).send(
+            STRATEGY_CHANNEL_ID,
             text=message,
             parse_mode='HTML'  # Enable HTML formatting
         )
@@ -4124,8 +4120,8 @@ async def send_prop_interval_message(context: ContextTypes.DEFAULT_TYPE) -> None
         print(f"Retrieved strategy interval message: {message[:50]}...")
         
         # Send to strategy channel with HTML parsing enabled
-        await context.bot.send_message(
-            chat_id=PROP_CHANNEL_ID, 
+        await get_outbound_queue(context.bot).send(
+            PROP_CHANNEL_ID,
             text=message,
             parse_mode='HTML'  # Enable HTML formatting
         )
@@ -4146,8 +4142,8 @@ async def send_signals_interval_message(context: ContextTypes.DEFAULT_TYPE) -> N
         print(f"Retrieved strategy interval message: {message[:50]}...")
         
         # Send to strategy channel with HTML parsing enabled
-        await context.bot.send_message(
-            chat_id=SIGNALS_CHANNEL_ID, 
+        await get_outbound_queue(context.bot).send(
+            SIGNALS_CHANNEL_ID,
             text=message,
             parse_mode='HTML'  # Enable HTML formatting
         )
@@ -4168,8 +4164,8 @@ async def send_ed_interval_message(context: ContextTypes.DEFAULT_TYPE) -> None:
         print(f"Retrieved strategy interval message: {message[:50]}...")
         
         # Send to strategy channel with HTML parsing enabled
-        await context.bot.send_message(
-            chat_id=ED_CHANNEL_ID, 
+        await get_outbound_queue(context.bot).send(
+            ED_CHANNEL_ID,
             text=message,
             parse_mode='HTML'  # Enable HTML formatting
         )
@@ -4704,6 +4700,7 @@ def main() -> None:
     # MySQL commands
     manager_application.add_handler(CommandHandler("testmysql", test_mysql_command))
     manager_application.add_handler(CommandHandler("searchaccount", search_account_command))
+    manager_application.add_handler(CallbackQueryHandler(search_account_page_callback, pattern=r"^searchacc_\d+_[pf]_\d+$"))
     manager_application.add_handler(CommandHandler("checktable", check_table_command))
     manager_application.add_handler(CommandHandler("debugreg", debug_registrations_command))
     manager_application.add_handler(CommandHandler("checkmyaccounts", check_my_accounts_command))
@@ -4919,12 +4916,32 @@ def main() -> None:
         time=time(hour=22, minute=0)
     )
     
+    """---------------------------------
+         Account Balance Refresh
+    ------------------------------------"""
+    # Incremental refresh every 15 minutes, full refresh nightly
+    job_queue.run_repeating(refresh_balances_job, interval=900, first=120)
+    job_queue.run_daily(
+        lambda context: refresh_balances_job(context, incremental=False),
+        time=time(hour=3, minute=0)
+    )
+    
+    # Local fuzzy account-name index (only when ACCOUNT_SEARCH_INDEX=1)
+    if account_search_index is not None:
+        job_queue.run_repeating(refresh_account_search_index_job, interval=600, first=30)
+    
+    # Incremental mt5_users mirror for local reads and MySQL outages
+    mirror_sync_seconds = int(os.getenv('MT5_MIRROR_SYNC_SECONDS', 60))
+    job_queue.run_repeating(sync_account_mirror_job, interval=mirror_sync_seconds, first=10)
+    
     # ===== LOGGING =====
     logger.info("📋 Manager Bot scheduled jobs:")
     logger.info(f"- Hourly welcome messages")
     logger.info(f"- Channel interval messages") 
     logger.info(f"- Giveaway messages")
     logger.info(f"- Daily reports")
+    logger.info(f"- Balance refresh every 15 minutes (full at 03:00)")
+    logger.info(f"- Account mirror sync every {mirror_sync_seconds} seconds")
     
     logger.info("🤖 Signal Bot scheduled jobs:")
     logger.info(f"- Signal checks every 5 minutes")
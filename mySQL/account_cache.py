@@ -0,0 +1,138 @@
+import os
+import time
+
+
+# Fields of a verify_account_exists result that do not change for an MT5 login
+ACCOUNT_FACTS = (
+    "account_number", "name", "first_name", "last_name", "email", "group",
+    "company", "country", "creation_date", "is_real_account", "account_type"
+)
+# Fields refreshed on the short balance tier
+ACCOUNT_BALANCE = ("balance", "status", "leverage")
+
+
+class AccountCache:
+    """
+    Two-tier cache of account verification results, keyed by login
+
+    Account facts (owner, group, real/demo classification, creation date) are
+    kept for `facts_ttl` seconds; balance and status expire after
+    `balance_ttl`. A lookup with fresh facts but a stale balance only needs
+    the one-column balance query, and logins that don't exist are remembered
+    for the balance TTL so repeated typos don't each hit MySQL.
+    """
+
+    def __init__(self, facts_ttl=None, balance_ttl=None, max_entries=50000):
+        self.facts_ttl = facts_ttl if facts_ttl is not None else float(os.getenv('ACCOUNT_FACTS_TTL', 24 * 3600))
+        self.balance_ttl = balance_ttl if balance_ttl is not None else float(os.getenv('ACCOUNT_BALANCE_TTL', 30))
+        self.max_entries = max_entries
+
+        self.facts = {}     # {login: (facts dict, cached_at)}
+        self.balances = {}  # {login: (balance dict, cached_at)}
+        self.missing = {}   # {login: cached_at} for logins that don't exist
+
+        self.metrics = {
+            "hits": 0,
+            "balance_refreshes": 0,
+            "misses": 0,
+            "coalesced": 0
+        }
+
+    @staticmethod
+    def key(account_number):
+        return str(account_number).strip()
+
+    def _fresh(self, entry, ttl, now, max_age=None):
+        if entry is None:
+            return False
+        age = now - entry[1]
+        return age < ttl and (max_age is None or age < max_age)
+
+    def get(self, account_number, max_balance_age=None):
+        """
+        Look a login up without touching the database
+
+        Returns:
+        --------
+        tuple
+            (result, tier) where tier is 'hit' (result is complete), 'balance'
+            (facts are cached, the balance must be refreshed) or 'miss'
+        """
+        key = self.key(account_number)
+        now = time.monotonic()
+
+        missing_at = self.missing.get(key)
+        if missing_at is not None and now - missing_at < self.balance_ttl:
+            return {'exists': False}, "hit"
+
+        facts = self.facts.get(key)
+        if not self._fresh(facts, self.facts_ttl, now):
+            return None, "miss"
+
+        balance = self.balances.get(key)
+        # Only existing accounts have cached facts
+        if not self._fresh(balance, self.balance_ttl, now, max_balance_age):
+            return dict(facts[0], exists=True), "balance"
+
+        result = dict(facts[0], exists=True)
+        result.update(balance[0])
+        return result, "hit"
+
+    def put(self, account_number, result):
+        """Store a full verify_account_exists result (errors are not cached)."""
+        key = self.key(account_number)
+        now = time.monotonic()
+        if not result.get('exists'):
+            if 'error' not in result:
+                self.missing[key] = now
+            return
+
+        self.missing.pop(key, None)
+        if len(self.facts) >= self.max_entries:
+            self._evict(now)
+        self.facts[key] = ({field: result.get(field) for field in ACCOUNT_FACTS}, now)
+        self.balances[key] = ({field: result.get(field) for field in ACCOUNT_BALANCE}, now)
+
+    def put_balance(self, account_number, balance):
+        """Store the result of a balance-only query."""
+        self.balances[self.key(account_number)] = (
+            {field: balance.get(field) for field in ACCOUNT_BALANCE}, time.monotonic()
+        )
+
+    def invalidate(self, account_number):
+        key = self.key(account_number)
+        self.facts.pop(key, None)
+        self.balances.pop(key, None)
+        self.missing.pop(key, None)
+
+    def _evict(self, now):
+        self.facts = {key: entry for key, entry in self.facts.items() if now - entry[1] < self.facts_ttl}
+        self.balances = {key: entry for key, entry in self.balances.items() if key in self.facts}
+        self.missing = {key: at for key, at in self.missing.items() if now - at < self.balance_ttl}
+        if len(self.facts) >= self.max_entries:
+            # Still full of live entries: drop the oldest half
+            oldest = sorted(self.facts, key=lambda key: self.facts[key][1])[:len(self.facts) // 2]
+            for key in oldest:
+                self.facts.pop(key, None)
+                self.balances.pop(key, None)
+
+    def record(self, tier):
+        self.metrics[{"hit": "hits", "balance": "balance_refreshes", "miss": "misses"}[tier]] += 1
+
+    def stats(self):
+        """Hit rate and queries saved (full hits and coalesced waiters avoid a query; balance refreshes use a cheaper one)."""
+        hits = self.metrics["hits"]
+        balance_refreshes = self.metrics["balance_refreshes"]
+        misses = self.metrics["misses"]
+        coalesced = self.metrics["coalesced"]
+        requests = hits + balance_refreshes + misses + coalesced
+        return {
+            "requests": requests,
+            "hits": hits,
+            "balance_refreshes": balance_refreshes,
+            "misses": misses,
+            "coalesced": coalesced,
+            "hit_rate": round((hits + coalesced) / requests * 100, 1) if requests else 0.0,
+            "saved_queries": hits + coalesced,
+            "cached_accounts": len(self.facts)
+        }
@@ -0,0 +1,227 @@
+import os
+import time
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from mySQL.mysql_manager import get_mysql_connection
+from mySQL.account_cache import AccountCache
+from mySQL.account_mirror import get_account_mirror
+
+
+class AccountLookupTimeout(Exception):
+    """An account lookup did not finish within its timeout."""
+
+
+class AccountLookupService:
+    """
+    Non-blocking front end for MySQLManager
+
+    The mysql.connector driver blocks, so every lookup runs on a small thread
+    pool (one worker per pooled connection) and the event loop only awaits the
+    result. Each call has a timeout; a timed-out or cancelled caller gets
+    control back immediately, a lookup that has not started yet is dropped,
+    and a running one is bounded server-side by the session
+    max_execution_time set on every pooled connection.
+
+    Account verification goes through an AccountCache, and concurrent
+    verifications of the same login share one in-flight query. When MySQL
+    times out or fails, verification is answered from the local AccountMirror
+    if it is fresh; those results carry source='mirror'.
+
+    Long maintenance jobs (bulk balance refresh, mirror sync, search index)
+    go through run_background() on a separate single thread, so they run one
+    at a time and never hold the workers interactive lookups wait on.
+    """
+
+    def __init__(self, mysql_db=None, max_workers=None, timeout=None, cache=None, mirror=None):
+        self.logger = logging.getLogger('AccountLookup')
+        self._mysql_db = mysql_db
+        self.cache = cache or AccountCache()
+        self.mirror = mirror  # optional AccountMirror used while MySQL is unavailable
+        self._inflight = {}  # {login: asyncio.Future} shared by concurrent verifications
+        self.health_window = 10.0
+        self._last_success = None  # monotonic time of the last lookup that reached the database
+        self.timeout = timeout or float(os.getenv('RDB_LOOKUP_TIMEOUT', 5))
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv('RDB_POOL_SIZE', 5)),
+            thread_name_prefix='mysql-lookup'
+        )
+        self.background_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mysql-background')
+
+        self.metrics = {
+            "lookups": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+            "errors": 0,
+            "mirror_reads": 0,
+            "latency_ms_total": 0.0,
+            "latency_ms_max": 0.0
+        }
+
+    @property
+    def mysql_db(self):
+        # Resolved on a worker thread the first time, since creating the manager connects
+        if self._mysql_db is None:
+            self._mysql_db = get_mysql_connection()
+        return self._mysql_db
+
+    async def run(self, func, *args, timeout=None, **kwargs):
+        """Run a blocking callable on the lookup pool and await it with a timeout."""
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        self.metrics["lookups"] += 1
+
+        future = loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+        try:
+            result = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.metrics["timeouts"] += 1
+            self.logger.warning(f"{getattr(func, '__name__', func)} timed out after {timeout}s")
+            raise AccountLookupTimeout(f"Account lookup timed out after {timeout}s")
+        except asyncio.CancelledError:
+            self.metrics["cancelled"] += 1
+            raise
+        except Exception:
+            self.metrics["errors"] += 1
+            raise
+
+        latency_ms = (time.monotonic() - started) * 1000
+        self.metrics["latency_ms_total"] += latency_ms
+        self.metrics["latency_ms_max"] = max(self.metrics["latency_ms_max"], latency_ms)
+        return result
+
+    async def run_background(self, func, *args, timeout=None, **kwargs):
+        """Run a long maintenance job on the background thread; jobs queue behind each other."""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.background_executor, functools.partial(func, *args, **kwargs))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"{getattr(func, '__name__', func)} timed out after {timeout}s")
+            raise AccountLookupTimeout(f"Background job timed out after {timeout}s")
+
+    async def is_connected(self, timeout=None):
+        """Whether the database can be reached; False on timeout instead of raising."""
+        if self._last_success is not None and time.monotonic() - self._last_success < self.health_window:
+            # A lookup just succeeded; skip the round trip
+            return True
+        try:
+            connected = await self.run(lambda: self.mysql_db.is_connected(), timeout=timeout)
+            if connected:
+                self._last_success = time.monotonic()
+            return connected
+        except Exception as e:
+            self.logger.error(f"MySQL availability check failed: {e}")
+            return False
+
+    async def available(self, timeout=None):
+        """Whether account verification can be answered, from MySQL or a fresh mirror."""
+        if await self.is_connected(timeout):
+            return True
+        return self.mirror is not None and self.mirror.is_fresh()
+
+    async def verify_account(self, account_number, timeout=None, max_balance_age=None, allow_mirror=True):
+        """
+        Cached, coalesced MySQLManager.verify_account_exists; raises AccountLookupTimeout
+
+        max_balance_age (seconds) tightens the balance TTL for callers that
+        need a fresher balance than the cache default. Callers that store the
+        balance as fresh pass allow_mirror=False so a MySQL failure is never
+        answered from the mirror.
+        """
+        cached, tier = self.cache.get(account_number, max_balance_age)
+        if tier == "hit":
+            self.cache.record(tier)
+            return cached
+
+        key = (self.cache.key(account_number), allow_mirror)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.cache.metrics["coalesced"] += 1
+        else:
+            self.cache.record(tier)
+            pending = asyncio.ensure_future(self._fetch_account(account_number, cached, tier, timeout, allow_mirror))
+            self._inflight[key] = pending
+            pending.add_done_callback(functools.partial(self._settled, key))
+
+        # Shielded so one caller giving up doesn't cancel the query the others are waiting on
+        return dict(await asyncio.shield(pending))
+
+    def _settled(self, key, done):
+        if self._inflight.get(key) is done:
+            del self._inflight[key]
+        if not done.cancelled():
+            done.exception()  # retrieved here in case every waiter was cancelled
+
+    async def _fetch_account(self, account_number, cached, tier, timeout, allow_mirror):
+        try:
+            if tier == "balance":
+                balance = await self.run(lambda: self.mysql_db.get_account_balance(account_number), timeout=timeout)
+                if balance is not None:
+                    self._last_success = time.monotonic()
+                    self.cache.put_balance(account_number, balance)
+                    cached.update(balance, exists=True)
+                    return cached
+                # Account gone or query failed: fall back to a full verification
+
+            result = await self.run(lambda: self.mysql_db.verify_account_exists(account_number), timeout=timeout)
+        except AccountLookupTimeout:
+            mirrored = self._from_mirror(account_number) if allow_mirror else None
+            if mirrored is None:
+                raise
+            return mirrored
+
+        if 'error' not in result:
+            self._last_success = time.monotonic()
+            self.cache.put(account_number, result)
+            return result
+        # Mirror answers are not cached, so MySQL is asked again once it recovers
+        if allow_mirror:
+            return self._from_mirror(account_number) or result
+        return result
+
+    def _from_mirror(self, account_number):
+        if self.mirror is None or not self.mirror.is_fresh():
+            return None
+        try:
+            result = self.mirror.verify_account(account_number)
+        except Exception as e:
+            self.logger.error(f"Mirror read failed for {account_number}: {e}")
+            return None
+        if 'error' in result:
+            return None
+        self.metrics["mirror_reads"] += 1
+        self.logger.warning(f"MySQL unavailable; answered {account_number} from mirror "
+                            f"({result.get('staleness_seconds')}s stale)")
+        return result
+
+    async def get_account(self, login, timeout=None):
+        """Async MySQLManager.get_account_by_login; raises AccountLookupTimeout."""
+        return await self.run(lambda: self.mysql_db.get_account_by_login(login), timeout=timeout)
+
+    def stats(self):
+        lookups = self.metrics["lookups"]
+        completed = lookups - self.metrics["timeouts"] - self.metrics["cancelled"] - self.metrics["errors"]
+        return {
+            "lookups": lookups,
+            "timeouts": self.metrics["timeouts"],
+            "cancelled": self.metrics["cancelled"],
+            "errors": self.metrics["errors"],
+            "mirror_reads": self.metrics["mirror_reads"],
+            "avg_latency_ms": round(self.metrics["latency_ms_total"] / completed, 1) if completed > 0 else 0.0,
+            "max_latency_ms": round(self.metrics["latency_ms_max"], 1)
+        }
+
+
+# Global instance
+account_lookup = None
+
+def get_account_lookup():
+    """Get or create the shared account lookup service."""
+    global account_lookup
+    if account_lookup is None:
+        account_lookup = AccountLookupService(mirror=get_account_mirror())
+    return account_lookup
@@ -0,0 +1,291 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from mySQL.mysql_manager import is_real_account_group
+
+# Windows FILETIME (100 ns ticks since 1601-01-01) of the Unix epoch
+FILETIME_EPOCH = 116444736000000000
+
+
+def filetime_to_datetime(filetime):
+    """UTC datetime for an MT5 FILETIME Timestamp, or None for empty values."""
+    if not filetime or filetime <= FILETIME_EPOCH:
+        return None
+    return datetime(1970, 1, 1) + timedelta(microseconds=(filetime - FILETIME_EPOCH) // 10)
+
+
+def datetime_to_filetime(value):
+    """FILETIME for a naive UTC datetime."""
+    return int((value - datetime(1970, 1, 1)).total_seconds() * 10000000) + FILETIME_EPOCH
+
+
+class AccountMirror:
+    """
+    Local SQLite replica of the mt5_users columns the bots read
+
+    sync() copies rows whose FILETIME Timestamp is past the high-water mark of
+    the previous sync, in (Timestamp, Login) keyset batches, so each sync only
+    transfers accounts created or changed since the last one. Every sync is
+    logged with its lag (age of the newest mirrored change) and the mirror
+    reports its staleness (time since the last successful sync), so reads can
+    be served locally, and keep working while the remote database is down.
+    """
+
+    COLUMNS = ("Login", "FirstName", "LastName", "Email", "Balance", "AccountGroup",
+               "Status", "Country", "Company", "Leverage", "Timestamp")
+
+    def __init__(self, db_path="./bot_data/mt5_mirror.db", batch_size=5000, max_staleness=None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.max_staleness = max_staleness if max_staleness is not None else float(os.getenv('MT5_MIRROR_MAX_STALENESS', 900))
+        self.logger = logging.getLogger('AccountMirror')
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS mt5_users (
+                    Login INTEGER PRIMARY KEY,
+                    FirstName TEXT,
+                    LastName TEXT,
+                    Email TEXT,
+                    Balance REAL NOT NULL DEFAULT 0,
+                    AccountGroup TEXT,
+                    Status TEXT,
+                    Country TEXT,
+                    Company TEXT,
+                    Leverage INTEGER NOT NULL DEFAULT 0,
+                    Timestamp INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_mt5_users_timestamp ON mt5_users (Timestamp)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    synced_at REAL NOT NULL,
+                    ok INTEGER NOT NULL,
+                    rows INTEGER NOT NULL,
+                    high_water INTEGER NOT NULL,
+                    last_login INTEGER NOT NULL,
+                    lag_seconds REAL,
+                    duration_ms REAL NOT NULL,
+                    error TEXT
+                )
+            """)
+
+    # =========================================================================== #
+    # ======================= Sync
+    # =========================================================================== #
+    def _last_sync(self, ok_only=True):
+        condition = "WHERE ok = 1" if ok_only else ""
+        return self._conn.execute(f"SELECT * FROM sync_log {condition} ORDER BY id DESC LIMIT 1").fetchone()
+
+    def sync(self, mysql_db):
+        """
+        Pull rows changed since the last sync; blocking, so call it from a worker thread
+
+        Returns:
+        --------
+        dict
+            ok, rows, high_water, lag_seconds, duration_ms (and error on failure)
+        """
+        with self._sync_lock:
+            started = time.monotonic()
+            with self._lock:
+                last = self._last_sync()
+            high_water, last_login = (last["high_water"], last["last_login"]) if last else (0, 0)
+
+            rows_synced = 0
+            error = None
+            while True:
+                rows = mysql_db.execute_query(
+                    """
+                    SELECT
+                        Login,
+                        FirstName,
+                        LastName,
+                        Email,
+                        COALESCE(Balance, 0) as Balance,
+                        `Group` as AccountGroup,
+                        Status,
+                        Country,
+                        Company,
+                        COALESCE(Leverage, 0) as Leverage,
+                        Timestamp
+                    FROM mt5_users
+                    WHERE Timestamp > %s OR (Timestamp = %s AND Login > %s)
+                    ORDER BY Timestamp, Login
+                    LIMIT %s
+                    """,
+                    (high_water, high_water, last_login, self.batch_size)
+                )
+                if rows is None:
+                    error = "mt5_users query failed"
+                    break
+                if not rows:
+                    break
+
+                values = [
+                    tuple(float(row[column] or 0) if column == "Balance" else row[column] for column in self.COLUMNS)
+                    for row in rows
+                ]
+                with self._lock, self._conn:
+                    self._conn.executemany(
+                        f"INSERT OR REPLACE INTO mt5_users ({', '.join(self.COLUMNS)}) "
+                        f"VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                        values
+                    )
+                high_water, last_login = int(rows[-1]["Timestamp"] or 0), int(rows[-1]["Login"])
+                rows_synced += len(rows)
+
+                if len(rows) < self.batch_size:
+                    break
+
+            newest_change = filetime_to_datetime(high_water)
+            lag_seconds = round((datetime.utcnow() - newest_change).total_seconds(), 1) if newest_change else None
+            stats = {
+                "ok": error is None,
+                "rows": rows_synced,
+                "high_water": high_water,
+                "lag_seconds": lag_seconds,
+                "duration_ms": round((time.monotonic() - started) * 1000, 1)
+            }
+            if error:
+                stats["error"] = error
+                self.logger.error(f"Mirror sync failed after {rows_synced} rows: {error}")
+
+            with self._lock, self._conn:
+                # Progress of a failed sync is kept; the next one resumes from it
+                self._conn.execute(
+                    "INSERT INTO sync_log (synced_at, ok, rows, high_water, last_login, lag_seconds, duration_ms, error) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (time.time(), int(error is None), rows_synced, high_water, last_login,
+                     lag_seconds, stats["duration_ms"], error)
+                )
+                self._conn.execute("DELETE FROM sync_log WHERE id <= (SELECT MAX(id) FROM sync_log) - 1000")
+            return stats
+
+    def staleness_seconds(self):
+        """Seconds since the last successful sync, or None if the mirror has never synced."""
+        with self._lock:
+            last = self._last_sync()
+        return round(time.time() - last["synced_at"], 1) if last else None
+
+    def is_fresh(self):
+        staleness = self.staleness_seconds()
+        return staleness is not None and staleness <= self.max_staleness
+
+    def sync_stats(self):
+        """Latest sync outcome, mirror size and staleness."""
+        with self._lock:
+            last = self._last_sync(ok_only=False)
+            accounts = self._conn.execute("SELECT COUNT(*) FROM mt5_users").fetchone()[0]
+        stats = {
+            "accounts": accounts,
+            "staleness_seconds": self.staleness_seconds(),
+            "last_sync_ok": bool(last["ok"]) if last else None,
+            "last_sync_rows": last["rows"] if last else 0,
+            "lag_seconds": last["lag_seconds"] if last else None,
+            "last_sync_ms": last["duration_ms"] if last else None
+        }
+        return stats
+
+    # =========================================================================== #
+    # ======================= Reads
+    # =========================================================================== #
+    def _select(self, query, params=()):
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params).fetchall()]
+
+    def verify_account(self, account_number):
+        """verify_account_exists-shaped result from the mirror, marked with its source and staleness."""
+        try:
+            login = int(account_number)
+        except (TypeError, ValueError):
+            return {'exists': False, 'error': 'Invalid account number format'}
+
+        rows = self._select("SELECT * FROM mt5_users WHERE Login = ?", (login,))
+        if not rows:
+            return {'exists': False, 'source': 'mirror'}
+
+        row = rows[0]
+        account_group = row['AccountGroup'] or ''
+        is_real_account = is_real_account_group(account_group)
+        return {
+            'exists': True,
+            'account_number': str(row['Login']),
+            'name': f"{row['FirstName'] or ''} {row['LastName'] or ''}",
+            'first_name': row['FirstName'] or '',
+            'last_name': row['LastName'] or '',
+            'email': row['Email'] or '',
+            'balance': float(row['Balance']),
+            'group': account_group,
+            'status': row['Status'] or '',
+            'country': row['Country'] or '',
+            'company': row['Company'] or '',
+            'leverage': row['Leverage'],
+            'creation_date': filetime_to_datetime(row['Timestamp']),
+            'is_real_account': is_real_account,
+            'account_type': 'Real' if is_real_account else 'Demo',
+            'source': 'mirror',
+            'staleness_seconds': self.staleness_seconds()
+        }
+
+    def _listing(self, row, date_key):
+        created = filetime_to_datetime(row['Timestamp'])
+        return {
+            'account_number': row['Login'],
+            'name': f"{row['FirstName'] or ''} {row['LastName'] or ''}",
+            'Email': row['Email'],
+            'Timestamp': row['Timestamp'],
+            date_key: created,
+            'Balance': float(row['Balance']),
+            'account_group': row['AccountGroup'],
+            'Status': row['Status'],
+            'Country': row['Country'],
+            'days_ago': (datetime.utcnow() - created).days if created else None
+        }
+
+    def recent_accounts(self, days=7, limit=20):
+        """Accounts whose FILETIME Timestamp is within the last `days` days, newest first."""
+        cutoff = datetime_to_filetime(datetime.utcnow() - timedelta(days=days))
+        rows = self._select(
+            "SELECT * FROM mt5_users WHERE Timestamp > ? ORDER BY Timestamp DESC LIMIT ?",
+            (cutoff, limit)
+        )
+        return [self._listing(row, 'registration_date') for row in rows]
+
+    def newest_accounts(self, limit=10):
+        """Highest logins with a valid Timestamp."""
+        rows = self._select(
+            "SELECT * FROM mt5_users WHERE Timestamp > ? ORDER BY Login DESC LIMIT ?",
+            (FILETIME_EPOCH, limit)
+        )
+        return [self._listing(row, 'created_date') for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Global instance
+account_mirror = None
+
+def get_account_mirror():
+    """Get or create the shared local mt5_users mirror."""
+    global account_mirror
+    if account_mirror is None:
+        account_mirror = AccountMirror()
+    return account_mirror
@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import logging
+import threading
+
+
+class AccountSearchIndex:
+    """
+    Local SQLite FTS5 trigram index of account names and emails
+
+    Gives admins fuzzy, substring lookups ("smit" finds "Goldsmith") without a
+    full scan of mt5_users. The index is filled incrementally from rows whose
+    MT5 Timestamp is newer than the last refresh, so a refresh only reads
+    accounts created or changed since the previous one.
+    """
+
+    def __init__(self, db_path="./bot_data/account_search.db", batch_size=5000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.logger = logging.getLogger('AccountSearchIndex')
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            # rowid is the MT5 login; trigram tokenizer allows substring MATCH/LIKE (SQLite 3.34+)
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS account_names USING fts5(
+                    name, email, tokenize = 'trigram'
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS index_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    high_water INTEGER NOT NULL,
+                    last_login INTEGER NOT NULL
+                )
+            """)
+
+    def _state(self):
+        row = self._conn.execute("SELECT high_water, last_login FROM index_state WHERE id = 1").fetchone()
+        return row if row else (0, 0)
+
+    def refresh(self, mysql_db):
+        """Index accounts changed since the last refresh; returns the number of rows indexed."""
+        indexed = 0
+        with self._lock:
+            high_water, last_login = self._state()
+
+        while True:
+            rows = mysql_db.execute_query(
+                """
+                SELECT Login, FirstName, LastName, Email, Timestamp
+                FROM mt5_users
+                WHERE Timestamp > %s OR (Timestamp = %s AND Login > %s)
+                ORDER BY Timestamp, Login
+                LIMIT %s
+                """,
+                (high_water, high_water, last_login, self.batch_size)
+            )
+            if rows is None:
+                self.logger.error("Account index refresh query failed")
+                break
+            if not rows:
+                break
+
+            entries = [
+                (
+                    int(row["Login"]),
+                    f"{row['FirstName'] or ''} {row['LastName'] or ''}".strip(),
+                    row["Email"] or ""
+                )
+                for row in rows
+            ]
+            high_water, last_login = int(rows[-1]["Timestamp"] or 0), int(rows[-1]["Login"])
+
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM account_names WHERE rowid = ?", [(entry[0],) for entry in entries])
+                self._conn.executemany("INSERT INTO account_names (rowid, name, email) VALUES (?, ?, ?)", entries)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO index_state (id, high_water, last_login) VALUES (1, ?, ?)",
+                    (high_water, last_login)
+                )
+            indexed += len(entries)
+
+            if len(rows) < self.batch_size:
+                break
+
+        return indexed
+
+    def search(self, term, limit=10, after_login=None):
+        """Logins whose name or email contains term, ordered by login descending."""
+        term = term.strip()
+        if not term:
+            return []
+
+        if len(term) >= 3:
+            # Quoted so the term is matched as a literal substring, not FTS syntax
+            condition = "account_names MATCH ?"
+            params = ['"' + term.replace('"', '""') + '"']
+        else:
+            # Trigrams need 3 characters; shorter terms fall back to LIKE
+            condition = "(name LIKE ? OR email LIKE ?)"
+            params = [f"%{term}%", f"%{term}%"]
+
+        if after_login is not None:
+            condition += " AND rowid < ?"
+            params.append(int(after_login))
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT rowid FROM account_names WHERE {condition} ORDER BY rowid DESC LIMIT ?",
+                params + [limit]
+            ).fetchall()
+        return [int(row[0]) for row in rows]
+
+    def size(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM account_names").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+
+from mySQL.mysql_manager import get_mysql_connection
+
+
+class BalanceRefresher:
+    """
+    Bulk refresh of account_balance for every registered trading account
+
+    Collects all trading accounts from the user store, fetches their balances
+    from mt5_users in chunked IN (...) queries and writes the changed ones back
+    in one batch. In incremental mode only rows whose MT5 Timestamp moved past
+    the high-water mark of the previous run are fetched, plus accounts that
+    have never been refreshed. The high-water mark and the set of refreshed
+    accounts persist in `state_path` across restarts.
+    """
+
+    def __init__(self, db, mysql_db=None, chunk_size=500, state_path="./bot_data/balance_refresh.json", cache=None):
+        self.db = db
+        self._mysql_db = mysql_db
+        self.chunk_size = chunk_size
+        self.state_path = state_path
+        self.cache = cache  # optional AccountCache kept in step with refreshed balances
+        self.logger = logging.getLogger('BalanceRefresher')
+        self.state = self._load_state()
+        self._run_lock = threading.Lock()  # one run at a time owns `state`
+
+    @property
+    def mysql_db(self):
+        if self._mysql_db is None:
+            self._mysql_db = get_mysql_connection()
+        return self._mysql_db
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+            state["refreshed_logins"] = set(state.get("refreshed_logins", []))
+            return state
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Error loading balance refresh state: {e}")
+        return {"high_water": None, "refreshed_logins": set(), "last_run": None}
+
+    def _save_state(self):
+        state = dict(self.state, refreshed_logins=sorted(self.state["refreshed_logins"]))
+        tmp_path = f"{self.state_path}.tmp"
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def run(self, incremental=True):
+        """
+        Refresh balances; blocking, so call it from a worker thread
+
+        Returns:
+        --------
+        dict or None
+            mode, accounts, fetched, users_updated, queries, duration_ms;
+            None when another run is still in progress
+        """
+        if not self._run_lock.acquire(blocking=False):
+            self.logger.info("Balance refresh already running, skipping")
+            return None
+        try:
+            return self._refresh(incremental)
+        finally:
+            self._run_lock.release()
+
+    def _refresh(self, incremental):
+        started = time.monotonic()
+        accounts = self.db.get_trading_accounts()
+        high_water = self.state.get("high_water")
+        incremental = incremental and high_water is not None
+
+        rows = []
+        queries = 0
+        if incremental:
+            known = [login for login in accounts if login in self.state["refreshed_logins"]]
+            new = [login for login in accounts if login not in self.state["refreshed_logins"]]
+            if known:
+                rows += self.mysql_db.get_balances(known, self.chunk_size, since_filetime=high_water)
+                queries += -(-len(known) // self.chunk_size)
+            if new:
+                rows += self.mysql_db.get_balances(new, self.chunk_size)
+                queries += -(-len(new) // self.chunk_size)
+        elif accounts:
+            rows = self.mysql_db.get_balances(list(accounts), self.chunk_size)
+            queries = -(-len(accounts) // self.chunk_size)
+
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        updates = {}
+        for row in rows:
+            login = int(row["login"])
+            balance = float(row["balance"])
+            for user_id, stored_balance in accounts.get(login, ()):
+                if stored_balance != balance:
+                    updates[user_id] = {"account_balance": balance, "last_balance_update": now}
+            if self.cache is not None:
+                self.cache.put_balance(login, dict(row, balance=balance))
+            if row.get("timestamp"):
+                high_water = max(high_water or 0, int(row["timestamp"]))
+
+        users_updated = self.db.update_users(updates) if updates else 0
+
+        self.state["high_water"] = high_water
+        self.state["refreshed_logins"].update(int(row["login"]) for row in rows)
+        if not incremental:
+            # A full run saw every account; forget ones no longer registered
+            self.state["refreshed_logins"] &= set(accounts)
+        self.state["last_run"] = now
+        try:
+            self._save_state()
+        except Exception as e:
+            self.logger.error(f"Error saving balance refresh state: {e}")
+
+        stats = {
+            "mode": "incremental" if incremental else "full",
+            "accounts": len(accounts),
+            "fetched": len(rows),
+            "users_updated": users_updated,
+            "queries": queries,
+            "duration_ms": round((time.monotonic() - started) * 1000, 1)
+        }
+        self.logger.info(f"Balance refresh: {stats}")
+        return stats
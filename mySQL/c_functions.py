@@ -1,9 +1,51 @@
 from imports import *
+from mySQL.balance_refresh import BalanceRefresher
+from mySQL.account_search_index import AccountSearchIndex
+from mySQL.account_mirror import datetime_to_filetime
 
 
 # ============================ MySQL Functions ============================================== #
 # ================================================================================================= #
 
+def account_lookup_report(mysql_db):
+    """Pool, lookup and verification cache counters for admin diagnostics."""
+    pool = mysql_db.pool_stats()
+    lookup = get_account_lookup()
+    lookups = lookup.stats()
+    cache = lookup.cache.stats()
+    return (
+        f"🔌 <b>Connection Pool:</b> {pool['idle']}/{pool['size']} idle, "
+        f"{pool['borrows']:,} borrows, {pool['connect_failures']} connect failures\n"
+        f"⏱️ <b>Lookups:</b> {lookups['lookups']:,} (avg {lookups['avg_latency_ms']} ms, "
+        f"{lookups['timeouts']} timeouts)\n"
+        f"🗃️ <b>Account Cache:</b> {cache['hit_rate']}% hit rate, "
+        f"{cache['saved_queries']:,} queries saved, {cache['balance_refreshes']:,} balance-only refreshes, "
+        f"{cache['cached_accounts']:,} accounts cached"
+    ) + account_mirror_report(lookup.mirror)
+
+def account_mirror_report(mirror):
+    """One diagnostics line on the local mt5_users mirror."""
+    if mirror is None:
+        return ""
+    stats = mirror.sync_stats()
+    if stats['staleness_seconds'] is None:
+        return "\n🪞 <b>Account Mirror:</b> not synced yet"
+    return (
+        f"\n🪞 <b>Account Mirror:</b> {stats['accounts']:,} accounts, synced {stats['staleness_seconds']:.0f}s ago "
+        f"({'ok' if stats['last_sync_ok'] else 'last sync failed'}), newest change {stats['lag_seconds']}s old"
+    )
+
+def synced_account_mirror():
+    """The local mt5_users mirror if it has completed a sync, else None."""
+    mirror = get_account_lookup().mirror
+    if mirror is not None and mirror.staleness_seconds() is not None:
+        return mirror
+    return None
+
+def mirror_note(mirror):
+    staleness = mirror.staleness_seconds()
+    return f"<i>Local mirror, synced {staleness:.0f}s ago</i>\n\n" if staleness is not None else ""
+
 async def test_mysql_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Test MySQL database connection and functionality."""
     if update.effective_user.id not in ADMIN_USER_ID:
@@ -29,7 +71,8 @@ async def test_mysql_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 f"Active Accounts: {stats['active_accounts']:,}\n"
                 f"Average Balance: ${stats['avg_balance']:,.2f}\n"
                 f"Maximum Balance: ${stats['max_balance']:,.2f}\n"
-                f"Total Balance: ${stats['total_balance']:,.2f}",
+                f"Total Balance: ${stats['total_balance']:,.2f}\n\n"
+                f"{account_lookup_report(mysql_db)}",
                 parse_mode='HTML'
             )
         else:
@@ -37,6 +80,82 @@ async def test_mysql_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     except Exception as e:
         await update.message.reply_text(f"❌ Error testing MySQL: {e}")
 
+SEARCH_PAGE_SIZE = 10
+SEARCH_HISTORY = 20  # recent searches per admin whose "Next page" buttons still work
+
+# Optional local fuzzy index of account names (ACCOUNT_SEARCH_INDEX=1)
+account_search_index = AccountSearchIndex() if os.getenv('ACCOUNT_SEARCH_INDEX', '0') == '1' else None
+
+def find_accounts(mysql_db, search_term, after_login=None, fuzzy=False):
+    """
+    One page of account search results.
+    Prefix search on MySQL first; when that finds nothing and the local index
+    is enabled, fall back to a fuzzy substring search. Returns (results, fuzzy).
+    """
+    if not fuzzy:
+        results = mysql_db.search_accounts(search_term, limit=SEARCH_PAGE_SIZE, after_login=after_login)
+        if results or after_login is not None or account_search_index is None:
+            return results, False
+    
+    if account_search_index is None:
+        return [], True
+    logins = account_search_index.search(search_term, limit=SEARCH_PAGE_SIZE, after_login=after_login)
+    return mysql_db.get_accounts_by_logins(logins), True
+
+def remember_search(context, search_term):
+    """Store a search term under a short id so each result message pages its own search."""
+    searches = context.user_data.setdefault('account_searches', {})
+    search_id = context.user_data.get('account_search_seq', 0) + 1
+    context.user_data['account_search_seq'] = search_id
+    searches[search_id] = search_term
+    for old_id in list(searches)[:-SEARCH_HISTORY]:
+        del searches[old_id]
+    return search_id
+
+async def send_account_search_page(message_target, context, search_term, after_login=None, fuzzy=False, search_id=None):
+    """Run one search page off the event loop and reply with results and a next-page button."""
+    lookup = get_account_lookup()
+    # lookup.mysql_db connects on first use, so resolve it on the worker thread too
+    results, fuzzy = await lookup.run(lambda: find_accounts(lookup.mysql_db, search_term, after_login, fuzzy))
+    
+    if not results:
+        if after_login is None:
+            await message_target.reply_text(f"No accounts found for '{search_term}'")
+        else:
+            await message_target.reply_text(f"No more accounts for '{search_term}'")
+        return
+    
+    match_type = "Fuzzy matches" if fuzzy else "Search Results"
+    message = f"🔍 {match_type} for '{search_term}':\n\n"
+    for account in results:
+        message += f"<b>Account:</b> {account['account_number']}\n"
+        message += f"<b>Name:</b> {account['name']}\n"
+        message += f"<b>Email:</b> {account['email']}\n"
+        message += f"<b>Balance:</b> ${account['balance']:.2f}\n"
+        message += f"<b>Group:</b> {account['account_group']}\n"
+        message += f"<b>Status:</b> {account['Status']}\n"
+        message += f"<b>Country:</b> {account['Country']}\n"
+        message += f"<b>Company:</b> {account['Company']}\n\n"
+    
+    reply_markup = None
+    if len(results) == SEARCH_PAGE_SIZE:
+        # Keyset cursor: the next page starts below the last login shown
+        if search_id is None:
+            search_id = remember_search(context, search_term)
+        mode = "f" if fuzzy else "p"
+        reply_markup = InlineKeyboardMarkup([
+            [InlineKeyboardButton("➡️ Next page", callback_data=f"searchacc_{search_id}_{mode}_{results[-1]['account_number']}")]
+        ])
+    
+    # Split message if too long
+    chunks = [message[i:i+4000] for i in range(0, len(message), 4000)]
+    for n, chunk in enumerate(chunks):
+        await message_target.reply_text(
+            chunk,
+            parse_mode='HTML',
+            reply_markup=reply_markup if n == len(chunks) - 1 else None
+        )
+
 async def search_account_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Search for accounts in the MySQL database."""
     if update.effective_user.id not in ADMIN_USER_ID:
@@ -48,66 +167,70 @@ async def search_account_command(update: Update, context: ContextTypes.DEFAULT_T
         return
     
     search_term = " ".join(context.args)
-    mysql_db = get_mysql_connection()
     
-    if not mysql_db.is_connected():
+    if not await get_account_lookup().is_connected():
         await update.message.reply_text("❌ MySQL database not available")
         return
     
     try:
-        results = mysql_db.search_accounts(search_term, limit=10)
-        
-        if results:
-            message = f"🔍 Search Results for '{search_term}':\n\n"
-            for account in results:
-                message += f"<b>Account:</b> {account['account_number']}\n"
-                message += f"<b>Name:</b> {account['name']}\n"
-                message += f"<b>Email:</b> {account['email']}\n"
-                message += f"<b>Balance:</b> ${account['balance']:.2f}\n"
-                message += f"<b>Group:</b> {account['account_group']}\n"
-                message += f"<b>Status:</b> {account['Status']}\n"
-                message += f"<b>Country:</b> {account['Country']}\n"
-                message += f"<b>Company:</b> {account['Company']}\n\n"
-            
-            # Split message if too long
-            if len(message) > 4000:
-                chunks = [message[i:i+4000] for i in range(0, len(message), 4000)]
-                for chunk in chunks:
-                    await update.message.reply_text(chunk, parse_mode='HTML')
-            else:
-                await update.message.reply_text(message, parse_mode='HTML')
-        else:
-            await update.message.reply_text(f"No accounts found for '{search_term}'")
-            
+        await send_account_search_page(update.message, context, search_term)
     except Exception as e:
         await update.message.reply_text(f"❌ Error searching accounts: {e}")
 
+async def search_account_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Next page of /searchaccount results (callback data searchacc_<search_id>_<p|f>_<after_login>)."""
+    query = update.callback_query
+    await query.answer()
+    
+    if query.from_user.id not in ADMIN_USER_ID:
+        return
+    
+    _, search_id, mode, after_login = query.data.split("_")
+    search_id = int(search_id)
+    search_term = context.user_data.get('account_searches', {}).get(search_id)
+    if not search_term:
+        await query.message.reply_text("Search expired. Run /searchaccount again.")
+        return
+    
+    try:
+        await send_account_search_page(query.message, context, search_term, int(after_login),
+                                       fuzzy=(mode == "f"), search_id=search_id)
+    except Exception as e:
+        await query.message.reply_text(f"❌ Error searching accounts: {e}")
+
 async def recent_accounts_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show recently registered accounts."""
     if update.effective_user.id not in ADMIN_USER_ID:
         await update.message.reply_text("This command is only available to admins.")
         return
     
-    mysql_db = get_mysql_connection()
-    
-    if not mysql_db.is_connected():
-        await update.message.reply_text("❌ MySQL database not available")
-        return
+    mirror = synced_account_mirror()
+    if mirror is None:
+        mysql_db = get_mysql_connection()
+        
+        if not mysql_db.is_connected():
+            await update.message.reply_text("❌ MySQL database not available")
+            return
     
     try:
         # Get accounts from last X days
         days = int(context.args[0]) if context.args and context.args[0].isdigit() else 7
         
-        # Try the original method first
-        try:
-            results = mysql_db.get_recent_registrations(days=days, limit=15)
-        except Exception as e:
-            print(f"Original method failed: {e}")
-            # Fall back to the safer method
-            results = mysql_db.get_recent_accounts(days=days, limit=15)
+        if mirror is not None:
+            results = await get_account_lookup().run(mirror.recent_accounts, days, 15)
+        else:
+            # Try the original method first
+            try:
+                results = mysql_db.get_recent_registrations(days=days, limit=15)
+            except Exception as e:
+                print(f"Original method failed: {e}")
+                # Fall back to the safer method
+                results = mysql_db.get_recent_accounts(days=days, limit=15)
         
         if results:
             message = f"📅 <b>Accounts Registered in Last {days} Days:</b>\n\n"
+            if mirror is not None:
+                message += mirror_note(mirror)
             for account in results:
                 reg_date = account.get('registration_date')
                 if isinstance(reg_date, str):
@@ -736,43 +859,49 @@ async def recent_accounts_timestamp_command(update: Update, context: ContextType
         await update.message.reply_text("This command is only available to admins.")
         return
     
-    mysql_db = get_mysql_connection()
-    
-    if not mysql_db.is_connected():
-        await update.message.reply_text("❌ MySQL database not available")
-        return
+    mirror = synced_account_mirror()
+    if mirror is None:
+        mysql_db = get_mysql_connection()
+        
+        if not mysql_db.is_connected():
+            await update.message.reply_text("❌ MySQL database not available")
+            return
     
     try:
         days = int(context.args[0]) if context.args and context.args[0].isdigit() else 7
         
-        # Calculate Unix timestamp for X days ago
-        from datetime import datetime, timedelta
-        cutoff_date = datetime.now() - timedelta(days=days)
-        cutoff_timestamp = int(cutoff_date.timestamp())
-        
-        query = """
-        SELECT 
-            Login as account_number,
-            CONCAT(COALESCE(FirstName, ''), ' ', COALESCE(LastName, '')) as name,
-            Email,
-            Timestamp,
-            FROM_UNIXTIME(Timestamp) as registration_date,
-            COALESCE(Balance, 0) as Balance,
-            `Group` as account_group,
-            Status,
-            Country,
-            ROUND((UNIX_TIMESTAMP() - Timestamp) / 86400) as days_ago
-        FROM mt5_users 
-        WHERE Timestamp > %s
-        AND Timestamp > 0
-        ORDER BY Timestamp DESC
-        LIMIT 20
-        """
-        
-        results = mysql_db.execute_query(query, (cutoff_timestamp,))
+        if mirror is not None:
+            results = await get_account_lookup().run(mirror.recent_accounts, days, 20)
+        else:
+            # Timestamp is a Windows FILETIME (100 ns ticks since 1601), not Unix seconds
+            from datetime import datetime, timedelta
+            cutoff_timestamp = datetime_to_filetime(datetime.utcnow() - timedelta(days=days))
+            
+            query = """
+            SELECT 
+                Login as account_number,
+                CONCAT(COALESCE(FirstName, ''), ' ', COALESCE(LastName, '')) as name,
+                Email,
+                Timestamp,
+                FROM_UNIXTIME((Timestamp - 116444736000000000) / 10000000) as registration_date,
+                COALESCE(Balance, 0) as Balance,
+                `Group` as account_group,
+                Status,
+                Country,
+                ROUND((UNIX_TIMESTAMP() - (Timestamp - 116444736000000000) / 10000000) / 86400) as days_ago
+            FROM mt5_users 
+            WHERE Timestamp > %s
+            AND Timestamp > 116444736000000000
+            ORDER BY Timestamp DESC
+            LIMIT 20
+            """
+            
+            results = mysql_db.execute_query(query, (cutoff_timestamp,))
         
         if results:
             message = f"📅 <b>Recent Accounts (Last {days} Days) - Using Timestamp:</b>\n\n"
+            if mirror is not None:
+                message += mirror_note(mirror)
             for account in results:
                 reg_date = account['registration_date']
                 if reg_date:
@@ -1216,36 +1345,43 @@ async def newest_accounts_simple_command(update: Update, context: ContextTypes.D
         await update.message.reply_text("This command is only available to admins.")
         return
     
-    mysql_db = get_mysql_connection()
-    
-    if not mysql_db.is_connected():
-        await update.message.reply_text("❌ MySQL database not available")
-        return
+    mirror = synced_account_mirror()
+    if mirror is None:
+        mysql_db = get_mysql_connection()
+        
+        if not mysql_db.is_connected():
+            await update.message.reply_text("❌ MySQL database not available")
+            return
     
     try:
         limit = int(context.args[0]) if context.args and context.args[0].isdigit() else 10
         
-        # Completely safe query - no datetime columns at all
-        query = """
-        SELECT 
-            Login as account_number,
-            CONCAT(COALESCE(FirstName, ''), ' ', COALESCE(LastName, '')) as name,
-            Email,
-            COALESCE(Balance, 0) as Balance,
-            `Group` as account_group,
-            Status,
-            Country,
-            FROM_UNIXTIME((Timestamp - 116444736000000000) / 10000000) as created_date
-        FROM mt5_users 
-        WHERE Timestamp > 116444736000000000
-        ORDER BY Login DESC
-        LIMIT %s
-        """
-        
-        results = mysql_db.execute_query(query, (limit,))
+        if mirror is not None:
+            results = await get_account_lookup().run(mirror.newest_accounts, limit)
+        else:
+            # Completely safe query - no datetime columns at all
+            query = """
+            SELECT 
+                Login as account_number,
+                CONCAT(COALESCE(FirstName, ''), ' ', COALESCE(LastName, '')) as name,
+                Email,
+                COALESCE(Balance, 0) as Balance,
+                `Group` as account_group,
+                Status,
+                Country,
+                FROM_UNIXTIME((Timestamp - 116444736000000000) / 10000000) as created_date
+            FROM mt5_users 
+            WHERE Timestamp > 116444736000000000
+            ORDER BY Login DESC
+            LIMIT %s
+            """
+            
+            results = mysql_db.execute_query(query, (limit,))
         
         if results:
             message = f"📅 <b>Newest {limit} Accounts (by Login ID):</b>\n\n"
+            if mirror is not None:
+                message += mirror_note(mirror)
             for account in results:
                 created_date = account['created_date']
                 formatted_date = created_date.strftime('%Y-%m-%d %H:%M:%S') if created_date else 'Unknown'
@@ -1748,6 +1884,20 @@ async def check_accounts_table_sample_command(update: Update, context: ContextTy
     except Exception as e:
         await update.message.reply_text(f"❌ Error getting sample from mt5_accounts: {e}")
 
+def store_fresh_balance(user_id, balance, user_info=None):
+    """Write a fetched balance to the local user store, skipping the write when it hasn't changed."""
+    if user_info is None:
+        user_info = db.get_user(user_id)
+    if user_info and user_info.get("account_balance") == balance:
+        return False
+    
+    db.add_user({
+        "user_id": user_id,
+        "account_balance": balance,
+        "last_balance_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    })
+    return True
+
 async def get_fresh_balance(user_id, trading_account=None):
     """
     Fetch  balance from MySQL database.
@@ -1764,13 +1914,13 @@ async def get_fresh_balance(user_id, trading_account=None):
                 return None
         
         # Connect to MySQL and get fresh data
-        mysql_db = get_mysql_connection()
-        if not mysql_db.is_connected():
+        lookup = get_account_lookup()
+        if not await lookup.is_connected():
             print(f"MySQL not connected for user {user_id}")
             return None
         
         # Fetch current account info
-        account_info = mysql_db.verify_account_exists(trading_account)
+        account_info = await lookup.verify_account(trading_account, allow_mirror=False)
         
         if not account_info['exists']:
             return None
@@ -1778,11 +1928,7 @@ async def get_fresh_balance(user_id, trading_account=None):
         current_balance = float(account_info.get('balance', 0))
         
         # Update local database with fresh balance
-        db.add_user({
-            "user_id": user_id,
-            "account_balance": current_balance,
-            "last_balance_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        })
+        store_fresh_balance(user_id, current_balance)
         
         return {
             "balance": current_balance,
@@ -1796,4 +1942,48 @@ async def get_fresh_balance(user_id, trading_account=None):
         print(f"Error getting fresh balance for user {user_id}: {e}")
         return None
 
+balance_refresher = None
+
+async def refresh_balances_job(context: ContextTypes.DEFAULT_TYPE, incremental=True) -> None:
+    """Scheduled bulk refresh of every registered account's balance from mt5_users."""
+    global balance_refresher
+    lookup = get_account_lookup()
+    if balance_refresher is None:
+        balance_refresher = BalanceRefresher(db, cache=lookup.cache)
+    
+    try:
+        # Blocking chunked queries and one batched write, run off the event loop
+        stats = await lookup.run_background(balance_refresher.run, incremental, timeout=600)
+        if stats is None:
+            return
+        print(f"💰 Balance refresh ({stats['mode']}): {stats['fetched']}/{stats['accounts']} accounts fetched, "
+              f"{stats['users_updated']} users updated in {stats['duration_ms']} ms")
+    except Exception as e:
+        logger.error(f"Error refreshing balances: {e}")
+
+async def sync_account_mirror_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Scheduled incremental sync of the local mt5_users mirror."""
+    lookup = get_account_lookup()
+    if lookup.mirror is None:
+        return
+    
+    try:
+        stats = await lookup.run_background(lambda: lookup.mirror.sync(lookup.mysql_db), timeout=600)
+        if stats['rows'] or not stats['ok']:
+            print(f"🪞 Account mirror sync: {stats['rows']} rows in {stats['duration_ms']} ms, "
+                  f"newest change {stats['lag_seconds']}s old{'' if stats['ok'] else ' (failed: ' + stats['error'] + ')'}")
+    except Exception as e:
+        logger.error(f"Error syncing account mirror: {e}")
 
+async def refresh_account_search_index_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Scheduled incremental refresh of the local account name index."""
+    if account_search_index is None:
+        return
+    
+    lookup = get_account_lookup()
+    try:
+        indexed = await lookup.run_background(lambda: account_search_index.refresh(lookup.mysql_db), timeout=600)
+        if indexed:
+            print(f"🔎 Account search index: {indexed} accounts indexed ({account_search_index.size():,} total)")
+    except Exception as e:
+        logger.error(f"Error refreshing account search index: {e}")
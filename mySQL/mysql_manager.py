@@ -1,6 +1,8 @@
 import mysql.connector
 from mysql.connector import Error
 import os
+import time
+import threading
 from dotenv import load_dotenv
 import logging
 from datetime import datetime
@@ -8,14 +10,236 @@ from datetime import datetime
 # Load environment variables
 load_dotenv()
 
+SESSION_QUERIES = [
+    "SET SESSION sql_mode = 'TRADITIONAL,NO_ZERO_DATE,NO_ZERO_IN_DATE,ERROR_FOR_DIVISION_BY_ZERO'",
+    "SET SESSION time_zone = '+00:00'",
+    # Server-side cap on SELECTs so a lookup abandoned by its caller doesn't hold a connection
+    f"SET SESSION max_execution_time = {int(float(os.getenv('RDB_QUERY_TIMEOUT', 10)) * 1000)}"
+]
+
+
+class PooledConnection:
+    """A pooled connection plus the prepared cursors cached on it."""
+
+    __slots__ = ("connection", "created_at", "last_checked", "prepared")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_checked = self.created_at
+        self.prepared = {}  # {query: prepared cursor}, reused so each statement is prepared once per connection
+
+
+class ConnectionPool:
+    """
+    Fixed-size, thread-safe pool of database connections
+
+    At most `size` connections exist at once; callers borrow one, get a fresh
+    cursor for their query and hand the connection back. Connections idle for
+    longer than `health_check_interval` seconds are pinged before reuse and
+    replaced if dead. Opening a connection retries with exponential backoff,
+    and after a failed round new borrows fail fast until the backoff expires
+    instead of each waiting on a dead server.
+    """
+
+    def __init__(self, connect, size=5, health_check_interval=30.0, borrow_timeout=10.0,
+                 max_connect_attempts=3, backoff_base=0.5, backoff_max=30.0):
+        """
+        Parameters:
+        -----------
+        connect: callable
+            connect() -> new DB-API connection (mysql.connector, MariaDB or sqlite3)
+        """
+        self.connect = connect
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.borrow_timeout = borrow_timeout
+        self.max_connect_attempts = max_connect_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.logger = logging.getLogger('MySQLPool')
+
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._failures = 0
+        self._retry_at = 0.0
+
+        self.metrics = {
+            "borrows": 0,
+            "opened": 0,
+            "discarded": 0,
+            "health_checks": 0,
+            "connect_failures": 0,
+            "wait_ms_total": 0.0
+        }
+
+    def _open(self):
+        """Open a new connection, retrying with exponential backoff."""
+        now = time.monotonic()
+        if now < self._retry_at:
+            raise ConnectionError(f"Database unavailable, next connection attempt in {self._retry_at - now:.1f}s")
+
+        last_error = None
+        for attempt in range(self.max_connect_attempts):
+            try:
+                connection = self.connect()
+                self.metrics["opened"] += 1
+                self._failures = 0
+                return PooledConnection(connection)
+            except Exception as e:
+                last_error = e
+                self.metrics["connect_failures"] += 1
+                self.logger.warning(f"Connection attempt {attempt + 1}/{self.max_connect_attempts} failed: {e}")
+                if attempt + 1 < self.max_connect_attempts:
+                    time.sleep(min(self.backoff_base * 2 ** attempt, self.backoff_max))
+
+        self._failures += 1
+        self._retry_at = time.monotonic() + min(self.backoff_base * 2 ** (self.max_connect_attempts + self._failures), self.backoff_max)
+        raise last_error
+
+    @staticmethod
+    def _ping(connection):
+        if hasattr(connection, "is_connected"):
+            return connection.is_connected()
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            return True
+        finally:
+            cursor.close()
+
+    def _healthy(self, pooled):
+        if time.monotonic() - pooled.last_checked < self.health_check_interval:
+            return True
+        self.metrics["health_checks"] += 1
+        try:
+            healthy = self._ping(pooled.connection)
+        except Exception:
+            healthy = False
+        pooled.last_checked = time.monotonic()
+        return healthy
+
+    def acquire(self):
+        """Borrow a healthy connection; release() it when done."""
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.borrow_timeout):
+            raise TimeoutError(f"No database connection free after {self.borrow_timeout}s")
+        self.metrics["borrows"] += 1
+        self.metrics["wait_ms_total"] += (time.monotonic() - started) * 1000
+
+        try:
+            while True:
+                with self._lock:
+                    pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    return self._open()
+                if self._healthy(pooled):
+                    return pooled
+                self.discard(pooled, release=False)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, pooled):
+        with self._lock:
+            self._idle.append(pooled)
+        self._slots.release()
+
+    def discard(self, pooled, release=True):
+        """Close a broken connection; its slot is freed for a new one."""
+        self.metrics["discarded"] += 1
+        self._close(pooled)
+        if release:
+            self._slots.release()
+
+    def recycle(self, pooled):
+        """Return a connection after a failed query if it still answers, otherwise discard it."""
+        try:
+            healthy = self._ping(pooled.connection)
+        except Exception:
+            healthy = False
+        if healthy:
+            pooled.last_checked = time.monotonic()
+            self.release(pooled)
+        else:
+            self.discard(pooled)
+
+    @staticmethod
+    def _close(pooled):
+        for cursor in pooled.prepared.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        try:
+            pooled.connection.close()
+        except Exception:
+            pass
+
+    def close_idle(self):
+        """Close every idle connection (borrowed ones close when discarded)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._close(pooled)
+        return len(idle)
+
+    def reset_backoff(self):
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def stats(self):
+        borrows = self.metrics["borrows"]
+        with self._lock:
+            idle = len(self._idle)
+        return {
+            "size": self.size,
+            "idle": idle,
+            "borrows": borrows,
+            "opened": self.metrics["opened"],
+            "discarded": self.metrics["discarded"],
+            "health_checks": self.metrics["health_checks"],
+            "connect_failures": self.metrics["connect_failures"],
+            "avg_wait_ms": round(self.metrics["wait_ms_total"] / borrows, 2) if borrows else 0.0
+        }
+
+
+def is_real_account_group(account_group):
+    """Determine if an account is real/live based on its MT5 group name."""
+    if not account_group:
+        return False
+    
+    account_group_lower = account_group.lower()
+    
+    # Check for demo indicators
+    demo_indicators = ['demo', 'practice', 'test']
+    if any(indicator in account_group_lower for indicator in demo_indicators):
+        return False
+    
+    # Check for real indicators
+    real_indicators = ['real', 'live', 'retail', 'vortex-retail']
+    if any(indicator in account_group_lower for indicator in real_indicators):
+        return True
+    
+    # If no clear indicators, assume demo for safety
+    return False
+
+
 class MySQLManager:
     """MySQL database manager for real-time account verification."""
     
-    def __init__(self):
-        """Initialize MySQL connection."""
+    def __init__(self, pool_size=None, connection_factory=None, placeholder="%s"):
+        """
+        Initialize the connection pool.
+
+        connection_factory/placeholder let the manager run against another
+        DB-API driver in tests, e.g. sqlite3.connect(path, check_same_thread=False)
+        with placeholder '?' (pooled connections move between lookup threads).
+        """
         self.logger = logging.getLogger('MySQLManager')
-        self.connection = None
-        self.cursor = None
+        self.placeholder = placeholder
         
         # Database connection parameters
         self.config = {
@@ -32,64 +256,114 @@ class MySQLManager:
             'sql_mode': 'TRADITIONAL,NO_ZERO_DATE,NO_ZERO_IN_DATE,ERROR_FOR_DIVISION_BY_ZERO'
         }
         
+        self.pool = ConnectionPool(
+            connection_factory or self._new_connection,
+            size=pool_size or int(os.getenv('RDB_POOL_SIZE', 5)),
+            health_check_interval=float(os.getenv('RDB_HEALTH_CHECK_SECONDS', 30))
+        )
+        
         self.connect()
     
+    def _new_connection(self):
+        """Open one MySQL connection and apply the session settings."""
+        connection = mysql.connector.connect(**self.config)
+        
+        # Set session variables to handle zero dates properly
+        cursor = connection.cursor()
+        for query in SESSION_QUERIES:
+            try:
+                cursor.execute(query)
+            except Exception as e:
+                self.logger.warning(f"Could not set session variable: {query} - {e}")
+        cursor.close()
+        return connection
+    
     def connect(self):
-        """Establish connection to MySQL database."""
+        """Open the first pooled connection to verify the database is reachable."""
         try:
-            self.connection = mysql.connector.connect(**self.config)
-            self.cursor = self.connection.cursor(dictionary=True)  # Returns rows as dictionaries
-            
-            # Set session variables to handle zero dates properly
-            session_queries = [
-                "SET SESSION sql_mode = 'TRADITIONAL,NO_ZERO_DATE,NO_ZERO_IN_DATE,ERROR_FOR_DIVISION_BY_ZERO'",
-                "SET SESSION time_zone = '+00:00'"
-            ]
-            
-            for query in session_queries:
-                try:
-                    self.cursor.execute(query)
-                except Exception as e:
-                    self.logger.warning(f"Could not set session variable: {query} - {e}")
-                    
-            self.logger.info("Successfully connected to MySQL database")
+            pooled = self.pool.acquire()
+            self.pool.release(pooled)
+            self.logger.info(f"Successfully connected to MySQL database (pool size {self.pool.size})")
             print("✅ Connected to MySQL database")
             return True
-        except Error as e:
+        except Exception as e:
             self.logger.error(f"Error connecting to MySQL: {e}")
             print(f"❌ Error connecting to MySQL: {e}")
             return False
     
     def is_connected(self):
-        """Check if connection is active."""
+        """Check that the pool can hand out a live connection."""
         try:
-            return self.connection and self.connection.is_connected()
-        except:
+            pooled = self.pool.acquire()
+        except Exception:
             return False
+        self.pool.release(pooled)
+        return True
     
     def reconnect(self):
-        """Reconnect to database if connection is lost."""
-        try:
-            if self.connection:
-                self.connection.close()
-        except:
-            pass
-        
+        """Drop idle connections and reconnect immediately, skipping any backoff."""
+        self.pool.close_idle()
+        self.pool.reset_backoff()
         return self.connect()
     
-    def execute_query(self, query, params=None):
-        """Execute a SELECT query and return results."""
+    def _cursor(self, pooled, query, prepared):
+        """Fresh cursor per borrow; prepared cursors are cached per connection and statement."""
+        if not prepared:
+            return pooled.connection.cursor(), True
+        cursor = pooled.prepared.get(query)
+        if cursor is None:
+            try:
+                cursor = pooled.connection.cursor(prepared=True)
+            except TypeError:
+                # Drivers without server-side prepare (sqlite3 caches statements itself)
+                cursor = pooled.connection.cursor()
+            pooled.prepared[query] = cursor
+        return cursor, False
+    
+    def _run(self, query, params, prepared):
+        pooled = self.pool.acquire()
         try:
-            if not self.is_connected():
-                self.reconnect()
-            
-            self.cursor.execute(query, params or ())
-            results = self.cursor.fetchall()
-            return results
-        except Error as e:
-            self.logger.error(f"Error executing query: {e}")
-            print(f"❌ Query error: {e}")
-            return None
+            cursor, owned = self._cursor(pooled, query, prepared)
+            try:
+                cursor.execute(query, params)
+                columns = [column[0] for column in cursor.description or ()]
+                rows = cursor.fetchall() if columns else []
+            finally:
+                if owned:
+                    cursor.close()
+        except Exception:
+            # Keep the connection after a bad query, but never hand a dead one to another caller
+            self.pool.recycle(pooled)
+            raise
+        self.pool.release(pooled)
+        return [dict(zip(columns, row)) for row in rows]
+    
+    def execute_query(self, query, params=None, prepared=False):
+        """Execute a SELECT query on a pooled connection and return rows as dicts."""
+        if self.placeholder != "%s":
+            query = query.replace("%s", self.placeholder)
+        params = tuple(params or ())
+        
+        for attempt in range(2):
+            try:
+                return self._run(query, params, prepared)
+            except (Error, ConnectionError, TimeoutError) as e:
+                lost = isinstance(e, (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError))
+                if attempt == 0 and lost:
+                    # Server dropped the connection; retry once on a fresh one
+                    self.logger.warning(f"Connection lost, retrying query: {e}")
+                    continue
+                self.logger.error(f"Error executing query: {e}")
+                print(f"❌ Query error: {e}")
+                return None
+            except Exception as e:
+                self.logger.error(f"Error executing query: {e}")
+                print(f"❌ Query error: {e}")
+                return None
+    
+    def pool_stats(self):
+        """Pool size, idle connections, borrow counts and reconnect failures."""
+        return self.pool.stats()
     
     def get_account_by_login(self, login):
         """Get account information by login/account number."""
@@ -126,7 +400,7 @@ class MySQLManager:
         """
         
         try:
-            results = self.execute_query(query, (login,))
+            results = self.execute_query(query, (login,), prepared=True)
             if results and len(results) > 0:
                 return results[0]
             return None
@@ -134,10 +408,7 @@ class MySQLManager:
             self.logger.error(f"Error getting account by login {login}: {e}")
             return None
     
-    def search_accounts(self, search_term, limit=50):
-        """Search for accounts by login, name, or email."""
-        query = """
-        SELECT 
+    SEARCH_COLUMNS = """
             Login as account_number,
             CONCAT(COALESCE(FirstName, ''), ' ', COALESCE(LastName, '')) as name,
             FirstName,
@@ -152,24 +423,101 @@ class MySQLManager:
             Status,
             Country,
             Company
+    """
+    MAX_LOGIN_DIGITS = 10
+    
+    @staticmethod
+    def _like_prefix(term):
+        """LIKE pattern matching values that start with term (wildcards in term escaped)."""
+        escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"{escaped}%"
+    
+    def _search_condition(self, search_term):
+        """
+        Index-friendly WHERE clause for a search term.
+        
+        Digits match Login exactly or by prefix (as ranges on the primary key),
+        a term with '@' is an Email prefix, anything else is a name prefix:
+        one word on FirstName or LastName, several words on first and last name.
+        """
+        term = search_term.strip()
+        
+        if term.isdigit():
+            if term.startswith('0') or len(term) > self.MAX_LOGIN_DIGITS:
+                # No login has a leading zero or more digits than that: exact match only
+                return "Login = %s", [int(term)]
+            # Logins starting with these digits, one range per possible length
+            value = int(term)
+            ranges = []
+            params = []
+            for extra_digits in range(self.MAX_LOGIN_DIGITS - len(term) + 1):
+                scale = 10 ** extra_digits
+                ranges.append("Login BETWEEN %s AND %s")
+                params += [value * scale, (value + 1) * scale - 1]
+            return f"({' OR '.join(ranges)})", params
+        
+        if '@' in term:
+            return "Email LIKE %s", [self._like_prefix(term)]
+        
+        words = term.split()
+        if len(words) == 1:
+            pattern = self._like_prefix(words[0])
+            return "(FirstName LIKE %s OR LastName LIKE %s)", [pattern, pattern]
+        
+        first = self._like_prefix(words[0])
+        last = self._like_prefix(" ".join(words[1:]))
+        # Either order, since people type "last first" as often as "first last"
+        return (
+            "((FirstName LIKE %s AND LastName LIKE %s) OR (FirstName LIKE %s AND LastName LIKE %s))",
+            [first, last, self._like_prefix(words[-1]), self._like_prefix(" ".join(words[:-1]))]
+        )
+    
+    def search_accounts(self, search_term, limit=50, after_login=None):
+        """
+        Search for accounts by login, name, or email.
+        
+        Results are ordered by Login descending; pass the last account_number
+        of a page as after_login to get the next page.
+        """
+        condition, params = self._search_condition(search_term)
+        if after_login is not None:
+            condition += " AND Login < %s"
+            params.append(int(after_login))
+        
+        query = f"""
+        SELECT {self.SEARCH_COLUMNS}
         FROM mt5_users 
-        WHERE Login LIKE %s 
-           OR FirstName LIKE %s 
-           OR LastName LIKE %s
-           OR Email LIKE %s
-           OR CONCAT(COALESCE(FirstName, ''), ' ', COALESCE(LastName, '')) LIKE %s
+        WHERE {condition}
         ORDER BY Login DESC
         LIMIT %s
         """
         
-        search_pattern = f"%{search_term}%"
         try:
-            results = self.execute_query(query, (search_pattern, search_pattern, search_pattern, search_pattern, search_pattern, limit))
+            results = self.execute_query(query, params + [limit])
             return results or []
         except Exception as e:
             self.logger.error(f"Error searching accounts: {e}")
             return []
     
+    def get_accounts_by_logins(self, logins):
+        """Search-result rows for the given logins, ordered by Login descending."""
+        logins = [int(login) for login in logins]
+        if not logins:
+            return []
+        
+        query = f"""
+        SELECT {self.SEARCH_COLUMNS}
+        FROM mt5_users 
+        WHERE Login IN ({', '.join(['%s'] * len(logins))})
+        ORDER BY Login DESC
+        """
+        
+        try:
+            return self.execute_query(query, logins) or []
+        except Exception as e:
+            self.logger.error(f"Error getting accounts by login: {e}")
+            return []
+    
     def verify_account_exists(self, account_number):
         """Enhanced version that verifies account exists AND is a real/live account (not demo)."""
         try:
@@ -195,9 +543,12 @@ class MySQLManager:
             LIMIT 1
             """
             
-            results = self.execute_query(query, (account_int,))
+            results = self.execute_query(query, (account_int,), prepared=True)
+            if results is None:
+                # Query failed; don't report a possibly valid account as missing
+                return {'exists': False, 'error': 'Account lookup failed'}
             
-            if results and len(results) > 0:
+            if len(results) > 0:
                 account_info = results[0]
                 account_group = account_info['account_group'] or ''
                 
@@ -228,27 +579,71 @@ class MySQLManager:
             return {'exists': False, 'error': 'Invalid account number format'}
         except Exception as e:
             self.logger.error(f"Error verifying account {account_number}: {e}")
-        return {'exists': False, 'error': str(e)}
+            return {'exists': False, 'error': str(e)}
     
-    def _is_real_account(self, account_group):
-        """Helper method to determine if account is real/live based on the group name."""
-        if not account_group:
-            return False
-        
-        account_group_lower = account_group.lower()
+    def get_account_balance(self, login):
+        """Balance, status and leverage only; the cheap refresh for cached accounts."""
+        query = """
+        SELECT 
+            COALESCE(Balance, 0) as balance,
+            Status,
+            COALESCE(Leverage, 0) as leverage
+        FROM mt5_users 
+        WHERE Login = %s
+        LIMIT 1
+        """
         
-        # Check for demo indicators
-        demo_indicators = ['demo', 'practice', 'test']
-        if any(indicator in account_group_lower for indicator in demo_indicators):
-            return False
+        try:
+            results = self.execute_query(query, (int(login),), prepared=True)
+            if results:
+                return {
+                    'balance': float(results[0]['balance']),
+                    'status': results[0]['Status'] or '',
+                    'leverage': results[0]['leverage']
+                }
+            return None
+        except Exception as e:
+            self.logger.error(f"Error getting balance for {login}: {e}")
+            return None
+    
+    def get_balances(self, logins, chunk_size=500, since_filetime=None):
+        """
+        Balances for many logins with one IN (...) query per chunk.
+
+        since_filetime limits the result to rows whose FILETIME Timestamp is
+        newer than the given value (incremental refresh).
+        """
+        rows = []
+        logins = [int(login) for login in logins]
         
-        # Check for real indicators
-        real_indicators = ['real', 'live', 'retail', 'vortex-retail']
-        if any(indicator in account_group_lower for indicator in real_indicators):
-            return True
+        for start in range(0, len(logins), chunk_size):
+            chunk = logins[start:start + chunk_size]
+            query = f"""
+            SELECT 
+                Login as login,
+                COALESCE(Balance, 0) as balance,
+                Status as status,
+                COALESCE(Leverage, 0) as leverage,
+                Timestamp as timestamp
+            FROM mt5_users 
+            WHERE Login IN ({', '.join(['%s'] * len(chunk))})
+            """
+            params = list(chunk)
+            if since_filetime is not None:
+                query += " AND Timestamp > %s"
+                params.append(int(since_filetime))
+            
+            results = self.execute_query(query, params)
+            if results is None:
+                # Don't return a partial refresh as if it were complete
+                raise RuntimeError(f"Balance query failed for logins {chunk[0]}-{chunk[-1]}")
+            rows.extend(results)
         
-        # If no clear indicators, assume demo for safety
-        return False
+        return rows
+    
+    def _is_real_account(self, account_group):
+        """Helper method to determine if account is real/live based on the group name."""
+        return is_real_account_group(account_group)
     
     def get_account_stats(self):
         """Get overall account statistics."""
@@ -495,24 +890,22 @@ class MySQLManager:
             return []
     
     def close(self):
-        """Close database connection."""
+        """Close the pooled database connections."""
         try:
-            if self.cursor:
-                self.cursor.close()
-            if self.connection and self.connection.is_connected():
-                self.connection.close()
-                self.logger.info("MySQL connection closed")
-        except Error as e:
+            closed = self.pool.close_idle()
+            self.logger.info(f"MySQL connection pool closed ({closed} connections)")
+        except Exception as e:
             self.logger.error(f"Error closing connection: {e}")
 
 # Global instance
 mysql_db = None
+_mysql_db_lock = threading.Lock()
 
 def get_mysql_connection():
-    """Get or create MySQL connection."""
+    """Get or create the shared pooled MySQL manager."""
     global mysql_db
     if mysql_db is None:
-        mysql_db = MySQLManager()
-    elif not mysql_db.is_connected():
-        mysql_db.reconnect()
-    return mysql_db
\ No newline at end of file
+        with _mysql_db_lock:
+            if mysql_db is None:
+                mysql_db = MySQLManager()
+    return mysql_db
@@ -0,0 +1,341 @@
+"""
+Central outbound queue for Telegram messages
+
+Every send goes through one queue per bot, drained by a few worker tasks that
+respect Telegram's flood limits with token buckets: a global bucket (about 30
+messages per second per bot), one bucket per private chat (1 per second) and
+one per group or channel (20 per minute). Each chat has its own sub-queue and a
+worker only picks up a chat whose bucket has a token, so a burst to one channel
+never holds workers that other chats need. Messages to the same chat keep their
+order, different chats go out concurrently, RetryAfter is honoured, and
+identical admin alerts sent within a short window are coalesced.
+
+    outbox = get_outbound_queue(context.bot)
+    outbox.notify_admins(ADMIN_USER_ID, "text", parse_mode='HTML')   # fire and forget
+    message = await outbox.send(chat_id, "text")                      # wait for the result
+"""
+import time
+import asyncio
+import logging
+from collections import deque
+from datetime import timedelta
+
+from telegram.error import RetryAfter, NetworkError, TimedOut
+
+logger = logging.getLogger('TelegramOutbox')
+
+GLOBAL_RATE = 30.0          # messages per second per bot
+PRIVATE_CHAT_RATE = 1.0     # messages per second to one user
+GROUP_CHAT_RATE = 20 / 60   # messages per second to one group or channel
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`; acquire() waits for a token."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self.lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def try_acquire(self):
+        """Take a token without waiting; returns 0, or the seconds until a token is due."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def pause(self, seconds):
+        """Empty the bucket so nothing is sent for `seconds` (used after RetryAfter)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class OutboundMessage:
+    __slots__ = ("chat_id", "kwargs", "future", "enqueued_at", "coalesce_key", "attempts")
+
+    def __init__(self, chat_id, kwargs, future, coalesce_key=None):
+        self.chat_id = chat_id
+        self.kwargs = kwargs
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.coalesce_key = coalesce_key
+        self.attempts = 0
+
+
+class OutboundQueue:
+    """Rate-limited, concurrent sender for one bot."""
+
+    def __init__(self, bot, workers=8, max_retries=3, coalesce_window=60.0,
+                 global_rate=GLOBAL_RATE, private_rate=PRIVATE_CHAT_RATE, group_rate=GROUP_CHAT_RATE):
+        self.bot = bot
+        self.workers = workers
+        self.max_retries = max_retries
+        self.coalesce_window = coalesce_window
+        self.private_rate = private_rate
+        self.group_rate = group_rate
+
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_buckets = {}  # {chat_id: TokenBucket}
+        self.recent_alerts = {}  # {coalesce_key: monotonic time queued}
+
+        # Per-chat FIFO sub-queues; a chat is in `scheduled` while it sits in `ready`,
+        # waits for its next token, or is being served, so one worker serves it at a time
+        self.chat_queues = {}   # {chat_id: deque of OutboundMessage}
+        self.scheduled = set()
+        self.ready = None       # asyncio.Queue of chat_ids with a message to send
+        self.unfinished = 0
+        self.idle = None        # set when every queued message has been handled
+
+        self.loop = None
+        self.tasks = []
+
+        self.metrics = {
+            "queued": 0,
+            "sent": 0,
+            "failed": 0,
+            "retried": 0,
+            "coalesced": 0,
+            "retry_after_seconds": 0.0,
+            "latency_ms_total": 0.0,
+            "latency_ms_max": 0.0
+        }
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # First use, or the bot moved to another event loop
+            self.loop = loop
+            self.ready = asyncio.Queue()
+            self.idle = asyncio.Event()
+            self.idle.set()
+            self.chat_queues = {}
+            self.scheduled = set()
+            self.unfinished = 0
+            self.tasks = []
+            self.global_bucket.lock = asyncio.Lock()
+        self.tasks = [task for task in self.tasks if not task.done()]
+        for _ in range(self.workers - len(self.tasks)):
+            self.tasks.append(asyncio.create_task(self._worker()))
+
+    def _chat_bucket(self, chat_id):
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            # Negative IDs are groups and channels; positive IDs are users
+            if isinstance(chat_id, str) or chat_id < 0:
+                bucket = TokenBucket(self.group_rate, 3)
+            else:
+                bucket = TokenBucket(self.private_rate, 1)
+            self.chat_buckets[chat_id] = bucket
+        return bucket
+
+    def send(self, chat_id, text=None, coalesce=False, **kwargs):
+        """
+        Queue one bot.send_message call and return immediately
+
+        Returns an asyncio.Future resolving to the sent Message (or raising the
+        final error); callers that do not need the result can ignore it.
+        With coalesce=True an identical message to the same chat queued within
+        `coalesce_window` seconds is dropped and the future resolves to None.
+        """
+        self._ensure_started()
+        future = self.loop.create_future()
+        # Failures are logged by the queue; don't warn about futures nobody awaits
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        if text is not None:
+            kwargs["text"] = text
+
+        coalesce_key = None
+        if coalesce:
+            coalesce_key = (chat_id, kwargs.get("text"), kwargs.get("parse_mode"))
+            now = time.monotonic()
+            queued_at = self.recent_alerts.get(coalesce_key)
+            if queued_at is not None and now - queued_at < self.coalesce_window:
+                self.metrics["coalesced"] += 1
+                future.set_result(None)
+                return future
+            self.recent_alerts[coalesce_key] = now
+            self._prune_alerts(now)
+
+        self.chat_queues.setdefault(chat_id, deque()).append(OutboundMessage(chat_id, kwargs, future, coalesce_key))
+        self.unfinished += 1
+        self.idle.clear()
+        if chat_id not in self.scheduled:
+            self.scheduled.add(chat_id)
+            self.ready.put_nowait(chat_id)
+        self.metrics["queued"] += 1
+        return future
+
+    def send_many(self, chat_ids, text=None, coalesce=False, **kwargs):
+        """Queue the same message for several chats; returns one future per chat."""
+        return [self.send(chat_id, text, coalesce=coalesce, **dict(kwargs)) for chat_id in chat_ids]
+
+    def notify_admins(self, admin_ids, text=None, **kwargs):
+        """Fan an admin alert out to every admin; duplicates within the coalesce window are dropped."""
+        return self.send_many(admin_ids, text, coalesce=True, **kwargs)
+
+    def _prune_alerts(self, now):
+        if len(self.recent_alerts) > 1000:
+            self.recent_alerts = {
+                key: queued_at for key, queued_at in self.recent_alerts.items()
+                if now - queued_at < self.coalesce_window
+            }
+
+    async def _worker(self):
+        while True:
+            chat_id = await self.ready.get()
+            try:
+                await self._serve(chat_id)
+            except Exception as e:
+                logger.error(f"Outbound worker error for chat {chat_id}: {e}")
+                self._next(chat_id)
+
+    async def _serve(self, chat_id):
+        """Send the next message of one chat, or hand the chat back until it may send again."""
+        pending = self.chat_queues.get(chat_id)
+        if not pending:
+            self._next(chat_id)
+            return
+
+        wait = self._chat_bucket(chat_id).try_acquire()
+        if wait > 0:
+            # Chat is at its limit: free this worker for other chats until a token is due
+            self._reschedule(chat_id, wait)
+            return
+
+        message = pending.popleft()
+        retry_in = await self._deliver(message)
+        if retry_in is not None:
+            # Keep the message at the head so the chat's order is preserved
+            pending.appendleft(message)
+            self._reschedule(chat_id, retry_in)
+            return
+
+        self.unfinished -= 1
+        if self.unfinished == 0:
+            self.idle.set()
+        self._next(chat_id)
+
+    def _next(self, chat_id):
+        """Queue the chat again behind the others if it has more messages, otherwise retire it."""
+        if self.chat_queues.get(chat_id):
+            self.ready.put_nowait(chat_id)
+        else:
+            self.chat_queues.pop(chat_id, None)
+            self.scheduled.discard(chat_id)
+
+    def _reschedule(self, chat_id, delay):
+        self.loop.call_later(delay, self.ready.put_nowait, chat_id)
+
+    async def _deliver(self, message):
+        """
+        Make one send attempt
+
+        Returns None once the message is finished (sent, or failed for good),
+        or the seconds to wait before retrying it.
+        """
+        await self.global_bucket.acquire()
+        message.attempts += 1
+        try:
+            result = await self.bot.send_message(chat_id=message.chat_id, **message.kwargs)
+        except RetryAfter as e:
+            retry_after = e.retry_after
+            if isinstance(retry_after, timedelta):
+                retry_after = retry_after.total_seconds()
+            retry_after = float(retry_after)
+            self.metrics["retry_after_seconds"] += retry_after
+            logger.warning(f"Flood limit hit sending to {message.chat_id}, retrying in {retry_after}s")
+            self.global_bucket.pause(retry_after)
+            if message.attempts > self.max_retries:
+                self._failed(message, e)
+                return None
+            self.metrics["retried"] += 1
+            return retry_after
+        except (TimedOut, NetworkError) as e:
+            if message.attempts <= self.max_retries:
+                self.metrics["retried"] += 1
+                return 2 ** (message.attempts - 1)
+            self._failed(message, e)
+            return None
+        except Exception as e:
+            self._failed(message, e)
+            return None
+
+        latency_ms = (time.monotonic() - message.enqueued_at) * 1000
+        self.metrics["sent"] += 1
+        self.metrics["latency_ms_total"] += latency_ms
+        self.metrics["latency_ms_max"] = max(self.metrics["latency_ms_max"], latency_ms)
+        if not message.future.done():
+            message.future.set_result(result)
+        return None
+
+    def _failed(self, message, error):
+        self.metrics["failed"] += 1
+        logger.error(f"Failed to send message to {message.chat_id} after {message.attempts} attempt(s): {error}")
+        if message.coalesce_key is not None:
+            # Allow the same alert to be queued again
+            self.recent_alerts.pop(message.coalesce_key, None)
+        if not message.future.done():
+            message.future.set_exception(error)
+
+    def depth(self):
+        return sum(len(pending) for pending in self.chat_queues.values())
+
+    def stats(self):
+        """Queue depth, delivery counters and enqueue-to-send latency."""
+        sent = self.metrics["sent"]
+        return {
+            "depth": self.depth(),
+            "queued": self.metrics["queued"],
+            "sent": sent,
+            "failed": self.metrics["failed"],
+            "retried": self.metrics["retried"],
+            "coalesced": self.metrics["coalesced"],
+            "retry_after_seconds": round(self.metrics["retry_after_seconds"], 1),
+            "avg_latency_ms": round(self.metrics["latency_ms_total"] / sent, 1) if sent else 0.0,
+            "max_latency_ms": round(self.metrics["latency_ms_max"], 1)
+        }
+
+    async def drain(self, timeout=None):
+        """Wait until every queued message has been handled."""
+        if self.idle is not None:
+            await asyncio.wait_for(self.idle.wait(), timeout)
+
+    async def close(self, timeout=30):
+        """Flush the queue and stop the workers."""
+        try:
+            await self.drain(timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Outbound queue closed with {self.depth()} messages unsent")
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+
+_queues = {}
+
+
+def get_outbound_queue(bot):
+    """Return the queue shared by every sender using this bot (one set of limits per bot token)."""
+    key = getattr(bot, "token", None) or id(bot)
+    queue = _queues.get(key)
+    if queue is None:
+        queue = OutboundQueue(bot)
+        _queues[key] = queue
+    return queue
@@ -18,7 +18,8 @@ app.secret_key = os.urandom(24)
 
 # Load configuration
 config = Config()
-db = TradingBotDatabase(data_dir=config.get('data_dir'))
+# The bot owns the tables and journal; the dashboard only reads them
+db = TradingBotDatabase(data_dir=config.get('data_dir'), read_only=True)
 
 # Admin authentication
 def admin_required(f):
@@ -50,13 +51,23 @@ def logout():
 @app.route('/')
 @admin_required
 def dashboard():
+    # Read only the columns the dashboard needs from the persisted users table
+    columns = ["is_verified", "last_active", "risk_appetite", "deposit_amount", "join_date"]
+    try:
+        users_df = db.read_columns("users", columns)
+    except Exception as e:
+        # Nothing persisted yet; use the in-memory table
+        print(f"Error reading users columns: {e}")
+        users_df = db.users_df.select(columns)
+    
     # Get stats for dashboard
-    total_users = db.users_df.height
-    verified_users = db.users_df.filter(pl.col("is_verified") == True).height
-    active_users_7d = db.get_active_users(days=7)
+    total_users = users_df.height
+    verified_users = users_df.filter(pl.col("is_verified") == True).height
+    cutoff_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+    active_users_7d = users_df.filter(pl.col("last_active") >= cutoff_date).height
     
-    # Convert Polars dataframe to Pandas for Plotly compatibility
-    users_pandas = db.users_df.to_pandas()
+    # Convert Polars dataframe to Pandas for Plotly compatibility (charted columns only)
+    users_pandas = users_df.select(["risk_appetite", "deposit_amount", "join_date"]).to_pandas()
     
     # Create visualizations
     risk_distribution = None
@@ -0,0 +1,53 @@
+import sqlite3
+import time
+
+import pytest
+
+# FILETIME of 2021-06-01; each test account is one second newer than the previous
+BASE_FILETIME = 132670944000000000
+
+ACCOUNTS = [
+    # Login, FirstName, LastName, Email, Balance, Group, Status, Country, Company, Leverage
+    (100001, "Ada", "Lovelace", "ada@example.com", 1500.0, "real\\vortex-retail", "active", "GB", "VFX", 100),
+    (100002, "Alan", "Turing", "alan@example.com", 250.5, "demo\\practice", "active", "GB", "VFX", 500),
+    (100003, "Grace", "Hopper", "grace@example.com", 0.0, "live\\standard", "inactive", "US", "VFX", 200),
+]
+
+
+def _sqlite_factory(path):
+    """sqlite3 connections with the MySQL functions the account queries use."""
+    def connect():
+        # Pooled connections are borrowed from the lookup threads
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.create_function("CONCAT", -1, lambda *parts: "".join(str(part) for part in parts))
+        connection.create_function("FROM_UNIXTIME", 1, lambda seconds: time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(seconds)))
+        return connection
+    return connect
+
+
+@pytest.fixture
+def mt5_users(tmp_path):
+    """Path of a SQLite stand-in for metatrader5.mt5_users and a connection factory for it."""
+    path = str(tmp_path / "mt5.db")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE mt5_users (Login INTEGER PRIMARY KEY, FirstName TEXT, LastName TEXT, Email TEXT, "
+        "Balance REAL, `Group` TEXT, Status TEXT, Country TEXT, Company TEXT, Leverage INTEGER, Timestamp INTEGER)"
+    )
+    connection.executemany(
+        "INSERT INTO mt5_users VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [account + (BASE_FILETIME + i * 10000000,) for i, account in enumerate(ACCOUNTS)]
+    )
+    connection.commit()
+    connection.close()
+    return path, _sqlite_factory(path)
+
+
+@pytest.fixture
+def mysql_db(mt5_users):
+    """MySQLManager pooled over the SQLite stand-in."""
+    mysql_manager = pytest.importorskip("mySQL.mysql_manager")
+    path, factory = mt5_users
+    manager = mysql_manager.MySQLManager(pool_size=2, connection_factory=factory, placeholder="?")
+    yield manager
+    manager.close()
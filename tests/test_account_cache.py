@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("mySQL.mysql_manager")
+
+from mySQL.account_cache import AccountCache
+from mySQL.account_lookup import AccountLookupService
+
+
+def test_cache_hit_has_verify_account_exists_shape(mysql_db):
+    account = mysql_db.verify_account_exists(100001)
+    cache = AccountCache()
+    cache.put(100001, account)
+
+    cached, tier = cache.get("100001")
+    assert tier == "hit"
+    assert cached == account
+
+
+def test_balance_tier_keeps_exists(mysql_db):
+    account = mysql_db.verify_account_exists(100001)
+    cache = AccountCache(balance_ttl=0)
+    cache.put(100001, account)
+
+    cached, tier = cache.get(100001)
+    assert tier == "balance"
+    assert cached["exists"] is True
+    assert "balance" not in cached
+
+
+def test_missing_account_is_cached():
+    cache = AccountCache()
+    cache.put(424242, {"exists": False})
+    cache.put(434343, {"exists": False, "error": "Account lookup failed"})
+
+    assert cache.get(424242) == ({"exists": False}, "hit")
+    assert cache.get(434343) == (None, "miss")
+
+
+def test_lookup_results_keep_shape_across_tiers(mysql_db):
+    async def lookups():
+        service = AccountLookupService(mysql_db=mysql_db, cache=AccountCache(balance_ttl=60))
+        first = await service.verify_account(100001)
+        cached = await service.verify_account(100001)
+        service.cache.balance_ttl = 0
+        refreshed = await service.verify_account(100001)
+        service.executor.shutdown()
+        return first, cached, refreshed, service.cache.stats()
+
+    first, cached, refreshed, stats = asyncio.run(lookups())
+    assert first == mysql_db.verify_account_exists(100001)
+    assert cached == first
+    assert refreshed == first
+    assert (stats["misses"], stats["hits"], stats["balance_refreshes"]) == (1, 1, 1)
+
+
+class _Mirror:
+    def __init__(self, fresh):
+        self.fresh = fresh
+
+    def is_fresh(self):
+        return self.fresh
+
+    def verify_account(self, account_number):
+        return {"exists": True, "balance": 1.0, "source": "mirror", "staleness_seconds": 30}
+
+
+class _FailingDB:
+    def verify_account_exists(self, account_number):
+        return {"exists": False, "error": "Lost connection to MySQL server"}
+
+
+def test_mirror_fallback_requires_fresh_mirror_and_permission():
+    async def lookup(fresh, **kwargs):
+        service = AccountLookupService(mysql_db=_FailingDB(), mirror=_Mirror(fresh))
+        try:
+            return await service.verify_account(100001, **kwargs)
+        finally:
+            service.executor.shutdown()
+
+    assert asyncio.run(lookup(True))["source"] == "mirror"
+    assert "source" not in asyncio.run(lookup(False))
+    assert "source" not in asyncio.run(lookup(True, allow_mirror=False))
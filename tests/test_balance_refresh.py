@@ -0,0 +1,33 @@
+import threading
+
+import pytest
+
+pytest.importorskip("mySQL.mysql_manager")
+
+from mySQL.balance_refresh import BalanceRefresher
+
+
+class _BlockingDB:
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def get_trading_accounts(self):
+        self.entered.set()
+        self.release.wait(5)
+        return {}
+
+
+def test_overlapping_runs_are_skipped(tmp_path, mysql_db):
+    db = _BlockingDB()
+    refresher = BalanceRefresher(db, mysql_db=mysql_db, state_path=str(tmp_path / "state.json"))
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(refresher.run(incremental=False)))
+    first.start()
+    assert db.entered.wait(5)
+
+    assert refresher.run() is None
+    db.release.set()
+    first.join(5)
+    assert results[0]["mode"] == "full"
@@ -0,0 +1,24 @@
+import os
+
+from local_DB.db_manager import TradingBotDatabase
+
+
+def test_read_only_instance_leaves_journal_to_writer(tmp_path):
+    data_dir = str(tmp_path)
+    writer = TradingBotDatabase(data_dir=data_dir, flush_interval=3600, compact_interval=3600)
+    writer.add_user({"user_id": 1, "username": "first"})
+
+    reader = TradingBotDatabase(data_dir=data_dir, read_only=True)
+    assert reader.get_user(1)["username"] == "first"
+    assert reader._journal.records_since_compaction == 0
+    assert not reader.compact()
+    reader.close()
+
+    # The writer keeps appending to the same journal after the reader has gone
+    writer.add_user({"user_id": 2, "username": "second"})
+    assert os.path.exists(os.path.join(data_dir, "users.journal"))
+    writer.close()
+
+    reopened = TradingBotDatabase(data_dir=data_dir, read_only=True)
+    assert reopened.get_user(1)["username"] == "first"
+    assert reopened.get_user(2)["username"] == "second"
@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+mysql_manager = pytest.importorskip("mySQL.mysql_manager")
+
+
+def test_verify_account_exists(mysql_db):
+    account = mysql_db.verify_account_exists("100001")
+
+    assert account["exists"] is True
+    assert account["account_number"] == "100001"
+    assert account["name"] == "Ada Lovelace"
+    assert account["balance"] == 1500.0
+    assert account["is_real_account"] is True
+    assert account["account_type"] == "Real"
+    assert mysql_db.verify_account_exists(100002)["is_real_account"] is False
+    assert mysql_db.verify_account_exists(999999) == {"exists": False}
+    assert mysql_db.verify_account_exists("abc")["error"] == "Invalid account number format"
+
+
+def test_borrow_release_across_threads(mysql_db):
+    errors = []
+
+    def worker():
+        for _ in range(50):
+            if not mysql_db.verify_account_exists(100001)["exists"]:
+                errors.append("lookup failed")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = mysql_db.pool_stats()
+    assert errors == []
+    assert stats["opened"] <= stats["size"] == 2
+    assert stats["idle"] == stats["opened"]
+    assert stats["borrows"] >= 400
+
+
+def test_prepared_lookup_reuses_cursor(mysql_db):
+    mysql_db.verify_account_exists(100001)
+    mysql_db.verify_account_exists(100003)
+    mysql_db.get_account_balance(100001)
+
+    pooled = mysql_db.pool._idle[0]
+    assert len(pooled.prepared) == 2  # one cached cursor per statement
+    assert mysql_db.pool_stats()["opened"] == 1
+
+
+def test_failed_query_recycles_live_connection(mysql_db):
+    assert mysql_db.execute_query("SELECT * FROM no_such_table") is None
+
+    stats = mysql_db.pool_stats()
+    assert stats["discarded"] == 0
+    assert stats["idle"] == 1
+    assert mysql_db.verify_account_exists(100001)["exists"] is True
+
+
+def test_dead_connection_is_replaced(mysql_db):
+    mysql_db.pool.health_check_interval = 0
+    mysql_db.pool._idle[0].connection.close()
+
+    assert mysql_db.verify_account_exists(100001)["exists"] is True
+    stats = mysql_db.pool_stats()
+    assert stats["discarded"] == 1
+    assert stats["opened"] == 2
+
+
+def test_unreachable_database_fails_fast(mt5_users):
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        raise ConnectionRefusedError("no server")
+
+    manager = mysql_manager.MySQLManager(pool_size=1, connection_factory=connect, placeholder="?")
+    assert len(attempts) == manager.pool.max_connect_attempts
+
+    # Inside the backoff window borrows fail without another connection attempt
+    assert manager.is_connected() is False
+    assert manager.execute_query("SELECT 1") is None
+    assert len(attempts) == manager.pool.max_connect_attempts
+
+
+def test_long_numeric_search_is_exact_login(mysql_db):
+    assert mysql_db._search_condition("12345678901") == ("Login = %s", [12345678901])
+    condition, params = mysql_db._search_condition("1000")
+    assert condition.count("BETWEEN") == len(params) // 2 == mysql_db.MAX_LOGIN_DIGITS - 3
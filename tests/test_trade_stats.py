@@ -0,0 +1,69 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from tradingSignals.mt5_Fn import mt5_trade_stats
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "trade_stats_2025-01-15.json")
+
+
+@pytest.fixture
+def recorded():
+    return mt5_trade_stats.load_fixture(FIXTURE)
+
+
+def test_daily_stats(recorded):
+    executed_signals, deals, positions, symbols = recorded
+    stats = mt5_trade_stats.daily_stats("2025-01-15", executed_signals, deals, positions, symbols, 10000.0)
+
+    assert stats["signals_executed"] == 2
+    assert stats["positions_opened"] == 4
+    assert stats["positions_closed"] == 2
+    assert (stats["wins"], stats["losses"]) == (1, 1)
+    assert stats["win_rate"] == 50.0
+    # The manual (magic 0) trade's +100 is excluded
+    assert stats["total_profit"] == pytest.approx(-20.0)
+    assert stats["return_percentage"] == pytest.approx(-0.2)
+    # EURUSD buy +30 pips, XAUUSD sell -500 pips
+    assert stats["total_pips"] == pytest.approx(-470.0)
+    assert stats["active_positions"] == 2
+    assert stats["symbols_traded"] == ["EURUSD", "XAUUSD"]
+
+    details = {(row["signal_id"], row["status"]): row for row in stats["signal_details"]}
+    assert set(details) == {
+        ("EURUSD_BUY_20250115090000", "ACTIVE"),
+        ("EURUSD_BUY_20250115090000", "WIN"),
+        ("XAUUSD_SELL_20250115100000", "ACTIVE"),
+        ("XAUUSD_SELL_20250115100000", "LOSS"),
+    }
+    assert details[("EURUSD_BUY_20250115090000", "ACTIVE")]["unrealized_pips"] == pytest.approx(15.0)
+    assert details[("XAUUSD_SELL_20250115100000", "ACTIVE")]["unrealized_pips"] == pytest.approx(550.0)
+    assert details[("XAUUSD_SELL_20250115100000", "LOSS")]["exit_price"] == 2020.0
+
+
+def test_signal_breakdown(recorded):
+    executed_signals, deals, positions, symbols = recorded
+    total_signals, total_profit, breakdown = mt5_trade_stats.signal_breakdown(
+        executed_signals, deals, positions, symbols, datetime(2025, 1, 15)
+    )
+
+    # The US30 signal from the week before is outside the window
+    assert total_signals == 2
+    assert total_profit == pytest.approx(-20.0)
+    assert set(breakdown) == {"VOL_HAWKES_EURUSD_BUY", "RSI_REV_XAUUSD_SELL"}
+
+    eurusd = breakdown["VOL_HAWKES_EURUSD_BUY"]
+    assert (eurusd["orders_placed"], eurusd["total_trades"], eurusd["active_positions"]) == (2, 1, 1)
+    assert (eurusd["wins"], eurusd["losses"], eurusd["win_rate"]) == (1, 0, 100.0)
+    assert eurusd["total_profit"] == pytest.approx(45.0)
+    assert eurusd["total_pips"] == pytest.approx(45.0)
+    assert eurusd["profit_factor"] == float("inf")
+    assert eurusd["entry_prices"] == [1.1, 1.0995]
+
+    xauusd = breakdown["RSI_REV_XAUUSD_SELL"]
+    assert (xauusd["total_trades"], xauusd["active_positions"], xauusd["losses"]) == (1, 1, 1)
+    assert xauusd["total_profit"] == pytest.approx(-47.0)
+    assert xauusd["total_pips"] == pytest.approx(50.0)
+    assert xauusd["profit_factor"] == 0
+    assert [trade["status"] for trade in xauusd["trade_details"]] == ["LOSS", "ACTIVE"]
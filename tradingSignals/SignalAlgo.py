@@ -73,14 +73,10 @@ class SignalBot:
             logger.info("✅ Signal system initialized successfully")
             
             # Notify admin via SIGNAL BOT
-            for admin_id in ADMIN_USER_ID:
-                try:
-                    await self.bot.send_message(
-                        chat_id=admin_id,
-                        text="🤖 Signal system initialized successfully (Algo Bot)"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to notify admin {admin_id}: {e}")
+            get_outbound_queue(self.bot).notify_admins(
+                ADMIN_USER_ID,
+                text="🤖 Signal system initialized successfully (Algo Bot)"
+            )
             
         except Exception as e:
             logger.error(f"❌ Error in init_signal_system: {e}")
@@ -135,6 +131,7 @@ class SignalBot:
             logger.info(f"Hours since last signal: {hours_since:.1f}")
             logger.info(f"Signals sent today: {sum(1 for k,v in self.signal_dispatcher.signal_generator.signal_history.items() if v['timestamp'].date() == datetime.now().date())}")
             logger.info(f"Next check eligible: {'Yes' if hours_since >= self.signal_dispatcher.min_signal_interval_hours else 'No'}")
+            logger.info(f"Outbound queue: {self.signal_dispatcher.outbox.stats()}")
         except Exception as e:
             logger.error(f"Error generating status report: {e}")
 
@@ -217,7 +214,9 @@ class SignalBot:
                 return
             
             # Generate daily stats
-            result = self.signal_dispatcher.signal_executor.generate_daily_stats()
+            result = await self.signal_dispatcher.mt5_gateway.run(
+                self.signal_dispatcher.signal_executor.generate_daily_stats
+            )
             
             if not result["success"]:
                 error_msg = f"❌ Failed to generate daily stats: {result.get('error', 'Unknown error')}"
@@ -337,9 +336,13 @@ class SignalBot:
             
             # Generate signal breakdown stats
             if isinstance(self.signal_dispatcher.signal_executor, MultiAccountExecutor):
-                result = self.signal_dispatcher.signal_executor.generate_signal_breakdown_stats_multi_account(days)
+                result = await self.signal_dispatcher.mt5_gateway.run(
+                    self.signal_dispatcher.signal_executor.generate_signal_breakdown_stats_multi_account, days
+                )
             else:
-                result = self.signal_dispatcher.signal_executor.generate_signal_stats(days)
+                result = await self.signal_dispatcher.mt5_gateway.run(
+                    self.signal_dispatcher.signal_executor.generate_signal_stats, days
+                )
             
             if not result["success"]:
                 await status_msg.edit_text(f"❌ Failed to generate signal breakdown: {result.get('error', 'Unknown error')}")
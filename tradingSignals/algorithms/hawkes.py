@@ -1,6 +1,57 @@
 import numpy as np
 import polars as pl
 import logging
+import bisect
+from collections import deque
+
+# scipy's IIR filter runs the decay recursion in C with the same arithmetic as the
+# reference loop; without it we fall back to a blockwise NumPy cumulative sum
+try:
+    from scipy.signal import lfilter
+    scipy_available = True
+except ImportError:
+    scipy_available = False
+
+
+def _decay_filter(data, alpha):
+    """
+    Compute y[t] = data[t] + alpha * y[t-1] along the last axis, starting from y = 0
+    
+    Parameters:
+    -----------
+    data: np.ndarray
+        2-D array without NaNs, one series per row
+    alpha: float
+        Per-bar decay factor
+    
+    Returns:
+    --------
+    np.ndarray: Decayed cumulative sums with the same shape as data
+    """
+    if data.shape[-1] == 0:
+        return np.empty_like(data)
+    
+    if scipy_available:
+        return lfilter([1.0], [1.0, -alpha], data, axis=-1)
+    
+    # y[t] = alpha^t * cumsum(x[j] / alpha^j), evaluated in blocks short enough
+    # that alpha^-t cannot overflow, carrying the decayed state between blocks
+    if alpha <= 0:
+        return data.copy()
+    block = data.shape[-1] if alpha >= 1 else max(1, int(50.0 / -np.log(alpha)))
+    
+    output = np.empty_like(data)
+    carry = np.zeros(data.shape[:-1])
+    for start in range(0, data.shape[-1], block):
+        segment = data[..., start:start + block]
+        powers = alpha ** np.arange(segment.shape[-1])
+        decayed = np.cumsum(segment / powers, axis=-1) * powers
+        decayed += carry[..., np.newaxis] * (powers * alpha)
+        output[..., start:start + block] = decayed
+        carry = decayed[..., -1]
+    
+    return output
+
 
 class HawkesProcess:
     """
@@ -36,19 +87,317 @@ class HawkesProcess:
         --------
         np.ndarray: Processed data with hawkes decay
         """
-        if isinstance(data_series, list):
-            data_series = np.array(data_series)
+        data = np.asarray(data_series, dtype=float)
+        return self.process_batch(data[np.newaxis, :])[0]
+    
+    def process_batch(self, data_matrix):
+        """
+        Apply the Hawkes process to many series at once
+        
+        Parameters:
+        -----------
+        data_matrix: np.ndarray
+            2-D array with one series per row (e.g. one row per symbol)
+        
+        Returns:
+        --------
+        np.ndarray: Processed data with hawkes decay, same shape as the input
+        """
+        data = np.atleast_2d(np.asarray(data_matrix, dtype=float))
+        output = np.full(data.shape, np.nan)
+        
+        # The first bar has no history and stays NaN; every later bar decays
+        body = data[:, 1:]
+        nan_rows = np.isnan(body).any(axis=1)
+        
+        clean_rows = ~nan_rows
+        if clean_rows.any():
+            output[clean_rows, 1:] = _decay_filter(body[clean_rows], self._alpha)
+        
+        # A NaN input yields a NaN output and restarts the recursion on the next bar
+        for row in np.flatnonzero(nan_rows):
+            output[row, 1:] = self._process_with_resets(body[row])
+        
+        return output * self.kappa
+    
+    def _process_with_resets(self, series):
+        """Filter each run of valid values independently, leaving NaNs in place."""
+        output = np.full(series.shape, np.nan)
+        valid = ~np.isnan(series)
+        
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], valid.astype(np.int8), [0]))))
+        for start, stop in zip(edges[::2], edges[1::2]):
+            output[start:stop] = _decay_filter(series[np.newaxis, start:stop], self._alpha)[0]
+        
+        return output
+
+def _normalized_range(df, atr_lookback):
+    """Return the bar range divided by its rolling ATR as a numpy array."""
+    # Calculate ATR
+    true_range = pl.max_horizontal(
+        (df["high"] - df["low"]),
+        (df["high"] - df["close"].shift(1)).abs(),
+        (df["low"] - df["close"].shift(1)).abs()
+    )
+    
+    # We need to materialize the true_range expression into a Series
+    true_range = df.select(true_range.alias("true_range"))["true_range"]
+    
+    # Calculate ATR as rolling mean of true range
+    atr_series = true_range.rolling_mean(atr_lookback).fill_null(true_range)
+    
+    # Calculate normalized range
+    return ((df["high"] - df["low"]) / atr_series).fill_null(0).to_numpy()
+
+
+def _signal_from_hawkes(hawkes_values, closes, quantile_lookback):
+    """
+    Turn a Hawkes series into a breakout signal
+    
+    Returns:
+    --------
+    tuple: (signal, q05, q95), with q05/q95 None when there is not enough history
+    """
+    # Calculate quantiles
+    valid_values = hawkes_values[~np.isnan(hawkes_values)]
+    if len(valid_values) < quantile_lookback:
+        return 0, None, None
+        
+    recent_values = valid_values[-quantile_lookback:]
+    q05 = np.quantile(recent_values, 0.05)
+    q95 = np.quantile(recent_values, 0.95)
+    
+    # Get the last few values for signal generation
+    n = min(20, len(hawkes_values))
+    signal = _breakout_signal(hawkes_values[-n:], closes[-n:], q05, q95)
+    
+    return signal, q05, q95
+
+
+def _breakout_signal(recent_hawkes, recent_prices, q05, q95):
+    """Return 1/-1 when volatility breaks above q95 after a dip below q05, else 0."""
+    n = len(recent_hawkes)
+    if n < 2:
+        return 0
+    
+    # Generate trading signal
+    signal = 0
+    
+    # Look for the last low volatility point (excluding the current bar)
+    below = np.flatnonzero(recent_hawkes[:n-1] < q05)
+    last_below_idx = below[-1] if below.size else -1
             
-        output = np.zeros(len(data_series))
-        output[0] = np.nan
+    # Check for breakout after low volatility
+    if last_below_idx >= 0:
+        curr_idx = n - 1  # Last value
+        prev_idx = n - 2  # Second-to-last value
         
-        for i in range(1, len(data_series)):
-            if np.isnan(output[i - 1]):
-                output[i] = data_series[i]
+        # Check if we just broke above the high threshold
+        if recent_hawkes[prev_idx] <= q95 and recent_hawkes[curr_idx] > q95:
+            # Determine direction based on price change from last low vol point
+            price_change = recent_prices[curr_idx] - recent_prices[last_below_idx]
+            
+            if price_change > 0:
+                signal = 1  # Buy signal
             else:
-                output[i] = output[i - 1] * self._alpha + data_series[i]
+                signal = -1  # Sell signal
+    
+    return signal
+
+
+def _sorted_quantile(sorted_values, q):
+    """Linear-interpolated quantile of an already sorted list, matching np.quantile."""
+    position = q * (len(sorted_values) - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    a, b = sorted_values[lower], sorted_values[upper]
+    
+    # Same lerp as numpy, which interpolates from the nearer end for stability
+    if fraction >= 0.5:
+        return b - (b - a) * (1 - fraction)
+    return a + (b - a) * fraction
+
+
+class HawkesStream:
+    """
+    Incremental Hawkes volatility state for a single (symbol, timeframe) series
+    
+    Closed bars are folded in one at a time: the true range feeds a rolling ATR
+    accumulator, the normalized range feeds the decayed Hawkes value, and valid
+    Hawkes values feed a sorted quantile window. Each bar costs O(1) plus an
+    O(log n) search in the quantile window instead of a full recompute.
+    
+    Once warmed up (atr_lookback bars), results match calculate_hawkes_signal
+    run over the same recent bars.
+    """
+    
+    def __init__(self, atr_lookback=297, kappa=0.51, quantile_lookback=27, signal_window=20):
+        """
+        Initialize an empty stream
         
-        return output * self.kappa
+        Parameters:
+        -----------
+        atr_lookback: int
+            Period for ATR calculation
+        kappa: float
+            Decay parameter for the Hawkes process
+        quantile_lookback: int
+            Number of recent Hawkes values used for the q05/q95 thresholds
+        signal_window: int
+            Number of recent bars scanned for the low-volatility point
+        """
+        self.atr_lookback = atr_lookback
+        self.kappa = kappa
+        self.quantile_lookback = quantile_lookback
+        self.signal_window = signal_window
+        self._alpha = np.exp(-kappa)
+        
+        self.last_time = None
+        self.bars_seen = 0
+        
+        self._prev_close = None
+        self._tr_window = deque()
+        self._tr_sum = 0.0
+        self._decayed = np.nan
+        self._quantile_window = deque()
+        self._sorted_window = []
+        self._recent_hawkes = deque(maxlen=signal_window)
+        self._recent_closes = deque(maxlen=signal_window)
+    
+    @property
+    def min_bars(self):
+        """Bars required before a signal can be produced (same as the batch version)."""
+        return max(self.atr_lookback, self.quantile_lookback) + 10
+    
+    def _next_values(self, high, low, close):
+        """Compute (true_range, tr_sum, decayed) for a bar without changing state."""
+        bar_range = high - low
+        if self._prev_close is None:
+            true_range = bar_range
+        else:
+            true_range = max(bar_range, abs(high - self._prev_close), abs(low - self._prev_close))
+        
+        # Rolling ATR; before the window is full the raw true range is used
+        tr_sum = self._tr_sum + true_range
+        if len(self._tr_window) >= self.atr_lookback:
+            tr_sum -= self._tr_window[0]
+        if len(self._tr_window) + 1 >= self.atr_lookback:
+            atr = tr_sum / self.atr_lookback
+        else:
+            atr = true_range
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            norm_range = np.float64(bar_range) / np.float64(atr)
+        
+        # Hawkes recursion; the first bar and any bar after a NaN restart it
+        if self.bars_seen == 0 or np.isnan(norm_range):
+            decayed = np.nan
+        elif np.isnan(self._decayed):
+            decayed = norm_range
+        else:
+            decayed = self._decayed * self._alpha + norm_range
+        
+        return true_range, tr_sum, decayed
+    
+    def update(self, times, highs, lows, closes):
+        """
+        Fold closed bars into the state, ignoring bars at or before last_time
+        
+        Returns:
+        --------
+        int: Number of bars applied
+        """
+        applied = 0
+        for bar_time, high, low, close in zip(times, highs, lows, closes):
+            if self.last_time is not None and bar_time <= self.last_time:
+                continue
+            
+            true_range, tr_sum, decayed = self._next_values(high, low, close)
+            
+            self._tr_window.append(true_range)
+            if len(self._tr_window) > self.atr_lookback:
+                self._tr_window.popleft()
+            self._tr_sum = tr_sum
+            # Re-sum periodically so the running sum cannot drift
+            if self.bars_seen % self.atr_lookback == 0:
+                self._tr_sum = float(np.sum(self._tr_window))
+            
+            self._decayed = decayed
+            hawkes_value = decayed * self.kappa
+            if not np.isnan(hawkes_value):
+                self._push_quantile(hawkes_value)
+            
+            self._recent_hawkes.append(hawkes_value)
+            self._recent_closes.append(close)
+            self._prev_close = close
+            self.last_time = bar_time
+            self.bars_seen += 1
+            applied += 1
+        
+        return applied
+    
+    def update_frame(self, df):
+        """Fold the closed bars of a price DataFrame (time/high/low/close columns)."""
+        return self.update(
+            df["time"].to_list(),
+            df["high"].to_list(),
+            df["low"].to_list(),
+            df["close"].to_list()
+        )
+    
+    def _push_quantile(self, value):
+        """Add a value to the quantile window, evicting the oldest once full."""
+        self._quantile_window.append(value)
+        bisect.insort(self._sorted_window, value)
+        if len(self._quantile_window) > self.quantile_lookback:
+            oldest = self._quantile_window.popleft()
+            del self._sorted_window[bisect.bisect_left(self._sorted_window, oldest)]
+    
+    def evaluate(self, high=None, low=None, close=None):
+        """
+        Evaluate the breakout signal, optionally including an unfinished bar
+        
+        The unfinished (forming) bar is used for this evaluation only and is not
+        folded into the state.
+        
+        Returns:
+        --------
+        tuple: (signal, hawkes_value, q05, q95) with the same meaning as
+            calculate_hawkes_signal, except hawkes_value is the latest value only
+        """
+        recent_hawkes = list(self._recent_hawkes)
+        recent_closes = list(self._recent_closes)
+        sorted_window = self._sorted_window
+        bars = self.bars_seen
+        
+        if close is not None:
+            _, _, decayed = self._next_values(high, low, close)
+            hawkes_value = decayed * self.kappa
+            
+            if not np.isnan(hawkes_value):
+                sorted_window = list(sorted_window)
+                if len(self._quantile_window) >= self.quantile_lookback:
+                    del sorted_window[bisect.bisect_left(sorted_window, self._quantile_window[0])]
+                bisect.insort(sorted_window, hawkes_value)
+            
+            recent_hawkes = (recent_hawkes + [hawkes_value])[-self.signal_window:]
+            recent_closes = (recent_closes + [close])[-self.signal_window:]
+            bars += 1
+        
+        if not recent_hawkes:
+            return 0, None, None, None
+        
+        hawkes_value = recent_hawkes[-1]
+        if bars < self.min_bars or len(sorted_window) < self.quantile_lookback:
+            return 0, hawkes_value, None, None
+        
+        q05 = _sorted_quantile(sorted_window, 0.05)
+        q95 = _sorted_quantile(sorted_window, 0.95)
+        signal = _breakout_signal(np.array(recent_hawkes), np.array(recent_closes), q05, q95)
+        
+        return signal, hawkes_value, q05, q95
+
 
 def calculate_hawkes_signal(df, atr_lookback=297, kappa=0.51, quantile_lookback=27):
     """
@@ -76,74 +425,71 @@ def calculate_hawkes_signal(df, atr_lookback=297, kappa=0.51, quantile_lookback=
     try:
         if df.height < max(atr_lookback, quantile_lookback) + 10:
             return 0, None, None, None
-            
-        # Calculate ATR
-        true_range = pl.max_horizontal(
-            (df["high"] - df["low"]),
-            (df["high"] - df["close"].shift(1)).abs(),
-            (df["low"] - df["close"].shift(1)).abs()
-        )
         
-        # We need to materialize the true_range expression into a Series
-        true_range = true_range.alias("true_range")
-        df_with_tr = df.with_columns([true_range])
-        
-        # Calculate ATR as rolling mean of true range
-        atr_series = df_with_tr["true_range"].rolling_mean(atr_lookback).fill_null(df_with_tr["true_range"])
-        
-        # Calculate normalized range
-        # Add both ATR and normalized range to the dataframe
-        df_with_indicators = df_with_tr.with_columns([
-            atr_series.alias("atr"),
-            ((df["high"] - df["low"]) / atr_series).fill_null(0).alias("norm_range")
-        ])
-        
-        # Now extract the normalized range as a numpy array
-        norm_range_np = df_with_indicators["norm_range"].to_numpy()
-        
-        # Apply Hawkes process
+        # Apply Hawkes process to the normalized range
         hawkes = HawkesProcess(kappa=kappa)
-        hawkes_values = hawkes.process_data(norm_range_np)
+        hawkes_values = hawkes.process_data(_normalized_range(df, atr_lookback))
         
-        # Calculate quantiles
-        valid_values = hawkes_values[~np.isnan(hawkes_values)]
-        if len(valid_values) < quantile_lookback:
+        signal, q05, q95 = _signal_from_hawkes(
+            hawkes_values, df["close"].to_numpy(), quantile_lookback
+        )
+        if q05 is None:
             return 0, hawkes_values, None, None
-            
-        recent_values = valid_values[-quantile_lookback:]
-        q05 = np.quantile(recent_values, 0.05)
-        q95 = np.quantile(recent_values, 0.95)
-        
-        # Generate trading signal
-        signal = 0
-        last_below_idx = -1
-        
-        # Get the last few values for signal generation
-        n = min(20, len(hawkes_values))
-        recent_hawkes = hawkes_values[-n:]
-        recent_prices = df["close"].tail(n).to_numpy()
-        
-        # Look for a low volatility point
-        for i in range(n-1):
-            if recent_hawkes[i] < q05:
-                last_below_idx = i
-                
-        # Check for breakout after low volatility
-        if last_below_idx >= 0:
-            curr_idx = n - 1  # Last value
-            prev_idx = n - 2  # Second-to-last value
-            
-            # Check if we just broke above the high threshold
-            if recent_hawkes[prev_idx] <= q95 and recent_hawkes[curr_idx] > q95:
-                # Determine direction based on price change from last low vol point
-                price_change = recent_prices[curr_idx] - recent_prices[last_below_idx]
-                
-                if price_change > 0:
-                    signal = 1  # Buy signal
-                else:
-                    signal = -1  # Sell signal
         
         return signal, hawkes_values, q05, q95
     except Exception as e:
         logging.error(f"Error in hawkes_strategy.calculate_hawkes_signal: {e}")
-        return 0, None, None, None
\ No newline at end of file
+        return 0, None, None, None
+
+
+def calculate_hawkes_signals(frames, atr_lookback=297, kappa=0.51, quantile_lookback=27):
+    """
+    Calculate Hawkes signals for many symbols in one batched pass
+    
+    Frames of equal length are stacked into a 2-D array and run through
+    HawkesProcess.process_batch together.
+    
+    Parameters:
+    -----------
+    frames: dict
+        Mapping of symbol -> pl.DataFrame with OHLC columns
+    atr_lookback, kappa, quantile_lookback:
+        Same as calculate_hawkes_signal
+    
+    Returns:
+    --------
+    dict: symbol -> (signal, hawkes_values, q05, q95), as calculate_hawkes_signal
+    """
+    results = {}
+    hawkes = HawkesProcess(kappa=kappa)
+    
+    # Group symbols by bar count so each group stacks into a rectangular array
+    groups = {}
+    for symbol, df in frames.items():
+        if df is None or df.height < max(atr_lookback, quantile_lookback) + 10:
+            results[symbol] = (0, None, None, None)
+            continue
+        try:
+            groups.setdefault(df.height, []).append((symbol, _normalized_range(df, atr_lookback)))
+        except Exception as e:
+            logging.error(f"Error in hawkes_strategy.calculate_hawkes_signals for {symbol}: {e}")
+            results[symbol] = (0, None, None, None)
+    
+    for members in groups.values():
+        symbols = [symbol for symbol, _ in members]
+        hawkes_matrix = hawkes.process_batch(np.vstack([norm_range for _, norm_range in members]))
+        
+        for symbol, hawkes_values in zip(symbols, hawkes_matrix):
+            try:
+                signal, q05, q95 = _signal_from_hawkes(
+                    hawkes_values, frames[symbol]["close"].to_numpy(), quantile_lookback
+                )
+                if q05 is None:
+                    results[symbol] = (0, hawkes_values, None, None)
+                else:
+                    results[symbol] = (signal, hawkes_values, q05, q95)
+            except Exception as e:
+                logging.error(f"Error in hawkes_strategy.calculate_hawkes_signals for {symbol}: {e}")
+                results[symbol] = (0, None, None, None)
+    
+    return results
@@ -0,0 +1,169 @@
+import time
+import logging
+import threading
+
+import polars as pl
+
+
+class _CachedSeries:
+    """Bars held for one (symbol, timeframe), oldest first; the last row is the forming bar."""
+
+    def __init__(self, df, capacity, exhausted, cycle):
+        self.df = df
+        self.capacity = capacity
+        self.exhausted = exhausted  # MT5 returned fewer bars than asked: no more history
+        self.cycle = cycle
+        self.refreshed_at = time.monotonic()
+
+
+class BarCache:
+    """
+    Shared OHLC bar cache keyed by (symbol, timeframe)
+
+    Each series is a bounded buffer of the most recent bars. A request is served
+    as a slice of the buffer when it was refreshed in the current scan cycle
+    (and within max_age seconds); otherwise only the bars since the last cached
+    bar are fetched from MT5 and appended, replacing the previously forming bar.
+
+    MT5 requests are made under the cache lock. Scans refresh every series from
+    the thread that owns the terminal first; scan workers then only peek().
+    """
+
+    def __init__(self, max_age=5.0, initial_fetch=3):
+        """
+        Parameters:
+        -----------
+        max_age: float
+            Seconds a refreshed series may be served without asking MT5 again
+        initial_fetch: int
+            Bars requested for an incremental refresh before growing the request
+        """
+        self.max_age = max_age
+        self.initial_fetch = initial_fetch
+        self.logger = logging.getLogger('BarCache')
+
+        self._series = {}
+        self._lock = threading.Lock()
+        self._cycle = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.mt5_requests = 0
+
+    def new_cycle(self):
+        """Mark the start of a scan cycle; the first request per series refreshes it."""
+        with self._lock:
+            self._cycle += 1
+
+    def invalidate(self, symbol=None, timeframe=None):
+        """Drop cached bars for one series, one symbol, or everything."""
+        with self._lock:
+            if symbol is None:
+                self._series.clear()
+                return
+            for key in list(self._series):
+                if key[0] == symbol and (timeframe is None or key[1] == timeframe):
+                    del self._series[key]
+
+    def stats(self):
+        """Hit/miss counters for logging and monitoring."""
+        requests = self.hits + self.misses + self.refreshes
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "mt5_requests": self.mt5_requests,
+            "hit_rate": round(self.hits / requests, 3) if requests else 0.0,
+            "series": len(self._series)
+        }
+
+    def get(self, symbol, timeframe, bars, fetch):
+        """
+        Return the most recent `bars` bars for a series
+
+        Parameters:
+        -----------
+        fetch: callable
+            fetch(symbol, timeframe, count) -> pl.DataFrame of the latest `count`
+            bars (oldest first) or None
+        """
+        key = (symbol, timeframe)
+        with self._lock:
+            entry = self._series.get(key)
+
+            if entry is not None and entry.df.height < bars and not entry.exhausted:
+                # Cached history is too short for this request
+                entry = None
+
+            if entry is None:
+                return self._load(key, bars, fetch)
+
+            fresh = (
+                entry.cycle == self._cycle
+                and time.monotonic() - entry.refreshed_at < self.max_age
+            )
+            if fresh:
+                self.hits += 1
+                return entry.df.tail(bars)
+
+            return self._refresh(key, entry, bars, fetch)
+
+    def peek(self, symbol, timeframe, bars):
+        """Bars refreshed in the current cycle, without ever calling MT5; None if not prefetched."""
+        with self._lock:
+            entry = self._series.get((symbol, timeframe))
+            if entry is None or entry.cycle != self._cycle:
+                return None
+            if entry.df.height < bars and not entry.exhausted:
+                return None
+            self.hits += 1
+            return entry.df.tail(bars)
+
+    def _fetch(self, fetch, symbol, timeframe, count):
+        self.mt5_requests += 1
+        return fetch(symbol, timeframe, count)
+
+    def _load(self, key, bars, fetch):
+        """Fetch a full window and (re)create the series."""
+        previous = self._series.get(key)
+        capacity = max(bars, previous.capacity if previous else 0)
+
+        df = self._fetch(fetch, key[0], key[1], capacity)
+        self.misses += 1
+        if df is None or df.height == 0:
+            return None
+
+        self._series[key] = _CachedSeries(df, capacity, df.height < capacity, self._cycle)
+        return df.tail(bars)
+
+    def _refresh(self, key, entry, bars, fetch):
+        """Fetch only the bars since the last cached one, growing the request until it overlaps."""
+        capacity = max(entry.capacity, bars)
+        last_time = entry.df["time"][-1]
+
+        count = self.initial_fetch
+        while True:
+            new_bars = self._fetch(fetch, key[0], key[1], count)
+            if new_bars is None or new_bars.height == 0:
+                return None
+
+            if new_bars["time"][0] <= last_time:
+                break
+            if count >= capacity or new_bars.height < count:
+                # Gap larger than the buffer: start over from a full window
+                self.logger.info(f"Bar cache gap for {key}, reloading {capacity} bars")
+                return self._load(key, bars, fetch)
+
+            count = min(count * 4, capacity)
+
+        # The fetched bars supersede everything from their first timestamp on,
+        # including the bar that was still forming at the last refresh
+        kept = entry.df.filter(pl.col("time") < new_bars["time"][0])
+        entry.df = pl.concat([kept, new_bars]).tail(capacity)
+        entry.capacity = capacity
+        entry.cycle = self._cycle
+        entry.refreshed_at = time.monotonic()
+        self.refreshes += 1
+
+        return entry.df.tail(bars)
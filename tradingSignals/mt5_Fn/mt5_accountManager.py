@@ -1,10 +1,13 @@
-import time
 import json
+import time
+import asyncio
 import logging
 import os
 
 from datetime import datetime
 from tradingSignals.mt5_Fn.mt5_signal_executor import MT5SignalExecutor
+from tradingSignals.mt5_Fn.mt5_gateway import get_mt5_gateway
+from tradingSignals.mt5_Fn.mt5_account_worker import AccountWorker, execute_with_latency
 
 ## --------------------------------------------------------------------------------------- ##
 ## --------------------------------------------------------------------------------------- ##
@@ -13,13 +16,26 @@ from tradingSignals.mt5_Fn.mt5_signal_executor import MT5SignalExecutor
 class MultiAccountExecutor:
     """Executes trading signals across multiple MT5 accounts."""
     
-    def __init__(self, account_configs=None):
-        """Initialize with multiple account configurations."""
+    def __init__(self, account_configs=None, parallel=None):
+        """Initialize with multiple account configurations.
+        
+        Args:
+            account_configs (list, optional): Account configurations; loaded from file/env if omitted
+            parallel (bool, optional): Run each account in its own worker process and dispatch
+                orders to all accounts simultaneously. Defaults to MT5_PARALLEL_EXECUTION.
+        """
         self.logger = logging.getLogger('MultiAccountExecutor')
         self.accounts = []
         self.executors = {}
         self.initialized = False
         
+        if parallel is None:
+            parallel = os.getenv("MT5_PARALLEL_EXECUTION", "false").lower() in ("1", "true", "yes")
+        self.parallel = parallel
+        
+        # Non-blocking pause between accounts in sequential execute_signal_async
+        self.account_switch_delay = 1.0
+        
         # Load default accounts if none provided
         if account_configs is None:
             account_configs = self._load_default_accounts()
@@ -43,13 +59,17 @@ class MultiAccountExecutor:
                 continue
                 
             # Create executor for this account
-            executor = MT5SignalExecutor(
-                username=config["username"],
-                password=config["password"],
-                server=config["server"],
-                risk_percent=config.get("risk_percent", 0.5),
-                terminal_path=config.get("terminal_path")
-            )
+            if self.parallel:
+                # Own process, own terminal connection
+                executor = AccountWorker(account_name, config)
+            else:
+                executor = MT5SignalExecutor(
+                    username=config["username"],
+                    password=config["password"],
+                    server=config["server"],
+                    risk_percent=config.get("risk_percent", 0.5),
+                    terminal_path=config.get("terminal_path")
+                )
             
             # Store the account and executor
             self.accounts.append(account_name)
@@ -67,7 +87,7 @@ class MultiAccountExecutor:
         
         # Set initialized status based on having at least one successful account connection
         self.initialized = successful_initializations > 0
-        self.logger.info(f"MultiAccountExecutor initialized with {successful_initializations}/{len(account_configs)} accounts")
+        self.logger.info(f"MultiAccountExecutor initialized with {successful_initializations}/{len(account_configs)} accounts ({'parallel' if self.parallel else 'sequential'} execution)")
     
     def _load_default_accounts(self):
         """Load account configurations from environment or config file."""
@@ -179,54 +199,91 @@ class MultiAccountExecutor:
         
         return results
     
-    def execute_signal(self, signal_data):
-        """Execute signal across all enabled accounts with account-specific signal IDs."""
-        results = {
-            "success": True,
-            "accounts_executed": 0,
-            "total_accounts": len(self.accounts),
-            "details": {}
+    def _account_signal_data(self, account_name, signal_data):
+        """Copy signal data with an account-specific signal ID."""
+        account_signal_data = signal_data.copy()
+        original_id = account_signal_data.get("signal_id", "unknown")
+        
+        # Create a unique signal ID for this account
+        account_signal_data["signal_id"] = f"{original_id}_{account_name}"
+        
+        self.logger.info(f"Using account-specific signal ID: {account_signal_data['signal_id']}")
+        return account_signal_data
+    
+    def _record_account_result(self, account_name, result):
+        """Update the account status from an execution result."""
+        account_info = self.executors[account_name]
+        
+        if result["success"]:
+            account_info["status"] = "active"
+            latency = result.get("latency", {})
+            self.logger.info(f"Account {account_name} dispatch-to-order: {latency.get('dispatch_to_order_ms')} ms (total {latency.get('total_ms')} ms)")
+        else:
+            self.logger.error(f"Failed to execute signal on account {account_name}: {result.get('error', 'Unknown error')}")
+            account_info["status"] = "error"
+        
+        return result
+    
+    def _execution_error(self, account_name, error):
+        self.logger.error(f"Error executing signal on account {account_name}: {error}")
+        self.executors[account_name]["status"] = "error"
+        return {
+            "success": False,
+            "error": str(error)
         }
+    
+    def _execute_on_account(self, account_name, signal_data, dispatched_at):
+        """Execute signal on a single account with an account-specific signal ID."""
+        executor = self.executors[account_name]["executor"]
         
-        for account_name in self.accounts:
-            account_info = self.executors[account_name]
-            executor = account_info["executor"]
+        self.logger.info(f"Executing signal on account: {account_name}")
+        
+        try:
+            account_signal_data = self._account_signal_data(account_name, signal_data)
             
-            self.logger.info(f"Executing signal on account: {account_name}")
+            # Execute the signal on this account
+            if self.parallel:
+                result = executor.submit_signal(account_signal_data, dispatched_at).result()
+            else:
+                result = execute_with_latency(executor, account_signal_data, dispatched_at)
             
-            try:
-                # Create a copy of signal data with account-specific ID
-                account_signal_data = signal_data.copy()
-                original_id = account_signal_data.get("signal_id", "unknown")
-                
-                # Create a unique signal ID for this account
-                account_signal_data["signal_id"] = f"{original_id}_{account_name}"
-                
-                self.logger.info(f"Using account-specific signal ID: {account_signal_data['signal_id']}")
+            return self._record_account_result(account_name, result)
                 
-                # Execute the signal on this account
-                result = executor.execute_signal(account_signal_data)
-                
-                # Store the result
-                results["details"][account_name] = result
-                
-                if result["success"]:
-                    results["accounts_executed"] += 1
-                    account_info["status"] = "active"
-                    
-                    # Wait a short time between executions
-                    time.sleep(1)
-                else:
-                    self.logger.error(f"Failed to execute signal on account {account_name}: {result.get('error', 'Unknown error')}")
-                    account_info["status"] = "error"
-                    
+        except Exception as e:
+            return self._execution_error(account_name, e)
+    
+    def _dispatch_parallel(self, signal_data):
+        """Hand the signal to every account worker at once; returns {account_name: future}."""
+        dispatched_at = time.time()
+        futures = {}
+        
+        for account_name in self.accounts:
+            executor = self.executors[account_name]["executor"]
+            try:
+                account_signal_data = self._account_signal_data(account_name, signal_data)
+                futures[account_name] = executor.submit_signal(account_signal_data, dispatched_at)
             except Exception as e:
-                self.logger.error(f"Error executing signal on account {account_name}: {e}")
-                results["details"][account_name] = {
-                    "success": False,
-                    "error": str(e)
-                }
-                account_info["status"] = "error"
+                futures[account_name] = e
+        
+        self.logger.info(f"Dispatched signal to {len(futures)} account worker(s)")
+        return futures
+    
+    def _new_execution_results(self):
+        return {
+            "success": True,
+            "accounts_executed": 0,
+            "total_accounts": len(self.accounts),
+            "details": {}
+        }
+    
+    def _finalize_execution_results(self, results):
+        # Slowest account order placement relative to dispatch: the cost of fanning out
+        order_latencies = [
+            detail["latency"]["dispatch_to_order_ms"]
+            for detail in results["details"].values()
+            if detail.get("latency", {}).get("dispatch_to_order_ms") is not None
+        ]
+        results["max_dispatch_to_order_ms"] = max(order_latencies) if order_latencies else None
         
         # Determine overall success
         if results["accounts_executed"] == 0 and results["total_accounts"] > 0:
@@ -235,6 +292,76 @@ class MultiAccountExecutor:
         
         return results
     
+    def execute_signal(self, signal_data):
+        """Execute signal across all enabled accounts with account-specific signal IDs."""
+        results = self._new_execution_results()
+        
+        if self.parallel:
+            for account_name, future in self._dispatch_parallel(signal_data).items():
+                try:
+                    if isinstance(future, Exception):
+                        raise future
+                    result = self._record_account_result(account_name, future.result())
+                except Exception as e:
+                    result = self._execution_error(account_name, e)
+                results["details"][account_name] = result
+                if result["success"]:
+                    results["accounts_executed"] += 1
+            
+            return self._finalize_execution_results(results)
+        
+        dispatched_at = time.time()
+        for account_name in self.accounts:
+            result = self._execute_on_account(account_name, signal_data, dispatched_at)
+            results["details"][account_name] = result
+            if result["success"]:
+                results["accounts_executed"] += 1
+        
+        return self._finalize_execution_results(results)
+    
+    async def execute_signal_async(self, signal_data, gateway=None):
+        """
+        Execute signal across all accounts without blocking the event loop.
+        
+        In parallel mode every account worker receives the signal at the same time.
+        Otherwise each account runs on the MT5 gateway thread in turn; the pause
+        between accounts is an asyncio sleep so the bot keeps answering users.
+        """
+        results = self._new_execution_results()
+        
+        if self.parallel:
+            futures = self._dispatch_parallel(signal_data)
+            outcomes = await asyncio.gather(
+                *(asyncio.wrap_future(f) for f in futures.values() if not isinstance(f, Exception)),
+                return_exceptions=True
+            )
+            outcomes = iter(outcomes)
+            for account_name, future in futures.items():
+                outcome = future if isinstance(future, Exception) else next(outcomes)
+                if isinstance(outcome, Exception):
+                    result = self._execution_error(account_name, outcome)
+                else:
+                    result = self._record_account_result(account_name, outcome)
+                results["details"][account_name] = result
+                if result["success"]:
+                    results["accounts_executed"] += 1
+            
+            return self._finalize_execution_results(results)
+        
+        gateway = gateway or get_mt5_gateway()
+        dispatched_at = time.time()
+        for index, account_name in enumerate(self.accounts):
+            result = await gateway.run(self._execute_on_account, account_name, signal_data, dispatched_at)
+            results["details"][account_name] = result
+            if result["success"]:
+                results["accounts_executed"] += 1
+                
+                # Give the terminal a moment before switching accounts
+                if self.account_switch_delay and index < len(self.accounts) - 1:
+                    await asyncio.sleep(self.account_switch_delay)
+        
+        return self._finalize_execution_results(results)
+    
     def apply_trailing_stop(self, signal_id=None, trailing_percent=None, min_profit_percent=None):
         """Apply trailing stop to all accounts.
         
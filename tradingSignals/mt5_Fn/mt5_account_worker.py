@@ -0,0 +1,123 @@
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from tradingSignals.mt5_Fn.mt5_signal_executor import MT5SignalExecutor
+
+## --------------------------------------------------------------------------------------- ##
+## Worker process side
+## --------------------------------------------------------------------------------------- ##
+
+# The MT5SignalExecutor owned by this worker process
+_executor = None
+
+
+def _worker_init(config):
+    """Connect this worker process to its own terminal (one MetaTrader5 connection per process)."""
+    global _executor
+    logging.basicConfig(
+        format="%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
+    )
+    _executor = MT5SignalExecutor(
+        username=config["username"],
+        password=config["password"],
+        server=config["server"],
+        risk_percent=config.get("risk_percent", 0.5),
+        terminal_path=config.get("terminal_path")
+    )
+
+
+def _worker_status():
+    return {"initialized": _executor.initialized, "connected": _executor.connected}
+
+
+def _worker_call(method, args, kwargs):
+    return getattr(_executor, method)(*args, **kwargs)
+
+
+def _worker_execute(signal_data, dispatched_at):
+    return execute_with_latency(_executor, signal_data, dispatched_at)
+
+
+def execute_with_latency(executor, signal_data, dispatched_at):
+    """
+    Run executor.execute_signal and attach dispatch-to-order timings to the result
+
+    Timings are wall-clock milliseconds measured from `dispatched_at` (time.time()
+    when the signal was handed to the account):
+        queue_ms             - until this account started working on the signal
+        dispatch_to_order_ms - until the server accepted the first (pending) order;
+                               this is order placement, not a fill
+        total_ms             - until every order for this account had been sent
+    """
+    started_at = time.time()
+    result = executor.execute_signal(signal_data)
+    finished_at = time.time()
+
+    placed_times = [order["placed_at"] for order in result.get("orders", []) if order.get("placed_at")]
+    result["latency"] = {
+        "queue_ms": round((started_at - dispatched_at) * 1000, 1),
+        "dispatch_to_order_ms": round((min(placed_times) - dispatched_at) * 1000, 1) if placed_times else None,
+        "total_ms": round((finished_at - dispatched_at) * 1000, 1)
+    }
+    return result
+
+## --------------------------------------------------------------------------------------- ##
+## Parent process side
+## --------------------------------------------------------------------------------------- ##
+
+
+class AccountWorker:
+    """
+    MT5SignalExecutor running in a dedicated worker process
+
+    The MetaTrader5 module keeps a single terminal connection per process, so
+    accounts on separate terminals can only trade simultaneously from separate
+    processes. Method calls are forwarded to the worker and block until it
+    answers; `submit_signal` returns a future for parallel fan-out.
+    """
+
+    def __init__(self, name, config, startup_timeout=120):
+        self.name = name
+        self.logger = logging.getLogger('AccountWorker')
+        self.initialized = False
+        self.connected = False
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=1, initializer=_worker_init, initargs=(config,)
+        )
+
+        try:
+            status = self._pool.submit(_worker_status).result(timeout=startup_timeout)
+            self.initialized = status["initialized"]
+            self.connected = status["connected"]
+        except Exception as e:
+            self.logger.error(f"Worker process for account {name} failed to start: {e}")
+
+    def _call(self, method, *args, **kwargs):
+        return self._pool.submit(_worker_call, method, args, kwargs).result()
+
+    def submit_signal(self, signal_data, dispatched_at):
+        """Start executing a signal in the worker; returns a concurrent.futures.Future."""
+        return self._pool.submit(_worker_execute, signal_data, dispatched_at)
+
+    def execute_signal(self, signal_data):
+        return self.submit_signal(signal_data, time.time()).result()
+
+    def apply_trailing_stop(self, **kwargs):
+        return self._call("apply_trailing_stop", **kwargs)
+
+    def get_account_info(self):
+        return self._call("get_account_info")
+
+    def generate_daily_stats(self):
+        return self._call("generate_daily_stats")
+
+    def generate_signal_stats(self, days_back=1):
+        return self._call("generate_signal_stats", days_back)
+
+    def cleanup(self):
+        try:
+            self._call("cleanup")
+        finally:
+            self._pool.shutdown(wait=True)
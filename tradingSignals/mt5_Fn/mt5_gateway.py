@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+import MetaTrader5 as mt5
+
+
+class MT5Gateway:
+    """
+    Awaitable access to the MetaTrader5 terminal API
+
+    The MetaTrader5 module holds one process-wide terminal connection and its
+    calls block (and are not thread-safe), so every call made through the gateway
+    runs on a single dedicated thread. Coroutines await the result while the
+    event loop keeps serving Telegram updates; calls are executed one at a time
+    in submission order.
+    """
+
+    def __init__(self, thread_name="mt5-gateway"):
+        self.logger = logging.getLogger('MT5Gateway')
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name)
+        self._thread_ident = None
+        self.calls = 0
+        self.pending = 0
+
+    def _invoke(self, func, args, kwargs):
+        self._thread_ident = threading.get_ident()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.pending -= 1
+
+    def in_gateway_thread(self):
+        """True when called from the gateway thread itself."""
+        return threading.get_ident() == self._thread_ident
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking callable on the gateway thread and await its result
+
+        Used both for single terminal calls and for whole synchronous routines
+        (bar prefetch, order execution) that talk to MT5 several times. Keep
+        pure computation off the gateway so it never delays terminal calls.
+        """
+        if self.in_gateway_thread():
+            # Nested call from code already running on the gateway thread
+            return func(*args, **kwargs)
+
+        self.calls += 1
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._invoke, func, args, kwargs)
+        )
+
+    # ---- Terminal calls ----
+
+    async def symbol_info_tick(self, symbol):
+        return await self.run(mt5.symbol_info_tick, symbol)
+
+    async def symbol_info(self, symbol):
+        return await self.run(mt5.symbol_info, symbol)
+
+    async def symbol_select(self, symbol, enable=True):
+        return await self.run(mt5.symbol_select, symbol, enable)
+
+    async def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        return await self.run(mt5.copy_rates_from_pos, symbol, timeframe, start_pos, count)
+
+    async def order_send(self, request):
+        return await self.run(mt5.order_send, request)
+
+    async def positions_get(self, **kwargs):
+        return await self.run(mt5.positions_get, **kwargs)
+
+    async def account_info(self):
+        return await self.run(mt5.account_info)
+
+    async def last_error(self):
+        return await self.run(mt5.last_error)
+
+    def stats(self):
+        """Call counters for logging and monitoring."""
+        return {"calls": self.calls, "pending": self.pending}
+
+    def shutdown(self, wait=True):
+        """Stop the gateway thread after queued calls complete."""
+        self._executor.shutdown(wait=wait)
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_mt5_gateway():
+    """Return the process-wide MT5 gateway, creating it on first use."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = MT5Gateway()
+        return _gateway
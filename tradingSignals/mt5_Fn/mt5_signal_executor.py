@@ -8,6 +8,11 @@ import time
 from datetime import datetime
 from dotenv import load_dotenv
 
+from tradingSignals.mt5_Fn import mt5_trade_stats
+from tradingSignals.mt5_Fn.symbol_cache import get_symbol_cache
+from tradingSignals.mt5_Fn.position_book import PositionBook
+from tradingSignals.mt5_Fn.signal_record import SIGNAL_MAGIC_BASE, SIGNAL_MAGIC_MAX
+
 
 # Load environment variables
 load_dotenv()
@@ -24,9 +29,28 @@ class MT5SignalExecutor:
         self.initialized = False
         self.terminal_path = terminal_path
         
+        # Contract metadata shared by all executors on the same server
+        self.symbol_cache = get_symbol_cache(server or "default", mt5.symbol_info)
+        
         # Track active positions
         self.active_positions = {}
         
+        # Open signal positions with precomputed trailing-stop triggers
+        self.position_book = PositionBook()
+        
+        # Instrument-specific trailing distances, in pips of each instrument
+        self.trailing_stop_settings = {
+            "XAUUSD": {"min_profit_pips": 200, "trailing_pips": 500},  # Gold needs wider stops
+            "BTCUSD": {"min_profit_pips": 5000, "trailing_pips": 10000},  # Bitcoin needs much wider stops
+            "US30": {"min_profit_pips": 1100, "trailing_pips": 550},  # Dow Jones
+            "US500": {"min_profit_pips": 950, "trailing_pips": 550},  # S&P 500
+            "NAS100": {"min_profit_pips": 1150, "trailing_pips": 1050},  # Nasdaq
+            "UK100": {"min_profit_pips": 1150, "trailing_pips": 950},  # FTSE 100
+            "FRA40": {"min_profit_pips": 1150, "trailing_pips": 950},  # CAC 40
+            "GER40": {"min_profit_pips": 1100, "trailing_pips": 850},  # DAX
+            "default": {"min_profit_pips": 5, "trailing_pips": 3}  # Default for forex pairs
+        }
+        
         # Connect to MT5
         self.initialize_mt5(username, password, server)
         
@@ -75,6 +99,9 @@ class MT5SignalExecutor:
             
             self.logger.info("✅ MT5 initialized successfully!")
             
+            # Contract specs may have changed while disconnected
+            self.symbol_cache.invalidate()
+            
             # Login if credentials provided
             if username and password and server:
                 try:
@@ -132,7 +159,7 @@ class MT5SignalExecutor:
         """
         try:
             # Get symbol info
-            symbol_info = mt5.symbol_info(symbol)
+            symbol_info = self.symbol_cache.get(symbol)
             if not symbol_info:
                 self.logger.error(f"Failed to get symbol info for {symbol}")
                 return False, price
@@ -204,7 +231,7 @@ class MT5SignalExecutor:
         """
         try:
             # Get symbol info
-            symbol_info = mt5.symbol_info(symbol)
+            symbol_info = self.symbol_cache.get(symbol)
             if not symbol_info:
                 self.logger.error(f"Failed to get symbol info for {symbol}")
                 return sl, tp
@@ -336,7 +363,7 @@ class MT5SignalExecutor:
                 return {"success": False, "error": "No take profit levels found"}
             
             # Check if symbol is valid in MT5
-            symbol_info = mt5.symbol_info(symbol)
+            symbol_info = self.symbol_cache.get(symbol)
             if symbol_info is None:
                 self.logger.error(f"Symbol {symbol} not found in MT5!")
                 return {"success": False, "error": f"Symbol {symbol} not found in MT5"}
@@ -346,6 +373,7 @@ class MT5SignalExecutor:
                 if not mt5.symbol_select(symbol, True):
                     self.logger.error(f"Failed to select symbol {symbol}")
                     return {"success": False, "error": f"Failed to select symbol {symbol}"}
+                symbol_info.visible = True
             
             # Log account trading status
             account_info = mt5.account_info()
@@ -367,7 +395,7 @@ class MT5SignalExecutor:
             
             # Calculate lot size based on risk management
             # We'll calculate the total position size and then divide it among our entries
-            total_lot_size = self.calculate_position_size(symbol, (entry_low + entry_high) / 2, (stop_low + stop_high) / 2, direction)
+            total_lot_size = self.calculate_position_size(symbol, (entry_low + entry_high) / 2, (stop_low + stop_high) / 2, direction, account_info=account_info)
     
             # Define relative weights for distributing lots
             if direction == "BUY":
@@ -480,7 +508,7 @@ class MT5SignalExecutor:
                     "sl": stop_loss,
                     "tp": take_profit,
                     "deviation": self.slippage_pips,
-                    "magic": 123456 + i,
+                    "magic": SIGNAL_MAGIC_BASE + i,
                     "comment": f"{_comment}{i+1}",
                     "type_time": mt5.ORDER_TIME_GTC,
                     "type_filling": mt5.ORDER_FILLING_IOC,
@@ -492,6 +520,7 @@ class MT5SignalExecutor:
                 # Send the order with retries
                 success = False
                 order_id = None
+                placed_at = None
                 
                 for attempt in range(self.retry_attempts):
                     try:
@@ -550,6 +579,7 @@ class MT5SignalExecutor:
                             self.logger.info(f"✅ Order {i+1} executed successfully: {result.order}")
                             success = True
                             order_id = result.order
+                            placed_at = time.time()
                             break
                         else:
                             # Handle specific error codes
@@ -585,7 +615,8 @@ class MT5SignalExecutor:
                         "entry_price": entry_price,
                         "stop_loss": stop_loss,
                         "lot_size": lot_size,
-                        "take_profit": take_profit
+                        "take_profit": take_profit,
+                        "placed_at": placed_at
                     })
             
             # Check if any orders were executed successfully
@@ -602,6 +633,7 @@ class MT5SignalExecutor:
                     "orders": executed_orders,
                     "execution_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 }
+                self.position_book.record_orders(signal_id, self.executed_signals[signal_id])
                 
                 return {
                     "success": True,
@@ -636,7 +668,7 @@ class MT5SignalExecutor:
             # Group positions by symbol
             for position in positions:
                 # Only track our positions (by magic number range)
-                if 123456 <= position.magic < 123500:
+                if SIGNAL_MAGIC_BASE <= position.magic < SIGNAL_MAGIC_MAX:
                     symbol = position.symbol
                     
                     if symbol not in self.active_positions:
@@ -768,7 +800,7 @@ class MT5SignalExecutor:
                 
                 # Close our positions for this symbol
                 for position in positions:
-                    if 123456 <= position.magic < 123500:
+                    if SIGNAL_MAGIC_BASE <= position.magic < SIGNAL_MAGIC_MAX:
                         result = self.close_position_by_ticket(position.ticket, "Signal exit")
                         if result.get("success"):
                             exits_processed += 1
@@ -812,7 +844,7 @@ class MT5SignalExecutor:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def calculate_position_size(self, symbol, entry_price, stop_loss, direction):
+    def calculate_position_size(self, symbol, entry_price, stop_loss, direction, account_info=None):
         """
         Calculate position size based on risk management rules.
         
@@ -821,13 +853,15 @@ class MT5SignalExecutor:
             entry_price (float): Entry price
             stop_loss (float): Stop loss price
             direction (str): Trade direction (BUY/SELL)
+            account_info (optional): mt5.account_info() already fetched by the caller
             
         Returns:
             float: Position size in lots
         """
         try:
             # Get account information
-            account_info = mt5.account_info()
+            if account_info is None:
+                account_info = mt5.account_info()
             if not account_info:
                 self.logger.error("Failed to get account info")
                 return self.default_lot_sizes.get(symbol, 0.01)
@@ -838,7 +872,7 @@ class MT5SignalExecutor:
             risk_amount = account_balance * (self.risk_percent / 100)
             
             # Get symbol info
-            symbol_info = mt5.symbol_info(symbol)
+            symbol_info = self.symbol_cache.get(symbol)
             if not symbol_info:
                 self.logger.error(f"Failed to get symbol info for {symbol}")
                 return self.default_lot_sizes.get(symbol, 0.01)
@@ -940,7 +974,7 @@ class MT5SignalExecutor:
             partial_lot = round(lot_size / num_tps, 2)
             
             # Ensure minimum lot size
-            symbol_info = mt5.symbol_info(symbol)
+            symbol_info = self.symbol_cache.get(symbol)
             if not symbol_info:
                 self.logger.error(f"Failed to get symbol info for {symbol}")
                 return False
@@ -964,7 +998,7 @@ class MT5SignalExecutor:
                     "type": order_type,
                     "price": tp_price,
                     "deviation": self.slippage_pips,
-                    "magic": 123456 + i,  # Use different magic number for each TP
+                    "magic": SIGNAL_MAGIC_BASE + i,  # Use different magic number for each TP
                     "comment": f"TP{i+1} for Order {order_id}",
                     "type_time": mt5.ORDER_TIME_GTC,
                     "type_filling": mt5.ORDER_FILLING_IOC,
@@ -1007,7 +1041,7 @@ class MT5SignalExecutor:
             positions = mt5.positions_get(symbol=symbol)
             if positions:
                 for position in positions:
-                    if position.ticket == order_id or position.magic == 123456:
+                    if position.ticket == order_id or position.magic == SIGNAL_MAGIC_BASE:
                         # Position is still open
                         current_price = mt5.symbol_info_tick(symbol).bid if position.type == 0 else mt5.symbol_info_tick(symbol).ask
                         
@@ -1092,7 +1126,7 @@ class MT5SignalExecutor:
             
             if positions:
                 for pos in positions:
-                    if pos.ticket == order_id or pos.magic == 123456:
+                    if pos.ticket == order_id or pos.magic == SIGNAL_MAGIC_BASE:
                         position = pos
                         break
             
@@ -1105,7 +1139,7 @@ class MT5SignalExecutor:
                 close_volume = round(position.volume * (close_percent / 100), 2)
                 
                 # Ensure minimum lot size
-                symbol_info = mt5.symbol_info(symbol)
+                symbol_info = self.symbol_cache.get(symbol)
                 if close_volume < symbol_info.volume_min:
                     close_volume = symbol_info.volume_min
                 
@@ -1122,7 +1156,7 @@ class MT5SignalExecutor:
                 "position": position.ticket,
                 "price": mt5.symbol_info_tick(symbol).bid if position.type == 0 else mt5.symbol_info_tick(symbol).ask,
                 "deviation": self.slippage_pips,
-                "magic": 123456,
+                "magic": SIGNAL_MAGIC_BASE,
                 "comment": f"Close signal {signal_id}",
                 "type_time": mt5.ORDER_TIME_GTC,
                 "type_filling": mt5.ORDER_FILLING_IOC,
@@ -1153,10 +1187,31 @@ class MT5SignalExecutor:
             self.logger.error(f"Error closing position: {e}")
             return {"success": False, "error": str(e)}
     
+    def _trailing_rules(self, symbol, trailing_percent=None, min_profit_percent=None):
+        """(trailing_pips, min_profit_pips) for a symbol; explicit values override the instrument defaults."""
+        settings = self.trailing_stop_settings.get(symbol, self.trailing_stop_settings["default"])
+        trailing_pips = trailing_percent if trailing_percent is not None else settings["trailing_pips"]
+        min_profit_pips = min_profit_percent if min_profit_percent is not None else settings["min_profit_pips"]
+        return trailing_pips, min_profit_pips
+    
+    def _pip_size(self, symbol):
+        symbol_info = self.symbol_cache.get(symbol)
+        if not symbol_info:
+            return None
+        
+        # For Forex, 1 pip is usually 0.0001 for 4-digit symbols, 0.00001 for 5-digit
+        if symbol_info.digits == 5 or symbol_info.digits == 3:
+            return symbol_info.point * 10
+        return symbol_info.point
+    
     def apply_trailing_stop(self, signal_id=None, trailing_percent=None, min_profit_percent=None):
         """
         Apply trailing stop to active positions using instrument-specific scaling.
         
+        The position book is synced from one bulk positions_get() call; only
+        positions whose price has moved past their precomputed trigger level are
+        evaluated and modified.
+        
         Args:
             signal_id (str, optional): Specific signal ID to apply trailing stop to, or None for all active signals
             trailing_percent (float, optional): Distance to maintain between price and stop loss in percent of price
@@ -1169,24 +1224,8 @@ class MT5SignalExecutor:
             if not self.initialize_mt5():
                 return {"success": False, "error": "MT5 not connected"}
         
-        # Define instrument-specific pip values and appropriate trailing distances
-        instrument_settings = {
-            # Format: "symbol": {"pip_multiplier": X, "min_profit_pips": Y, "trailing_pips": Z}
-            # Where X is the multiplier to convert standard pips to appropriate size for this instrument
-            "XAUUSD": {"pip_multiplier": 10.0, "min_profit_pips": 200, "trailing_pips": 500},  # Gold needs wider stops
-            "BTCUSD": {"pip_multiplier": 100.0, "min_profit_pips": 5000, "trailing_pips": 10000},  # Bitcoin needs much wider stops
-            "US30": {"pip_multiplier": 5.0, "min_profit_pips": 1100, "trailing_pips": 550},  # Dow Jones
-            "US500": {"pip_multiplier": 5.0, "min_profit_pips": 950, "trailing_pips": 550},  # S&P 500
-            "NAS100": {"pip_multiplier": 5.0, "min_profit_pips": 1150, "trailing_pips": 1050},  # Nasdaq
-            "UK100": {"pip_multiplier": 5.0, "min_profit_pips": 1150, "trailing_pips": 950},  # FTSE 100
-            "FRA40": {"pip_multiplier": 5.0, "min_profit_pips": 1150, "trailing_pips": 950},  # CAC 40
-            "GER40": {"pip_multiplier": 5.0, "min_profit_pips": 1100, "trailing_pips": 850},  # DAX
-            "default": {"pip_multiplier": 1.0, "min_profit_pips": 5, "trailing_pips": 3}  # Default for forex pairs
-        }
-        
-        # Set defaults if not provided
-        default_trailing_pips = 50  # Default trailing stop distance for forex
-        default_min_profit_pips = 20  # Default minimum profit before trailing activates for forex
+        if signal_id and signal_id not in self.executed_signals:
+            return {"success": False, "error": f"Signal {signal_id} not found"}
         
         results = {
             "success": True,
@@ -1196,231 +1235,73 @@ class MT5SignalExecutor:
         }
         
         try:
-            # Get all signals or filter by signal_id
-            signals_to_check = []
-            if signal_id:
-                if signal_id in self.executed_signals:
-                    signals_to_check = [signal_id]
+            # Reconcile the book with the terminal in a single call
+            self.position_book.sync(
+                mt5.positions_get(),
+                self._pip_size,
+                lambda symbol: self._trailing_rules(symbol, trailing_percent, min_profit_percent)
+            )
+            
+            entries = self.position_book.select(signal_id)
+            results["positions_checked"] = len(entries)
+            if not entries:
+                return results
+            
+            # One tick per symbol
+            ticks = {}
+            for symbol in self.position_book.symbols(signal_id):
+                tick = mt5.symbol_info_tick(symbol)
+                if tick:
+                    ticks[symbol] = tick
                 else:
-                    return {"success": False, "error": f"Signal {signal_id} not found"}
-            else:
-                signals_to_check = list(self.executed_signals.keys())
-            
-            # Process each signal
-            for sig_id in signals_to_check:
-                signal_info = self.executed_signals[sig_id]
-                symbol = signal_info["symbol"]
-                direction = signal_info["direction"]
-                orders = signal_info.get("orders", [])
-                
-                # Get instrument-specific settings
-                settings = instrument_settings.get(symbol, instrument_settings["default"])
-                pip_multiplier = settings["pip_multiplier"]
-                instrument_min_profit_pips = settings["min_profit_pips"]
-                instrument_trailing_pips = settings["trailing_pips"]
+                    self.logger.error(f"Failed to get tick data for {symbol}")
+            
+            for entry, current_price in self.position_book.triggered(ticks, signal_id):
+                profit_pips = entry.profit_pips(current_price)
+                new_sl = entry.new_sl(current_price)
+                current_sl = entry.sl
                 
-                # Use provided values or instrument-specific defaults
-                trailing_pips = trailing_percent if trailing_percent is not None else instrument_trailing_pips
-                min_profit_pips = min_profit_percent if min_profit_percent is not None else instrument_min_profit_pips
+                self.logger.info(f"Updating trailing stop for {entry.direction} position {entry.ticket}: {current_sl:.5f} -> {new_sl:.5f}")
                 
-                self.logger.info(f"Using instrument-specific settings for {symbol}: min_profit_pips={min_profit_pips}, trailing_pips={trailing_pips}, pip_multiplier={pip_multiplier}")
+                # Modify ONLY the stop loss, maintaining the current take profit
+                request = {
+                    "action": mt5.TRADE_ACTION_SLTP,
+                    "symbol": entry.symbol,
+                    "position": entry.ticket,
+                    "sl": new_sl,
+                    "tp": entry.tp
+                }
                 
-                # Check if the signal has associated orders
-                if not orders:
-                    continue
+                result = mt5.order_send(request)
                 
-                # Process each order in the signal
-                for order_idx, order in enumerate(orders):
-                    order_id = order["order_id"]
-                    
-                    # Get current position info
-                    position = None
-                    positions = mt5.positions_get(ticket=order_id)
-                    
-                    # If not found by ticket, try by magic number
-                    if not positions:
-                        positions = mt5.positions_get(symbol=symbol)
-                        if positions:
-                            for pos in positions:
-                                if pos.magic == 123456 + order_idx:
-                                    position = pos
-                                    break
-                    else:
-                        position = positions[0]
-                    
-                    if not position:
-                        # Position might be closed already
-                        continue
-                    
-                    results["positions_checked"] += 1
-                    
-                    # Get current market price
-                    tick = mt5.symbol_info_tick(symbol)
-                    if not tick:
-                        self.logger.error(f"Failed to get tick data for {symbol}")
-                        continue
-                    
-                    # Determine current price based on direction
-                    current_price = tick.bid if direction == "BUY" else tick.ask
-                    
-                    # Get symbol info for pip calculations
-                    symbol_info = mt5.symbol_info(symbol)
-                    if not symbol_info:
-                        self.logger.error(f"Failed to get symbol info for {symbol}")
-                        continue
-                    
-                    # Calculate pip size based on symbol digits
-                    point = symbol_info.point
-                    digits = symbol_info.digits
-                    
-                    # For Forex, 1 pip is usually 0.0001 for 4-digit symbols, 0.00001 for 5-digit
-                    if digits == 5 or digits == 3:  # 5-digit Forex or 3-digit indices/commodities
-                        pip_size = point * 10
-                    else:  # Standard 4-digit Forex or 2-digit indices
-                        pip_size = point
-                    
-                    # Calculate current profit in pips
-                    entry_price = position.price_open
-                    if direction == "BUY":
-                        profit_pips = (current_price - entry_price) / pip_size
-                    else:  # SELL
-                        profit_pips = (entry_price - current_price) / pip_size
-                    
-                    # Check if we have enough profit to activate trailing stop
-                    if profit_pips < min_profit_pips:
-                        self.logger.info(f"Position {order_id} profit ({profit_pips:.1f} pips) below minimum threshold ({min_profit_pips} pips)")
-                        results["details"].append({
-                            "order_id": order_id,
-                            "symbol": symbol,
-                            "direction": direction,
-                            "profit_pips": profit_pips,
-                            "min_profit_pips": min_profit_pips,
-                            "updated": False,
-                            "reason": "Profit below threshold"
-                        })
-                        continue
-                    
-                    # Calculate new stop loss based on trailing distance
-                    current_sl = position.sl
-                    current_tp = position.tp  # Store current take profit
-                    
-                    if direction == "BUY":
-                        # For BUY, move stop loss up as price moves up
-                        # Calculate new stop loss level
-                        new_sl = current_price - (trailing_pips * pip_size)
-                        
-                        # Only move stop loss if it would move up (don't move it down)
-                        if current_sl < new_sl:
-                            self.logger.info(f"Updating trailing stop for BUY position {order_id}: {current_sl:.5f} -> {new_sl:.5f}")
-                            
-                            # Modify ONLY the stop loss, maintaining the current take profit
-                            request = {
-                                "action": mt5.TRADE_ACTION_SLTP,
-                                "symbol": symbol,
-                                "position": position.ticket,
-                                "sl": new_sl,  # New stop loss
-                                "tp": current_tp  # Keep current take profit
-                            }
-                            
-                            result = mt5.order_send(request)
-                            
-                            if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-                                results["positions_updated"] += 1
-                                results["details"].append({
-                                    "order_id": order_id,
-                                    "symbol": symbol,
-                                    "direction": direction,
-                                    "old_sl": current_sl,
-                                    "new_sl": new_sl,
-                                    "tp": current_tp,  # Include TP in the details
-                                    "profit_pips": profit_pips,
-                                    "trailing_pips": trailing_pips,
-                                    "updated": True
-                                })
-                                
-                                # Update stored order info
-                                order["stop_loss"] = new_sl
-                            else:
-                                error_code = mt5.last_error() if not result else result.retcode
-                                self.logger.error(f"Failed to modify BUY position {order_id}: {error_code}")
-                                results["details"].append({
-                                    "order_id": order_id,
-                                    "symbol": symbol,
-                                    "direction": direction,
-                                    "profit_pips": profit_pips,
-                                    "updated": False,
-                                    "reason": f"Modify failed: {error_code}"
-                                })
-                        else:
-                            results["details"].append({
-                                "order_id": order_id,
-                                "symbol": symbol,
-                                "direction": direction,
-                                "current_sl": current_sl,
-                                "calculated_sl": new_sl,
-                                "profit_pips": profit_pips,
-                                "updated": False,
-                                "reason": "Current SL already higher"
-                            })
+                if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+                    results["positions_updated"] += 1
+                    results["details"].append({
+                        "order_id": entry.order["order_id"],
+                        "symbol": entry.symbol,
+                        "direction": entry.direction,
+                        "old_sl": current_sl,
+                        "new_sl": new_sl,
+                        "tp": entry.tp,
+                        "profit_pips": profit_pips,
+                        "trailing_pips": entry.trailing_pips,
+                        "updated": True
+                    })
                     
-                    else:  # SELL
-                        # For SELL, move stop loss down as price moves down
-                        # Calculate new stop loss level
-                        new_sl = current_price + (trailing_pips * pip_size)
-                        
-                        # Only move stop loss if it would move down (don't move it up)
-                        if current_sl > new_sl or current_sl == 0:
-                            self.logger.info(f"Updating trailing stop for SELL position {order_id}: {current_sl:.5f} -> {new_sl:.5f}")
-                            
-                            # Modify ONLY the stop loss, maintaining the current take profit
-                            request = {
-                                "action": mt5.TRADE_ACTION_SLTP,
-                                "symbol": symbol,
-                                "position": position.ticket,
-                                "sl": new_sl,  # New stop loss
-                                "tp": current_tp  # Keep current take profit
-                            }
-                            
-                            result = mt5.order_send(request)
-                            
-                            if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-                                results["positions_updated"] += 1
-                                results["details"].append({
-                                    "order_id": order_id,
-                                    "symbol": symbol,
-                                    "direction": direction,
-                                    "old_sl": current_sl,
-                                    "new_sl": new_sl,
-                                    "tp": current_tp,  # Include TP in the details
-                                    "profit_pips": profit_pips,
-                                    "trailing_pips": trailing_pips,
-                                    "updated": True
-                                })
-                                
-                                # Update stored order info
-                                order["stop_loss"] = new_sl
-                            else:
-                                error_code = mt5.last_error() if not result else result.retcode
-                                self.logger.error(f"Failed to modify SELL position {order_id}: {error_code}")
-                                results["details"].append({
-                                    "order_id": order_id,
-                                    "symbol": symbol,
-                                    "direction": direction,
-                                    "profit_pips": profit_pips,
-                                    "updated": False,
-                                    "reason": f"Modify failed: {error_code}"
-                                })
-                        else:
-                            results["details"].append({
-                                "order_id": order_id,
-                                "symbol": symbol,
-                                "direction": direction,
-                                "current_sl": current_sl,
-                                "calculated_sl": new_sl,
-                                "profit_pips": profit_pips,
-                                "updated": False,
-                                "reason": "Current SL already lower"
-                            })
+                    # Update stored order info and the next trigger level
+                    entry.order["stop_loss"] = new_sl
+                    entry.set_sl(new_sl)
+                else:
+                    error_code = mt5.last_error() if not result else result.retcode
+                    self.logger.error(f"Failed to modify {entry.direction} position {entry.ticket}: {error_code}")
+                    results["details"].append({
+                        "order_id": entry.order["order_id"],
+                        "symbol": entry.symbol,
+                        "direction": entry.direction,
+                        "profit_pips": profit_pips,
+                        "updated": False,
+                        "reason": f"Modify failed: {error_code}"
+                    })
             
             return results
             
@@ -1480,7 +1361,7 @@ class MT5SignalExecutor:
                     positions = mt5.positions_get(symbol=symbol)
                     if positions:
                         for pos in positions:
-                            if pos.ticket == order_id or pos.magic == 123456 + order_idx:
+                            if pos.ticket == order_id or pos.magic == SIGNAL_MAGIC_BASE + order_idx:
                                 position = pos
                                 break
                 else:
@@ -1592,6 +1473,20 @@ class MT5SignalExecutor:
             self.logger.error(f"Error getting account info: {e}")
             return {"success": False, "error": str(e)}
     
+    def _load_stats_inputs(self, from_timestamp, to_timestamp):
+        """
+        Pull everything the stats engine needs in bulk: all deals in the range,
+        all open positions, and symbol info once per distinct symbol.
+        """
+        deals = mt5_trade_stats.deals_frame(mt5.history_deals_get(from_timestamp, to_timestamp))
+        positions = mt5_trade_stats.positions_frame(mt5.positions_get())
+        
+        symbol_names = set(deals["symbol"].to_list()) | set(positions["symbol"].to_list())
+        symbol_names |= {signal_info.get("symbol") for signal_info in self.executed_signals.values() if signal_info.get("symbol")}
+        symbols = mt5_trade_stats.symbols_frame({symbol: mt5.symbol_info(symbol) for symbol in symbol_names})
+        
+        return deals, positions, symbols
+    
     def generate_daily_stats(self):
         """
         Generate statistics for signals executed today.
@@ -1613,201 +1508,15 @@ class MT5SignalExecutor:
             if not account_info:
                 return {"success": False, "error": "Failed to get account info"}
             
-            current_balance = account_info.balance
-            start_balance = account_info.balance  # We'll adjust this if we find closed trades
-            
-            # Initialize statistics
-            stats = {
-                "date": today_str,
-                "signals_executed": 0,
-                "positions_opened": 0,
-                "positions_closed": 0,
-                "wins": 0,
-                "losses": 0,
-                "total_profit": 0.0,
-                "total_pips": 0.0,
-                "win_rate": 0.0,
-                "return_percentage": 0.0,
-                "active_positions": 0,
-                "symbols_traded": set(),
-                "signal_details": []
-            }
-            
-            # Find signals executed today
-            today_signals = []
-            for signal_id, signal_info in self.executed_signals.items():
-                execution_time = signal_info.get("execution_time", "")
-                if execution_time.startswith(today_str):
-                    today_signals.append(signal_id)
-                    stats["signals_executed"] += 1
-                    stats["symbols_traded"].add(signal_info["symbol"])
-            
-            # Get history orders for today - FIX: Use proper datetime conversion
-            from_date = datetime(today.year, today.month, today.day)
-            to_date = datetime(today.year, today.month, today.day, 23, 59, 59)
-            
             # Convert to Unix timestamp (seconds since epoch) - this is what MT5 expects
-            from_timestamp = int(from_date.timestamp())
-            to_timestamp = int(to_date.timestamp())
-            
-            # Get history orders using timestamps
-            history_orders = mt5.history_orders_get(from_timestamp, to_timestamp)
-            
-            # Track orders specifically from our signals
-            signal_orders = set()
-            for signal_id in today_signals:
-                signal_info = self.executed_signals[signal_id]
-                for order in signal_info.get("orders", []):
-                    signal_orders.add(order["order_id"])
-            
-            # Track closed positions
-            closed_positions = []
-            if history_orders:
-                for order in history_orders:
-                    # Check if it's our signal-generated order
-                    if order.magic >= 123456 and order.magic < 123500:
-                        # Check if this order opened a position that was later closed
-                        if order.state == mt5.ORDER_STATE_FILLED and order.position_id > 0:
-                            stats["positions_opened"] += 1
-                            
-                            # Get the deals related to this position
-                            deals = mt5.history_deals_get(position=order.position_id)
-                            
-                            if deals:
-                                # Find the closing deal
-                                closing_deal = None
-                                for deal in deals:
-                                    if deal.entry == mt5.DEAL_ENTRY_OUT:
-                                        closing_deal = deal
-                                        break
-                                
-                                if closing_deal:
-                                    # This position was closed today
-                                    stats["positions_closed"] += 1
-                                    
-                                    # Calculate profit
-                                    profit = closing_deal.profit
-                                    stats["total_profit"] += profit
-                                    
-                                    # Determine win or loss
-                                    if profit > 0:
-                                        stats["wins"] += 1
-                                    else:
-                                        stats["losses"] += 1
-                                    
-                                    # Calculate pips
-                                    symbol_info = mt5.symbol_info(order.symbol)
-                                    if symbol_info:
-                                        point = symbol_info.point
-                                        digits = symbol_info.digits
-                                        
-                                        # For Forex, 1 pip is usually 0.0001 for 4-digit symbols, 0.00001 for 5-digit
-                                        if digits == 5 or digits == 3:  # 5-digit Forex or 3-digit indices/commodities
-                                            pip_size = point * 10
-                                        else:  # Standard 4-digit Forex or 2-digit indices
-                                            pip_size = point
-                                        
-                                        # Calculate price difference
-                                        if order.type == mt5.ORDER_TYPE_BUY or order.type == mt5.ORDER_TYPE_BUY_LIMIT:
-                                            pips = (closing_deal.price - order.price_open) / pip_size
-                                        else:
-                                            pips = (order.price_open - closing_deal.price) / pip_size
-                                        
-                                        stats["total_pips"] += pips
-                                    
-                                    # Add to closed positions list
-                                    closed_position = {
-                                        "position_id": order.position_id,
-                                        "symbol": order.symbol,
-                                        "type": "BUY" if order.type in [mt5.ORDER_TYPE_BUY, mt5.ORDER_TYPE_BUY_LIMIT] else "SELL",
-                                        "open_price": order.price_open,
-                                        "close_price": closing_deal.price,
-                                        "profit": profit,
-                                        "magic": order.magic
-                                    }
-                                    closed_positions.append(closed_position)
-            
-            # Check active positions
-            active_positions = mt5.positions_get()
-            if active_positions:
-                for position in active_positions:
-                    # Check if it's our signal-generated position
-                    if position.magic >= 123456 and position.magic < 123500:
-                        stats["active_positions"] += 1
-                        
-                        # Calculate unrealized profit for active positions
-                        symbol_info = mt5.symbol_info(position.symbol)
-                        if symbol_info:
-                            point = symbol_info.point
-                            digits = symbol_info.digits
-                            
-                            # For Forex, 1 pip is usually 0.0001 for 4-digit symbols, 0.00001 for 5-digit
-                            if digits == 5 or digits == 3:  # 5-digit Forex or 3-digit indices/commodities
-                                pip_size = point * 10
-                            else:  # Standard 4-digit Forex or 2-digit indices
-                                pip_size = point
-                            
-                            # Calculate pips for active positions
-                            if position.type == 0:  # BUY
-                                current_price = symbol_info.bid
-                                unrealized_pips = (current_price - position.price_open) / pip_size
-                            else:  # SELL
-                                current_price = symbol_info.ask
-                                unrealized_pips = (position.price_open - current_price) / pip_size
-                            
-                            # Find which signal this position belongs to
-                            found_signal = False
-                            for signal_id, signal_info in self.executed_signals.items():
-                                for order in signal_info.get("orders", []):
-                                    if order["order_id"] == position.ticket:
-                                        # Found the signal
-                                        found_signal = True
-                                        signal_detail = {
-                                            "signal_id": signal_id,
-                                            "symbol": position.symbol,
-                                            "direction": "BUY" if position.type == 0 else "SELL",
-                                            "entry_price": position.price_open,
-                                            "current_price": current_price,
-                                            "unrealized_profit": position.profit,
-                                            "unrealized_pips": unrealized_pips,
-                                            "status": "ACTIVE",
-                                            "lot_size": position.volume
-                                        }
-                                        stats["signal_details"].append(signal_detail)
-                                        break
-                                if found_signal:
-                                    break
-            
-            # Add closed position details to signal details
-            for position in closed_positions:
-                # Find which signal this position belongs to
-                for signal_id, signal_info in self.executed_signals.items():
-                    for order in signal_info.get("orders", []):
-                        if order["order_id"] == position["position_id"]:
-                            # Found the signal
-                            signal_detail = {
-                                "signal_id": signal_id,
-                                "symbol": position["symbol"],
-                                "direction": position["type"],
-                                "entry_price": position["open_price"],
-                                "exit_price": position["close_price"],
-                                "profit": position["profit"],
-                                "status": "WIN" if position["profit"] > 0 else "LOSS"
-                            }
-                            stats["signal_details"].append(signal_detail)
-                            break
-            
-            # Calculate win rate
-            total_closed = stats["wins"] + stats["losses"]
-            if total_closed > 0:
-                stats["win_rate"] = (stats["wins"] / total_closed) * 100
+            from_timestamp = int(datetime(today.year, today.month, today.day).timestamp())
+            to_timestamp = int(datetime(today.year, today.month, today.day, 23, 59, 59).timestamp())
             
-            # Calculate return percentage
-            if start_balance > 0:
-                stats["return_percentage"] = (stats["total_profit"] / start_balance) * 100
+            deals, positions, symbols = self._load_stats_inputs(from_timestamp, to_timestamp)
             
-            # Convert symbols_traded to list for serialization
-            stats["symbols_traded"] = list(stats["symbols_traded"])
+            stats = mt5_trade_stats.daily_stats(
+                today_str, self.executed_signals, deals, positions, symbols, account_info.balance
+            )
             
             return {"success": True, "stats": stats}
         
@@ -1837,188 +1546,13 @@ class MT5SignalExecutor:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days_back)
             
-            # Initialize stats structure
-            signal_breakdown = {}
-            total_signals = 0
-            total_profit = 0.0
+            deals, positions, symbols = self._load_stats_inputs(
+                int(start_date.timestamp()), int(end_date.timestamp())
+            )
             
-            # Process each executed signal
-            for signal_id, signal_info in self.executed_signals.items():
-                try:
-                    # Parse execution time
-                    execution_time_str = signal_info.get("execution_time", "")
-                    if not execution_time_str:
-                        continue
-                    
-                    execution_time = datetime.strptime(execution_time_str, "%Y-%m-%d %H:%M:%S")
-                    
-                    # Skip if outside date range
-                    if execution_time < start_date:
-                        continue
-                    
-                    total_signals += 1
-                    
-                    # Extract signal details
-                    symbol = signal_info.get("symbol", "UNKNOWN")
-                    direction = signal_info.get("direction", "UNKNOWN")
-                    strategy = signal_info.get("strategy", "UNKNOWN")
-                    orders = signal_info.get("orders", [])
-                    
-                    # Create signal key for grouping
-                    signal_key = f"{strategy}_{symbol}_{direction}"
-                    
-                    # Initialize signal stats if not exists
-                    if signal_key not in signal_breakdown:
-                        signal_breakdown[signal_key] = {
-                            'signal_id': signal_id,
-                            'strategy': strategy,
-                            'symbol': symbol,
-                            'direction': direction,
-                            'total_trades': 0,
-                            'wins': 0,
-                            'losses': 0,
-                            'active': 0,
-                            'total_profit': 0.0,
-                            'total_pips': 0.0,
-                            'orders_placed': len(orders),
-                            'execution_time': execution_time_str,
-                            'entry_prices': [],
-                            'trade_details': []
-                        }
-                    
-                    current_signal = signal_breakdown[signal_key]
-                    
-                    # Process each order in the signal
-                    for order in orders:
-                        order_id = order["order_id"]
-                        entry_price = order["entry_price"]
-                        current_signal['entry_prices'].append(entry_price)
-                        
-                        # Check if position still exists (active)
-                        position = None
-                        positions = mt5.positions_get(ticket=order_id)
-                        if positions:
-                            position = positions[0]
-                        
-                        if position:
-                            # Position is still active
-                            current_signal['active'] += 1
-                            
-                            # Calculate unrealized P&L
-                            unrealized_profit = position.profit
-                            current_signal['total_profit'] += unrealized_profit
-                            
-                            # Calculate unrealized pips
-                            symbol_info = mt5.symbol_info(symbol)
-                            if symbol_info:
-                                point = symbol_info.point
-                                digits = symbol_info.digits
-                                pip_size = point * 10 if digits in [5, 3] else point
-                                
-                                current_price = symbol_info.bid if direction == "BUY" else symbol_info.ask
-                                if direction == "BUY":
-                                    pips = (current_price - entry_price) / pip_size
-                                else:
-                                    pips = (entry_price - current_price) / pip_size
-                                
-                                current_signal['total_pips'] += pips
-                            
-                            current_signal['trade_details'].append({
-                                'order_id': order_id,
-                                'status': 'ACTIVE',
-                                'entry_price': entry_price,
-                                'current_profit': unrealized_profit,
-                                'pips': pips if 'pips' in locals() else 0
-                            })
-                        
-                        else:
-                            # Position is closed, check history
-                            from_timestamp = int(start_date.timestamp())
-                            to_timestamp = int(end_date.timestamp())
-                            
-                            # Look for closed deals
-                            deals = mt5.history_deals_get(from_timestamp, to_timestamp)
-                            
-                            if deals:
-                                # Find deals related to this order
-                                for deal in deals:
-                                    if deal.magic >= 123456 and deal.magic < 123500:  # Our magic number range
-                                        if deal.entry == mt5.DEAL_ENTRY_OUT:  # Closing deal
-                                            current_signal['total_trades'] += 1
-                                            
-                                            profit = deal.profit
-                                            current_signal['total_profit'] += profit
-                                            total_profit += profit
-                                            
-                                            # Determine win/loss
-                                            if profit > 0:
-                                                current_signal['wins'] += 1
-                                            else:
-                                                current_signal['losses'] += 1
-                                            
-                                            # Calculate pips for closed position  
-                                            symbol_info = mt5.symbol_info(symbol)
-                                            if symbol_info:
-                                                point = symbol_info.point
-                                                digits = symbol_info.digits
-                                                pip_size = point * 10 if digits in [5, 3] else point
-                                                
-                                                # Get opening deal to calculate pips
-                                                opening_deals = mt5.history_deals_get(position=deal.position_id)
-                                                if opening_deals:
-                                                    opening_deal = None
-                                                    for d in opening_deals:
-                                                        if d.entry == mt5.DEAL_ENTRY_IN:
-                                                            opening_deal = d
-                                                            break
-                                                    
-                                                    if opening_deal:
-                                                        if opening_deal.type == mt5.DEAL_TYPE_BUY:
-                                                            pips = (deal.price - opening_deal.price) / pip_size
-                                                        else:
-                                                            pips = (opening_deal.price - deal.price) / pip_size
-                                                        
-                                                        current_signal['total_pips'] += pips
-                                            
-                                            current_signal['trade_details'].append({
-                                                'order_id': order_id,
-                                                'status': 'WIN' if profit > 0 else 'LOSS',
-                                                'entry_price': entry_price,
-                                                'exit_price': deal.price,
-                                                'profit': profit,
-                                                'pips': pips if 'pips' in locals() else 0
-                                            })
-                                            break
-                
-                except Exception as e:
-                    self.logger.error(f"Error processing signal {signal_id}: {e}")
-                    continue
-            
-            # Calculate final statistics for each signal
-            final_breakdown = {}
-            for signal_key, stats in signal_breakdown.items():
-                total_closed = stats['wins'] + stats['losses']
-                
-                final_breakdown[signal_key] = {
-                    'signal_id': stats['signal_id'],
-                    'strategy': stats['strategy'],
-                    'symbol': stats['symbol'],
-                    'direction': stats['direction'],
-                    'execution_time': stats['execution_time'],
-                    'orders_placed': stats['orders_placed'],
-                    'total_trades': total_closed,
-                    'active_positions': stats['active'],
-                    'wins': stats['wins'],
-                    'losses': stats['losses'],
-                    'win_rate': (stats['wins'] / total_closed * 100) if total_closed > 0 else 0,
-                    'total_profit': stats['total_profit'],
-                    'avg_profit_per_trade': stats['total_profit'] / total_closed if total_closed > 0 else 0,
-                    'total_pips': stats['total_pips'],
-                    'avg_pips_per_trade': stats['total_pips'] / total_closed if total_closed > 0 else 0,
-                    'entry_prices': stats['entry_prices'],
-                    'trade_details': stats['trade_details'],
-                    'profit_factor': self._calculate_profit_factor(stats['trade_details'])
-                }
+            total_signals, total_profit, final_breakdown = mt5_trade_stats.signal_breakdown(
+                self.executed_signals, deals, positions, symbols, start_date
+            )
             
             return {
                 "success": True,
@@ -3,10 +3,14 @@ import polars as pl
 import numpy as np
 import talib
 import logging
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
 
 
-from tradingSignals.algorithms.hawkes import calculate_hawkes_signal
+from tradingSignals.algorithms.hawkes import HawkesStream
+from tradingSignals.mt5_Fn.bar_cache import BarCache
+from tradingSignals.mt5_Fn.signal_record import TradingSignal, SIGNAL_MAGIC_BASE, SIGNAL_MAGIC_MAX
 
 logging.basicConfig(
     level=logging.INFO,
@@ -73,10 +77,28 @@ class MT5SignalGenerator:
         self.signal_history = {}
         self.current_signals = {}  # Track signal states
         
+        # Incremental Hawkes state per (symbol, timeframe), fed only with new bars
+        self.hawkes_streams = {}
+        self._stream_locks = {}
+        
+        # Guards signal_history, current_signals and the stream maps across scan workers
+        self._state_lock = threading.Lock()
+        
+        # Bars shared by every strategy that scans the same (symbol, timeframe)
+        self.bar_cache = BarCache()
+        
         # Signal frequency control parameters
         self.max_signals_per_hour = 5   
         self.max_signals_per_day = 30    
         self.min_minutes_between_signals = 5
+        
+        # Scan engine: (strategy, symbol, timeframe) combinations run on a bounded
+        # worker pool; anything still running at the deadline is left out of the cycle
+        self.max_scan_workers = 4
+        self.scan_deadline_seconds = 20
+        self._scan_executor = None
+        self._running = set()  # combinations still evaluating, possibly past an earlier deadline
+        self._scan_local = threading.local()
     
     def initialize_mt5(self, username=None, password=None, server=None):
         """Connect to MetaTrader5 terminal with detailed logging"""
@@ -141,11 +163,19 @@ class MT5SignalGenerator:
             return False
     
     def get_price_data(self, symbol, timeframe, bars=300):
-        """Fetch historical price data from MT5 and convert to Polars DataFrame"""
+        """Fetch historical price data, served from the shared bar cache when it is fresh"""
+        if getattr(self._scan_local, "cached_only", False):
+            # Scan workers never call MT5; they only read bars prefetched this cycle
+            return self.bar_cache.peek(symbol, timeframe, bars)
+        
         if not self.connected:
             if not self.initialize_mt5():
                 return None
         
+        return self.bar_cache.get(symbol, timeframe, bars, self.fetch_price_data)
+    
+    def fetch_price_data(self, symbol, timeframe, bars=300):
+        """Fetch historical price data from MT5 and convert to Polars DataFrame"""
         try:
             # Adjust symbol format if needed (some brokers use different conventions)
             mt5_symbol = symbol
@@ -217,11 +247,15 @@ class MT5SignalGenerator:
         elif curr_ma_diff < 0:
             current_signal = -1  # SELL signal
         
-        # Get previous signal state - initialize if doesn't exist
-        if symbol not in self.current_signals:
-            self.current_signals[symbol] = {"signal": 0, "timestamp": datetime.now()}
-        
-        prev_signal = self.current_signals[symbol]["signal"]
+        # Get previous signal state and store the current one
+        with self._state_lock:
+            prev_state = self.current_signals.get(symbol)
+            self.current_signals[symbol] = {
+                "signal": current_signal,
+                "timestamp": datetime.now()
+            }
+        # check_exit_signals stores the bare signal value
+        prev_signal = prev_state["signal"] if isinstance(prev_state, dict) else (prev_state or 0)
         
         # Check for signal state change (new signal)
         new_signal = False
@@ -236,12 +270,6 @@ class MT5SignalGenerator:
             direction = "SELL"
             self.logger.info(f"MA Crossover: New SELL signal for {symbol} (prev: {prev_signal}, curr: {current_signal})")
         
-        # Update current signal state
-        self.current_signals[symbol] = {
-            "signal": current_signal,
-            "timestamp": datetime.now()
-        }
-        
         # If no new signal, return None (not a dictionary)
         if not new_signal:
             self.logger.debug(f"MA Crossover: No new signal for {symbol} (current: {current_signal}, prev: {prev_signal})")
@@ -321,13 +349,16 @@ class MT5SignalGenerator:
         
         active_symbols = set()
         for pos in positions:
-            if 123456 <= pos.magic < 123500:  # Our positions
+            if SIGNAL_MAGIC_BASE <= pos.magic < SIGNAL_MAGIC_MAX:  # Our positions
                 active_symbols.add(pos.symbol)
         
         # Check each active symbol
         for symbol in active_symbols:
             current_signal = self.get_current_signal_state(symbol)
-            prev_signal = self.current_signals.get(symbol, 0)
+            with self._state_lock:
+                prev_signal = self.current_signals.get(symbol, 0)
+                # Update stored signal
+                self.current_signals[symbol] = current_signal
             
             # If signal flipped from buy to sell or vice versa
             if (prev_signal == 1 and current_signal == -1) or (prev_signal == -1 and current_signal == 1):
@@ -335,9 +366,6 @@ class MT5SignalGenerator:
                     "symbol": symbol,
                     "exit_reason": "opposite_signal"
                 })
-            
-            # Update stored signal
-            self.current_signals[symbol] = current_signal
         
         return exit_signals
     
@@ -411,33 +439,57 @@ class MT5SignalGenerator:
             
             # Get more bars for the Hawkes strategy since it needs longer lookbook
             required_bars = max(atr_lookback, quantile_lookback) * 2
-            self.logger.info(f"Requesting {required_bars} bars for {symbol}")
             
+            # Served from the bar cache, which only pulls bars closed since its last refresh
             df = self.get_price_data(symbol, timeframe, bars=required_bars)
             if df is None:
                 self.logger.warning(f"Failed to get price data for {symbol}")
                 return None
-                
-            if df.height < max(atr_lookback, quantile_lookback):
-                self.logger.warning(f"Insufficient data for {symbol}: got {df.height}, need {max(atr_lookback, quantile_lookback)}")
-                return None
             
-            self.logger.info(f"Got {df.height} bars for {symbol}, proceeding with Hawkes calculation")
+            stream_key = (symbol, timeframe)
+            with self._state_lock:
+                stream_lock = self._stream_locks.setdefault(stream_key, threading.Lock())
             
-            # Calculate Hawkes signal
-            signal, hawkes_values, q05, q95 = calculate_hawkes_signal(
-                df, atr_lookback, kappa, quantile_lookback
-            )
+            # One evaluation at a time may fold bars into a stream
+            with stream_lock:
+                stream = self.hawkes_streams.get(stream_key)
+                if stream is not None and (stream.atr_lookback, stream.kappa, stream.quantile_lookback) != (atr_lookback, kappa, quantile_lookback):
+                    stream = None
+                
+                if stream is not None and df["time"][0] > stream.last_time:
+                    self.logger.info(f"Gap since last Hawkes update for {symbol}, rebuilding state")
+                    stream = None
+                
+                if stream is None:
+                    if df.height < max(atr_lookback, quantile_lookback):
+                        self.logger.warning(f"Insufficient data for {symbol}: got {df.height}, need {max(atr_lookback, quantile_lookback)}")
+                        return None
+                    
+                    stream = HawkesStream(atr_lookback, kappa, quantile_lookback)
+                    self.hawkes_streams[stream_key] = stream
+                
+                # Fold only the bars closed since the last update; the last bar is still forming
+                closed = df.head(df.height - 1)
+                if stream.last_time is not None:
+                    closed = closed.filter(pl.col("time") > stream.last_time)
+                applied = stream.update_frame(closed)
+                self.logger.info(f"Applied {applied} new bars for {symbol} ({stream.bars_seen} total), proceeding with Hawkes calculation")
+                
+                # Calculate Hawkes signal
+                forming_bar = df.tail(1)
+                signal, hawkes_value, q05, q95 = stream.evaluate(
+                    forming_bar["high"][0], forming_bar["low"][0], forming_bar["close"][0]
+                )
             
-            self.logger.info(f"Hawkes calculation complete for {symbol}: signal={signal}, hawkes_values={hawkes_values is not None}, q05={q05}, q95={q95}")
+            self.logger.info(f"Hawkes calculation complete for {symbol}: signal={signal}, hawkes_value={hawkes_value}, q05={q05}, q95={q95}")
             
-            if signal == 0 or hawkes_values is None:
+            if signal == 0 or hawkes_value is None:
                 self.logger.info(f"No Hawkes signal generated for {symbol}")
                 return None
                 
             # Include Hawkes-specific values in additional_data
             additional_data = {
-                "hawkes_vol": float(hawkes_values[-1]) if hawkes_values is not None else None,
+                "hawkes_vol": float(hawkes_value),
                 "q05": float(q05) if q05 is not None else None,
                 "q95": float(q95) if q95 is not None else None
             }
@@ -456,12 +508,16 @@ class MT5SignalGenerator:
             import traceback
             self.logger.error(f"Full traceback: {traceback.format_exc()}")
             return None
-    
-    
+
     ## ------------------------------------------------------- ##
     ## ----------------------------------------- ## 
     def format_signal(self, symbol, direction, price_data, strategy_name="", additional_data=None):
-        """Format the signal according to our template with enhanced styling and strategy identification"""
+        """
+        Build the signal record and render it with our template (enhanced styling and strategy identification)
+        
+        Returns a TradingSignal whose `text` is the channel message; its fields carry
+        the same levels as the message, so consumers never need to parse the HTML.
+        """
         # Get current price info
         current_price = price_data.tail(1)["close"][0]
         
@@ -570,12 +626,15 @@ class MT5SignalGenerator:
         
         # Add strategy-specific details if provided
         strategy_details = ""
+        extras = {}
         if strategy_name == "VOL_HAWKES" and additional_data:
             hawkes_vol = additional_data.get("hawkes_vol")
             q05 = additional_data.get("q05")
             q95 = additional_data.get("q95")
             
             if hawkes_vol is not None and q05 is not None and q95 is not None:
+                extras = {"hawkes_vol": float(hawkes_vol), "q05": float(q05), "q95": float(q95)}
+                
                 # Format numbers to 3 decimal places
                 hawkes_vol_str = f"{hawkes_vol:.3f}"
                 q05_str = f"{q05:.3f}"
@@ -589,7 +648,7 @@ class MT5SignalGenerator:
     """
         
         # Format the signal with enhanced styling and strategy identification
-        signal = f"""
+        signal_text = f"""
     🔔 <b>VFX SIGNAL</b> 🔔
 
     <b>Strategy:</b> {strategy_display_name}
@@ -618,22 +677,112 @@ class MT5SignalGenerator:
         signal_key = f"{symbol}_{direction}_{datetime.now().strftime('%Y%m%d')}"
         
         # Add strategy name to the signal history
-        self.signal_history[signal_key] = {
-            'timestamp': datetime.now(),
-            'symbol': symbol,
-            'direction': direction,
-            'entry_low': entry_low,
-            'entry_high': entry_high,
-            'strategy': strategy_name  # Include strategy name in history
-        }
+        with self._state_lock:
+            self.signal_history[signal_key] = {
+                'timestamp': datetime.now(),
+                'symbol': symbol,
+                'direction': direction,
+                'entry_low': entry_low,
+                'entry_high': entry_high,
+                'strategy': strategy_name  # Include strategy name in history
+            }
         
-        return signal
+        return TradingSignal(
+            symbol=symbol,
+            direction=direction,
+            strategy=strategy_name,
+            entry_range_low=entry_low,
+            entry_range_high=entry_high,
+            stop_range_low=sl_low,
+            stop_range_high=sl_high,
+            take_profits=(tp1, tp2, tp3),
+            text=signal_text,
+            extras=extras
+        )
     
-    def generate_signal(self):
-        """Run all strategies with fair rotation and return the best valid signal"""
-        import random
-        from datetime import datetime
+    def _get_scan_executor(self):
+        """Lazily create the worker pool used by generate_signal"""
+        if self._scan_executor is None:
+            self._scan_executor = ThreadPoolExecutor(
+                max_workers=self.max_scan_workers,
+                thread_name_prefix="signal-scan"
+            )
+        return self._scan_executor
+    
+    def evaluate_strategy(self, strategy_name, symbol, timeframe):
+        """Run one strategy on one symbol/timeframe and return a candidate signal dict or None"""
+        config = self.strategies[strategy_name]
+        
+        try:
+            signal = None
+            
+            # Choose strategy based on name with enhanced error handling
+            # if strategy_name == 'ma_crossover':
+            #     signal = self.calculate_ma_crossover(
+            #         symbol, 
+            #         timeframe, 
+            #         config['params']['fast_length'],
+            #         config['params']['slow_length']
+            #     )
+            if strategy_name == 'rsi_reversal':
+                signal = self.calculate_rsi_reversal(
+                    symbol, 
+                    timeframe,
+                    config['params']['rsi_length'],
+                    config['params']['overbought'],
+                    config['params']['oversold']
+                )
+            elif strategy_name == 'hawkes_volatility':
+                self.logger.info(f"Attempting Hawkes calculation for {symbol}")
+                signal = self.calculate_hawkes_volatility(
+                    symbol,
+                    timeframe,
+                    config['params']['atr_lookback'],
+                    config['params']['kappa'],
+                    config['params']['quantile_lookback']
+                )
+            # elif strategy_name == 'support_resistance':
+            #     signal = self.calculate_support_resistance(
+            #         symbol, 
+            #         timeframe,
+            #         config['params']['lookback'],
+            #         config['params']['threshold']
+            #     )
+                
+                # Enhanced logging for Hawkes strategy
+                if signal:
+                    self.logger.info(f"✅ Hawkes strategy generated signal for {symbol}")
+                else:
+                    self.logger.info(f"❌ Hawkes strategy returned None for {symbol}")
+            
+            # If valid signal found, return it as a candidate
+            if signal:
+                self.logger.info(f"Generated {strategy_name} signal for {symbol}")
+                return {
+                    'signal': signal,
+                    'strategy': strategy_name,
+                    'symbol': symbol,
+                    'priority': self.get_strategy_priority(strategy_name)
+                }
+                
+        except Exception as e:
+            self.logger.error(f"Error in {strategy_name} for {symbol}: {e}")
         
+        return None
+    
+    def bar_requirements(self, strategy_name, timeframe):
+        """(timeframe, bars) series a strategy reads for one symbol, prefetched before each scan"""
+        params = self.strategies[strategy_name]['params']
+        if strategy_name == 'rsi_reversal':
+            return [(timeframe, params['rsi_length'] * 3)]
+        if strategy_name == 'hawkes_volatility':
+            return [(timeframe, max(params['atr_lookback'], params['quantile_lookback']) * 2)]
+        # ma_crossover and support_resistance are disabled in evaluate_strategy;
+        # add their series here when re-enabling them
+        return []
+    
+    def scan_combinations(self):
+        """(strategy, symbol, timeframe) combinations to evaluate this cycle, in fair rotation order"""
         # Strategy rotation to ensure all strategies get equal chances
         strategy_list = list(self.strategies.keys())
         
@@ -647,75 +796,90 @@ class MT5SignalGenerator:
         
         self.logger.info(f"Strategy execution order this cycle: {rotated_strategies}")
         
-        all_signals = []  # Collect all valid signals instead of returning first
-        
+        combinations = []
         for strategy_name in rotated_strategies:
             config = self.strategies[strategy_name]
-            self.logger.info(f"Checking strategy: {strategy_name}")
             
             for symbol in config['symbols']:
                 for timeframe in config['timeframes']:
-                    try:
-                        # Skip if we've already sent a similar signal today
-                        if self.check_duplicate_signal(symbol, "BUY") and self.check_duplicate_signal(symbol, "SELL"):
-                            self.logger.info(f"Skipping {symbol} - duplicate signal check failed")
-                            continue
-                        
-                        signal = None
-                        
-                        # Choose strategy based on name with enhanced error handling
-                        # if strategy_name == 'ma_crossover':
-                        #     signal = self.calculate_ma_crossover(
-                        #         symbol, 
-                        #         timeframe, 
-                        #         config['params']['fast_length'],
-                        #         config['params']['slow_length']
-                        #     )
-                        if strategy_name == 'rsi_reversal':
-                            signal = self.calculate_rsi_reversal(
-                                symbol, 
-                                timeframe,
-                                config['params']['rsi_length'],
-                                config['params']['overbought'],
-                                config['params']['oversold']
-                            )
-                        elif strategy_name == 'hawkes_volatility':
-                            self.logger.info(f"Attempting Hawkes calculation for {symbol}")
-                            signal = self.calculate_hawkes_volatility(
-                                symbol,
-                                timeframe,
-                                config['params']['atr_lookback'],
-                                config['params']['kappa'],
-                                config['params']['quantile_lookback']
-                            )
-                        # elif strategy_name == 'support_resistance':
-                        #     signal = self.calculate_support_resistance(
-                        #         symbol, 
-                        #         timeframe,
-                        #         config['params']['lookback'],
-                        #         config['params']['threshold']
-                        #     )
-                            
-                            # Enhanced logging for Hawkes strategy
-                            if signal:
-                                self.logger.info(f"✅ Hawkes strategy generated signal for {symbol}")
-                            else:
-                                self.logger.info(f"❌ Hawkes strategy returned None for {symbol}")
-                        
-                        # If valid signal found, add to collection
-                        if signal:
-                            signal_info = {
-                                'signal': signal,
-                                'strategy': strategy_name,
-                                'symbol': symbol,
-                                'priority': self.get_strategy_priority(strategy_name)
-                            }
-                            all_signals.append(signal_info)
-                            self.logger.info(f"Generated {strategy_name} signal for {symbol}")
-                            
-                    except Exception as e:
-                        self.logger.error(f"Error in {strategy_name} for {symbol}: {e}")
+                    # Skip if we've already sent a similar signal today
+                    if self.check_duplicate_signal(symbol, "BUY") and self.check_duplicate_signal(symbol, "SELL"):
+                        self.logger.info(f"Skipping {symbol} - duplicate signal check failed")
                         continue
+                    combinations.append((strategy_name, symbol, timeframe))
+        return combinations
+    
+    def prefetch_bars(self, combinations=None):
+        """
+        Refresh every series the scan reads, from the calling thread
+        
+        This is the only part of a scan that talks to MT5; run it on the thread
+        that owns the terminal (the MT5 gateway) before generate_signal(prefetched=True).
+        """
+        # Every (symbol, timeframe) is refreshed at most once per cycle
+        self.bar_cache.new_cycle()
+        
+        series = {}
+        for strategy_name, symbol, timeframe in combinations or self.scan_combinations():
+            for series_timeframe, bars in self.bar_requirements(strategy_name, timeframe):
+                key = (symbol, series_timeframe)
+                series[key] = max(series.get(key, 0), bars)
+        
+        for (symbol, timeframe), bars in series.items():
+            self.get_price_data(symbol, timeframe, bars)
+        return len(series)
+    
+    def _scan_worker(self, combination):
+        """Evaluate one combination on a scan worker, from prefetched bars only"""
+        self._scan_local.cached_only = True
+        try:
+            return self.evaluate_strategy(*combination)
+        finally:
+            self._scan_local.cached_only = False
+            with self._state_lock:
+                self._running.discard(combination)
+    
+    def generate_signal(self, prefetched=False):
+        """
+        Run all strategies with fair rotation and return the best valid signal (a TradingSignal) or None
+        
+        With prefetched=False the bars are refreshed from MT5 on the calling thread
+        first; scan workers only evaluate cached bars and never call MT5.
+        """
+        combinations = self.scan_combinations()
+        if not prefetched:
+            self.prefetch_bars(combinations)
+        
+        # A combination still running from an earlier cycle (past its deadline) is skipped
+        with self._state_lock:
+            busy = [combination for combination in combinations if combination in self._running]
+            combinations = [combination for combination in combinations if combination not in self._running]
+            self._running.update(combinations)
+        if busy:
+            self.logger.warning(f"{len(busy)} evaluations still running from an earlier cycle, skipped: {busy}")
+        
+        # Evaluate all combinations concurrently, bounded by the worker pool and deadline
+        executor = self._get_scan_executor()
+        futures = [executor.submit(self._scan_worker, combination) for combination in combinations]
+        done, not_done = wait(futures, timeout=self.scan_deadline_seconds)
+        
+        if not_done:
+            for combination, future in zip(combinations, futures):
+                if future in not_done and future.cancel():
+                    # Never started, so _scan_worker won't clear it
+                    with self._state_lock:
+                        self._running.discard(combination)
+            self.logger.warning(f"Scan deadline of {self.scan_deadline_seconds}s reached: {len(not_done)}/{len(futures)} evaluations skipped this cycle")
+        
+        # Collect in rotation order so equal priorities keep the fair ordering
+        all_signals = []
+        for future in futures:
+            if future in done and not future.cancelled():
+                signal_info = future.result()
+                if signal_info:
+                    all_signals.append(signal_info)
+        
+        self.logger.info(f"Bar cache stats: {self.bar_cache.stats()}")
         
         # If we have multiple signals, prioritize them
         if all_signals:
@@ -746,8 +910,10 @@ class MT5SignalGenerator:
         signal_key = f"{symbol}_{direction}_{date_str}"
         
         # Check if this exact signal has been sent today
-        if signal_key in self.signal_history:
-            last_time = self.signal_history[signal_key]['timestamp']
+        with self._state_lock:
+            entry = self.signal_history.get(signal_key)
+        if entry is not None:
+            last_time = entry['timestamp']
             hours_ago = (datetime.now() - last_time).total_seconds() / 3600
             
             # If sent less than 8 hours ago, consider it a duplicate
@@ -758,5 +924,8 @@ class MT5SignalGenerator:
         
     def cleanup(self):
         """Clean up MT5 connection when done"""
+        if self._scan_executor is not None:
+            self._scan_executor.shutdown(wait=False, cancel_futures=True)
+            self._scan_executor = None
         mt5.shutdown()
         self.connected = False
\ No newline at end of file
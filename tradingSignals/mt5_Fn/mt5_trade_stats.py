@@ -0,0 +1,428 @@
+"""
+Trade statistics computed from bulk MT5 history
+
+The executor makes a handful of terminal calls per report (one
+history_deals_get(from, to), one positions_get(), one symbol_info per distinct
+symbol); everything else is joins and aggregations over Polars frames. Inputs
+are plain records, so the engine can be run offline against recorded fixtures.
+"""
+import os
+import sys
+import json
+import polars as pl
+
+from tradingSignals.mt5_Fn.signal_record import SIGNAL_MAGIC_BASE, SIGNAL_MAGIC_MAX
+
+# MetaTrader5 deal constants (kept here so the engine runs without a terminal)
+DEAL_TYPE_BUY = 0
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+POSITION_TYPE_BUY = 0
+
+DEAL_SCHEMA = {
+    "ticket": pl.Int64,
+    "order": pl.Int64,
+    "position_id": pl.Int64,
+    "time": pl.Int64,
+    "type": pl.Int64,
+    "entry": pl.Int64,
+    "magic": pl.Int64,
+    "symbol": pl.Utf8,
+    "price": pl.Float64,
+    "volume": pl.Float64,
+    "profit": pl.Float64
+}
+
+POSITION_SCHEMA = {
+    "ticket": pl.Int64,
+    "symbol": pl.Utf8,
+    "type": pl.Int64,
+    "magic": pl.Int64,
+    "price_open": pl.Float64,
+    "volume": pl.Float64,
+    "profit": pl.Float64
+}
+
+SYMBOL_SCHEMA = {
+    "symbol": pl.Utf8,
+    "pip_size": pl.Float64,
+    "bid": pl.Float64,
+    "ask": pl.Float64
+}
+
+ORDER_SCHEMA = {
+    "signal_id": pl.Utf8,
+    "strategy": pl.Utf8,
+    "symbol": pl.Utf8,
+    "direction": pl.Utf8,
+    "execution_time": pl.Utf8,
+    "order_id": pl.Int64,
+    "entry_price": pl.Float64
+}
+
+## --------------------------------------------------------------------------------------- ##
+## Frames
+## --------------------------------------------------------------------------------------- ##
+
+
+def _records(items):
+    """MT5 named tuples or dicts -> list of dicts."""
+    return [item._asdict() if hasattr(item, "_asdict") else dict(item) for item in items or []]
+
+
+def _frame(items, schema):
+    rows = _records(items)
+    if not rows:
+        return pl.DataFrame(schema=schema)
+    return pl.DataFrame(rows).select([pl.col(name).cast(dtype) for name, dtype in schema.items()])
+
+
+def deals_frame(deals):
+    """Frame of history deals (as returned by mt5.history_deals_get)."""
+    return _frame(deals, DEAL_SCHEMA)
+
+
+def positions_frame(positions):
+    """Frame of open positions (as returned by mt5.positions_get)."""
+    return _frame(positions, POSITION_SCHEMA)
+
+
+def pip_size(point, digits):
+    """Pip size for a symbol: 10 points on 5/3-digit quotes, otherwise one point."""
+    return point * 10 if digits in (5, 3) else point
+
+
+def symbols_frame(symbol_infos):
+    """Frame of pip size and current bid/ask per symbol from {symbol: mt5.symbol_info}."""
+    rows = [
+        {"symbol": symbol, "pip_size": pip_size(info.point, info.digits), "bid": info.bid, "ask": info.ask}
+        for symbol, info in symbol_infos.items() if info
+    ]
+    return pl.DataFrame(rows, schema=SYMBOL_SCHEMA)
+
+
+def signal_orders_frame(executed_signals):
+    """One row per order placed for an executed signal."""
+    rows = []
+    for signal_id, signal_info in executed_signals.items():
+        for order in signal_info.get("orders", []):
+            rows.append({
+                "signal_id": signal_id,
+                "strategy": signal_info.get("strategy", "UNKNOWN"),
+                "symbol": signal_info.get("symbol", "UNKNOWN"),
+                "direction": signal_info.get("direction", "UNKNOWN"),
+                "execution_time": signal_info.get("execution_time", ""),
+                "order_id": order["order_id"],
+                "entry_price": order["entry_price"]
+            })
+    return pl.DataFrame(rows, schema=ORDER_SCHEMA)
+
+
+def _signal_magic():
+    return pl.col("magic").is_between(SIGNAL_MAGIC_BASE, SIGNAL_MAGIC_MAX, closed="left")
+
+## --------------------------------------------------------------------------------------- ##
+## Trades
+## --------------------------------------------------------------------------------------- ##
+
+
+def closed_trades(deals, orders, symbols):
+    """
+    One row per signal position closed within the deal range
+
+    Closing (OUT) deals are summed per position and joined to the opening (IN)
+    deal and to the signal order that opened the position (position_id is the
+    ticket of the opening order). If the opening deal is older than the range,
+    the signal's entry price and direction are used instead.
+    """
+    opens = (
+        deals.filter(pl.col("entry") == DEAL_ENTRY_IN)
+        .sort("time")
+        .group_by("position_id")
+        .agg([
+            pl.col("price").first().alias("open_price"),
+            pl.col("type").first().alias("open_type")
+        ])
+    )
+
+    closes = (
+        deals.filter(_signal_magic() & (pl.col("entry") == DEAL_ENTRY_OUT))
+        .sort("time")
+        .group_by("position_id")
+        .agg([
+            pl.col("symbol").first(),
+            pl.col("price").last().alias("close_price"),
+            pl.col("profit").sum(),
+            pl.col("time").last().alias("close_time")
+        ])
+    )
+
+    trades = (
+        closes.join(opens, on="position_id", how="left")
+        .join(orders, left_on="position_id", right_on="order_id", how="left")
+        .join(symbols.select(["symbol", "pip_size"]), on="symbol", how="left")
+    )
+
+    side = (
+        pl.when(pl.col("open_type").is_not_null())
+        .then(pl.when(pl.col("open_type") == DEAL_TYPE_BUY).then(1.0).otherwise(-1.0))
+        .otherwise(pl.when(pl.col("direction") == "BUY").then(1.0).otherwise(-1.0))
+    )
+    open_price = pl.coalesce([pl.col("open_price"), pl.col("entry_price")])
+
+    return trades.with_columns([
+        open_price.alias("open_price"),
+        pl.when(side > 0).then(pl.lit("BUY")).otherwise(pl.lit("SELL")).alias("type"),
+        ((pl.col("close_price") - open_price) * side / pl.col("pip_size")).alias("pips"),
+        pl.when(pl.col("profit") > 0).then(pl.lit("WIN")).otherwise(pl.lit("LOSS")).alias("status")
+    ]).sort("close_time")
+
+
+def open_trades(positions, symbols):
+    """Signal positions still open, with unrealized pips at the current bid/ask."""
+    buy = pl.col("type") == POSITION_TYPE_BUY
+    current_price = pl.when(buy).then(pl.col("bid")).otherwise(pl.col("ask"))
+    side = pl.when(buy).then(1.0).otherwise(-1.0)
+
+    return (
+        positions.filter(_signal_magic())
+        .join(symbols, on="symbol", how="left")
+        .with_columns([
+            current_price.alias("current_price"),
+            pl.when(buy).then(pl.lit("BUY")).otherwise(pl.lit("SELL")).alias("direction"),
+            ((current_price - pl.col("price_open")) * side / pl.col("pip_size")).alias("unrealized_pips")
+        ])
+    )
+
+
+def profit_factor(profits):
+    """Gross profit over gross loss of closed trades."""
+    gross_profit = sum(p for p in profits if p > 0)
+    gross_loss = abs(sum(p for p in profits if p < 0))
+    if gross_loss == 0:
+        return float('inf') if gross_profit > 0 else 0
+    return gross_profit / gross_loss
+
+## --------------------------------------------------------------------------------------- ##
+## Reports
+## --------------------------------------------------------------------------------------- ##
+
+
+def daily_stats(date_str, executed_signals, deals, positions, symbols, start_balance):
+    """
+    Statistics for one day in the layout of MT5SignalExecutor.generate_daily_stats
+
+    Parameters:
+    -----------
+    deals, positions, symbols: pl.DataFrame
+        From deals_frame, positions_frame and symbols_frame
+    """
+    orders = signal_orders_frame(executed_signals)
+    trades = closed_trades(deals, orders, symbols)
+    active = open_trades(positions, symbols)
+
+    today_signals = [
+        signal_info for signal_info in executed_signals.values()
+        if signal_info.get("execution_time", "").startswith(date_str)
+    ]
+
+    wins = trades.filter(pl.col("profit") > 0).height
+    total_profit = float(trades["profit"].sum() or 0.0)
+
+    stats = {
+        "date": date_str,
+        "signals_executed": len(today_signals),
+        "positions_opened": deals.filter(_signal_magic() & (pl.col("entry") == DEAL_ENTRY_IN))["position_id"].n_unique(),
+        "positions_closed": trades.height,
+        "wins": wins,
+        "losses": trades.height - wins,
+        "total_profit": total_profit,
+        "total_pips": float(trades["pips"].sum() or 0.0),
+        "win_rate": (wins / trades.height * 100) if trades.height else 0.0,
+        "return_percentage": (total_profit / start_balance * 100) if start_balance > 0 else 0.0,
+        "active_positions": active.height,
+        "symbols_traded": sorted({signal_info["symbol"] for signal_info in today_signals}),
+        "signal_details": []
+    }
+
+    # Open positions that belong to one of our signals
+    linked_active = active.filter(pl.col("unrealized_pips").is_not_null()).join(
+        orders.select(["order_id", "signal_id"]), left_on="ticket", right_on="order_id", how="inner"
+    )
+    for row in linked_active.iter_rows(named=True):
+        stats["signal_details"].append({
+            "signal_id": row["signal_id"],
+            "symbol": row["symbol"],
+            "direction": row["direction"],
+            "entry_price": row["price_open"],
+            "current_price": row["current_price"],
+            "unrealized_profit": row["profit"],
+            "unrealized_pips": row["unrealized_pips"],
+            "status": "ACTIVE",
+            "lot_size": row["volume"]
+        })
+
+    # Closed positions that belong to one of our signals
+    for row in trades.filter(pl.col("signal_id").is_not_null()).iter_rows(named=True):
+        stats["signal_details"].append({
+            "signal_id": row["signal_id"],
+            "symbol": row["symbol"],
+            "direction": row["type"],
+            "entry_price": row["open_price"],
+            "exit_price": row["close_price"],
+            "profit": row["profit"],
+            "status": row["status"]
+        })
+
+    return stats
+
+
+def signal_breakdown(executed_signals, deals, positions, symbols, start_time):
+    """
+    Per-signal statistics in the layout of MT5SignalExecutor.generate_signal_stats
+
+    Signals are grouped by strategy/symbol/direction; each order is ACTIVE if its
+    position is still open, WIN/LOSS if the position closed within the deal range.
+
+    Returns:
+        tuple: (total_signals, total_closed_profit, breakdown dict)
+    """
+    recent = {
+        signal_id: signal_info for signal_id, signal_info in executed_signals.items()
+        if signal_info.get("execution_time") and signal_info["execution_time"] >= start_time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+    orders = signal_orders_frame(recent)
+    trades = closed_trades(deals, orders, symbols).filter(pl.col("signal_id").is_not_null())
+    active = open_trades(positions, symbols)
+
+    # Per-order outcome: open position first, then closed trade
+    per_order = (
+        orders
+        .join(
+            active.select([
+                pl.col("ticket").alias("order_id"),
+                pl.col("profit").alias("active_profit"),
+                pl.col("unrealized_pips").alias("active_pips")
+            ]),
+            on="order_id", how="left"
+        )
+        .join(
+            trades.select([
+                pl.col("position_id").alias("order_id"),
+                pl.col("profit").alias("closed_profit"),
+                pl.col("pips").alias("closed_pips"),
+                pl.col("close_price").alias("exit_price"),
+                pl.col("status").alias("closed_status")
+            ]),
+            on="order_id", how="left"
+        )
+        .with_columns([
+            pl.when(pl.col("active_profit").is_not_null()).then(pl.lit("ACTIVE"))
+            .otherwise(pl.col("closed_status")).alias("status"),
+            pl.concat_str([pl.col("strategy"), pl.col("symbol"), pl.col("direction")], separator="_").alias("signal_key")
+        ])
+    )
+
+    breakdown = {}
+    for key_frame in per_order.partition_by("signal_key", maintain_order=True):
+        first = key_frame.row(0, named=True)
+        is_active = pl.col("status") == "ACTIVE"
+        is_closed = pl.col("status").is_in(["WIN", "LOSS"])
+
+        closed = key_frame.filter(is_closed)
+        active_rows = key_frame.filter(is_active)
+        wins = closed.filter(pl.col("status") == "WIN").height
+        total_closed = closed.height
+
+        total_profit = float((active_rows["active_profit"].sum() or 0.0) + (closed["closed_profit"].sum() or 0.0))
+        total_pips = float((active_rows["active_pips"].sum() or 0.0) + (closed["closed_pips"].sum() or 0.0))
+
+        trade_details = []
+        for row in key_frame.filter(is_active | is_closed).iter_rows(named=True):
+            if row["status"] == "ACTIVE":
+                trade_details.append({
+                    'order_id': row["order_id"],
+                    'status': 'ACTIVE',
+                    'entry_price': row["entry_price"],
+                    'current_profit': row["active_profit"],
+                    'pips': row["active_pips"] or 0
+                })
+            else:
+                trade_details.append({
+                    'order_id': row["order_id"],
+                    'status': row["status"],
+                    'entry_price': row["entry_price"],
+                    'exit_price': row["exit_price"],
+                    'profit': row["closed_profit"],
+                    'pips': row["closed_pips"] or 0
+                })
+
+        breakdown[first["signal_key"]] = {
+            'signal_id': first["signal_id"],
+            'strategy': first["strategy"],
+            'symbol': first["symbol"],
+            'direction': first["direction"],
+            'execution_time': first["execution_time"],
+            'orders_placed': key_frame.height,
+            'total_trades': total_closed,
+            'active_positions': active_rows.height,
+            'wins': wins,
+            'losses': total_closed - wins,
+            'win_rate': (wins / total_closed * 100) if total_closed > 0 else 0,
+            'total_profit': total_profit,
+            'avg_profit_per_trade': total_profit / total_closed if total_closed > 0 else 0,
+            'total_pips': total_pips,
+            'avg_pips_per_trade': total_pips / total_closed if total_closed > 0 else 0,
+            'entry_prices': key_frame["entry_price"].to_list(),
+            'trade_details': trade_details,
+            'profit_factor': profit_factor(closed["closed_profit"].to_list())
+        }
+
+    return len(recent), float(trades["profit"].sum() or 0.0), breakdown
+
+## --------------------------------------------------------------------------------------- ##
+## Fixtures
+## --------------------------------------------------------------------------------------- ##
+
+
+def save_fixture(path, executed_signals, deals, positions, symbol_infos):
+    """Record the raw inputs of a stats run to JSON for offline replay."""
+    fixture = {
+        "executed_signals": executed_signals,
+        "deals": _records(deals),
+        "positions": _records(positions),
+        "symbols": symbols_frame(symbol_infos).to_dicts()
+    }
+    with open(path, 'w') as f:
+        json.dump(fixture, f, indent=2, default=str)
+
+
+def load_fixture(path):
+    """Load a recorded fixture as (executed_signals, deals, positions, symbols) frames."""
+    with open(path, 'r') as f:
+        fixture = json.load(f)
+    return (
+        fixture["executed_signals"],
+        deals_frame(fixture["deals"]),
+        positions_frame(fixture["positions"]),
+        pl.DataFrame(fixture["symbols"], schema=SYMBOL_SCHEMA)
+    )
+
+
+# For testing against a recorded fixture
+if __name__ == "__main__":
+    from datetime import datetime, timedelta
+
+    if len(sys.argv) < 2 or not os.path.exists(sys.argv[1]):
+        print("Usage: python -m tradingSignals.mt5_Fn.mt5_trade_stats <fixture.json>")
+        sys.exit(1)
+
+    executed_signals, deals, positions, symbols = load_fixture(sys.argv[1])
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    print(json.dumps(daily_stats(today, executed_signals, deals, positions, symbols, 10000.0), indent=2, default=str))
+    total_signals, total_profit, breakdown = signal_breakdown(
+        executed_signals, deals, positions, symbols, datetime.now() - timedelta(days=7)
+    )
+    print(f"Signals: {total_signals}, closed profit: {total_profit:.2f}")
+    print(json.dumps(breakdown, indent=2, default=str))
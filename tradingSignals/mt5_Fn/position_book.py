@@ -0,0 +1,172 @@
+import math
+import logging
+
+from tradingSignals.mt5_Fn.signal_record import SIGNAL_MAGIC_BASE
+
+
+class BookEntry:
+    """An open signal position and the price at which its trailing stop must move."""
+
+    __slots__ = (
+        "ticket", "signal_id", "order", "symbol", "direction", "price_open",
+        "sl", "tp", "pip_size", "trailing_pips", "min_profit_pips", "trigger"
+    )
+
+    def __init__(self, position, signal_id, order, direction, pip_size):
+        self.ticket = position.ticket
+        self.signal_id = signal_id
+        self.order = order
+        self.symbol = position.symbol
+        self.direction = direction
+        self.price_open = position.price_open
+        self.sl = position.sl
+        self.tp = position.tp
+        self.pip_size = pip_size
+        self.trailing_pips = None
+        self.min_profit_pips = None
+        self.trigger = None
+
+    def set_rules(self, trailing_pips, min_profit_pips):
+        """Set the trailing parameters and precompute the trigger price."""
+        self.trailing_pips = trailing_pips
+        self.min_profit_pips = min_profit_pips
+
+        activation = self.min_profit_pips * self.pip_size
+        trail = self.trailing_pips * self.pip_size
+
+        if self.direction == "BUY":
+            # Bid must reach the profit threshold and lift the stop above its current level
+            self.trigger = max(self.price_open + activation, self.sl + trail)
+        else:
+            # Ask must reach the profit threshold and pull the stop below its current level
+            stop_level = self.sl - trail if self.sl > 0 else math.inf
+            self.trigger = min(self.price_open - activation, stop_level)
+
+    def set_sl(self, sl):
+        self.sl = sl
+        self.set_rules(self.trailing_pips, self.min_profit_pips)
+
+    def price_for(self, tick):
+        """Price the position would close at: bid for BUY, ask for SELL."""
+        return tick.bid if self.direction == "BUY" else tick.ask
+
+    def is_triggered(self, price):
+        if self.direction == "BUY":
+            return price >= self.trigger and price - self.trailing_pips * self.pip_size > self.sl
+        return price <= self.trigger and (self.sl == 0 or price + self.trailing_pips * self.pip_size < self.sl)
+
+    def profit_pips(self, price):
+        if self.direction == "BUY":
+            return (price - self.price_open) / self.pip_size
+        return (self.price_open - price) / self.pip_size
+
+    def new_sl(self, price):
+        if self.direction == "BUY":
+            return price - self.trailing_pips * self.pip_size
+        return price + self.trailing_pips * self.pip_size
+
+
+class PositionBook:
+    """
+    In-memory book of open signal positions for one account
+
+    sync() reconciles the book with a single bulk positions_get() result: new
+    signal positions are added, closed ones dropped, and stops changed outside
+    the bot picked up. Each entry carries a precomputed trigger price, so a
+    cycle only evaluates trailing-stop rules for positions the market has
+    actually moved past their trigger.
+
+    Signal orders are indexed once, when record_orders() is called as they are
+    placed, so a sync costs O(open positions) however long the signal history.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger('PositionBook')
+        self.entries = {}  # {ticket: BookEntry}
+        self.orders_by_ticket = {}  # {order ticket: (signal_id, order, direction)}
+        self.orders_by_magic = {}   # {(symbol, magic): same}, fallback for positions whose ticket differs
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record_orders(self, signal_id, signal_info):
+        """Index the orders of an executed signal (an MT5SignalExecutor.executed_signals entry)."""
+        for order_idx, order in enumerate(signal_info.get("orders", [])):
+            ref = (signal_id, order, signal_info["direction"])
+            self.orders_by_ticket[order["order_id"]] = ref
+            self.orders_by_magic.setdefault((signal_info["symbol"], SIGNAL_MAGIC_BASE + order_idx), ref)
+
+    def sync(self, positions, pip_size_for, rules_for):
+        """
+        Reconcile the book with the terminal
+
+        Parameters:
+        -----------
+        positions: sequence
+            Result of mt5.positions_get()
+        pip_size_for: callable
+            pip_size_for(symbol) -> pip size or None
+        rules_for: callable
+            rules_for(symbol) -> (trailing_pips, min_profit_pips)
+        """
+        positions = positions or []
+        open_tickets = {position.ticket for position in positions}
+
+        # Drop positions that have closed
+        for ticket in list(self.entries):
+            if ticket not in open_tickets:
+                del self.entries[ticket]
+
+        for position in positions:
+            entry = self.entries.get(position.ticket)
+
+            if entry is None:
+                ref = (
+                    self.orders_by_ticket.get(position.ticket)
+                    or self.orders_by_magic.get((position.symbol, position.magic))
+                )
+                if ref is None:
+                    continue
+                pip_size = pip_size_for(position.symbol)
+                if not pip_size:
+                    self.logger.error(f"Failed to get symbol info for {position.symbol}")
+                    continue
+                signal_id, order, direction = ref
+                entry = BookEntry(position, signal_id, order, direction, pip_size)
+                self.entries[position.ticket] = entry
+            else:
+                entry.tp = position.tp
+                if entry.sl != position.sl:
+                    # Stop moved outside this book (manually or by another tool)
+                    entry.sl = position.sl
+                    entry.trigger = None
+
+            # Recompute the trigger only when the stop or the rules changed
+            trailing_pips, min_profit_pips = rules_for(entry.symbol)
+            if (
+                entry.trigger is None
+                or entry.trailing_pips != trailing_pips
+                or entry.min_profit_pips != min_profit_pips
+            ):
+                entry.set_rules(trailing_pips, min_profit_pips)
+
+    def symbols(self, signal_id=None):
+        return {entry.symbol for entry in self.select(signal_id)}
+
+    def select(self, signal_id=None):
+        """Book entries, optionally only those of one signal."""
+        if signal_id is None:
+            return list(self.entries.values())
+        return [entry for entry in self.entries.values() if entry.signal_id == signal_id]
+
+    def triggered(self, ticks, signal_id=None):
+        """Entries whose current price has moved past their trigger, with that price."""
+        hits = []
+        for entry in self.select(signal_id):
+            tick = ticks.get(entry.symbol)
+            if tick is None:
+                continue
+            price = entry.price_for(tick)
+            if entry.is_triggered(price):
+                hits.append((entry, price))
+        return hits
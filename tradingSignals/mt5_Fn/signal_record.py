@@ -0,0 +1,72 @@
+from datetime import datetime
+
+# Magic numbers MT5SignalExecutor gives signal orders: SIGNAL_MAGIC_BASE + entry index,
+# below SIGNAL_MAGIC_MAX. Anything outside the range is a manual or third-party trade.
+SIGNAL_MAGIC_BASE = 123456
+SIGNAL_MAGIC_MAX = 123500
+
+
+class TradingSignal:
+    """
+    A generated signal: its levels as numbers plus the rendered channel message
+
+    MT5SignalGenerator builds one per signal, so the dispatcher, tracker and
+    executor read symbol, direction and levels directly instead of parsing them
+    back out of the HTML in `text`.
+    """
+
+    __slots__ = (
+        "symbol", "direction", "strategy", "entry_range_low", "entry_range_high",
+        "stop_range_low", "stop_range_high", "take_profit", "take_profit2",
+        "take_profit3", "timeframe", "timestamp", "extras", "text"
+    )
+
+    def __init__(self, symbol, direction, strategy, entry_range_low, entry_range_high,
+                 stop_range_low, stop_range_high, take_profits, text="",
+                 timeframe="M5", timestamp=None, extras=None):
+        self.symbol = symbol
+        self.direction = direction
+        self.strategy = strategy
+        self.entry_range_low = float(entry_range_low)
+        self.entry_range_high = float(entry_range_high)
+        self.stop_range_low = float(stop_range_low)
+        self.stop_range_high = float(stop_range_high)
+        self.take_profit, self.take_profit2, self.take_profit3 = (float(tp) for tp in take_profits)
+        self.timeframe = timeframe
+        self.timestamp = timestamp or datetime.now()
+        self.extras = extras or {}  # strategy-specific values, e.g. hawkes_vol/q05/q95
+        self.text = text
+
+    @property
+    def entry_price(self):
+        """Midpoint of the entry zone."""
+        return (self.entry_range_low + self.entry_range_high) / 2
+
+    @property
+    def stop_loss(self):
+        """Midpoint of the stop loss range."""
+        return (self.stop_range_low + self.stop_range_high) / 2
+
+    def to_dict(self):
+        """Signal info dict as consumed by SignalTracker.add_signal and the executors."""
+        signal_info = {
+            "symbol": self.symbol,
+            "direction": self.direction,
+            "strategy": self.strategy,
+            "entry_range_low": self.entry_range_low,
+            "entry_range_high": self.entry_range_high,
+            "entry_price": self.entry_price,
+            "stop_range_low": self.stop_range_low,
+            "stop_range_high": self.stop_range_high,
+            "stop_loss": self.stop_loss,
+            "take_profit": self.take_profit,
+            "take_profit2": self.take_profit2,
+            "take_profit3": self.take_profit3,
+            "timeframe": self.timeframe,
+            "timestamp": self.timestamp
+        }
+        signal_info.update(self.extras)
+        return signal_info
+
+    def __repr__(self):
+        return f"TradingSignal({self.strategy} {self.symbol} {self.direction} {self.entry_range_low}-{self.entry_range_high})"
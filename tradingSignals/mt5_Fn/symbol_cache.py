@@ -0,0 +1,111 @@
+import time
+import logging
+import threading
+
+
+class SymbolMetadata:
+    """Contract metadata of one symbol, with the same attribute names as mt5.symbol_info."""
+
+    __slots__ = (
+        "name", "digits", "point", "volume_min", "volume_step", "volume_max",
+        "trade_tick_value", "trade_tick_size", "trade_stops_level", "visible",
+        "fetched_at"
+    )
+
+    def __init__(self, info):
+        self.name = info.name
+        self.digits = info.digits
+        self.point = info.point
+        self.volume_min = info.volume_min
+        self.volume_step = info.volume_step
+        self.volume_max = info.volume_max
+        self.trade_tick_value = info.trade_tick_value
+        self.trade_tick_size = info.trade_tick_size
+        self.trade_stops_level = info.trade_stops_level
+        self.visible = info.visible
+        self.fetched_at = time.monotonic()
+
+
+class SymbolInfoCache:
+    """
+    TTL cache of symbol contract metadata (digits, point, volume limits, tick value, stops level)
+
+    Live quotes are deliberately not cached: bid/ask still come from
+    symbol_info_tick. Tick value can drift for cross-currency symbols, so entries
+    expire after `ttl` seconds; invalidate() drops everything after a reconnect.
+    """
+
+    def __init__(self, fetch, ttl=300.0):
+        """
+        Parameters:
+        -----------
+        fetch: callable
+            fetch(symbol) -> mt5.symbol_info result or None
+        ttl: float
+            Seconds an entry is served before it is fetched again
+        """
+        self.fetch = fetch
+        self.ttl = ttl
+        self.logger = logging.getLogger('SymbolInfoCache')
+
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol):
+        """Return SymbolMetadata for a symbol, or None if MT5 does not know it."""
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None and time.monotonic() - entry.fetched_at < self.ttl:
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            info = self.fetch(symbol)
+            if info is None:
+                self._entries.pop(symbol, None)
+                return None
+
+            entry = SymbolMetadata(info)
+            self._entries[symbol] = entry
+            return entry
+
+    def invalidate(self, symbol=None):
+        """Drop one symbol or, by default, every cached symbol."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol, None)
+
+    def stats(self):
+        """Hit/miss counters for logging and monitoring."""
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 3) if requests else 0.0,
+            "symbols": len(self._entries)
+        }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_symbol_cache(server, fetch, ttl=300.0):
+    """
+    Return the cache shared by every account on a trade server in this process
+
+    Contract specifications are per server, so executors connected to the same
+    server reuse one cache. Accounts running in separate worker processes each
+    hold their own.
+    """
+    with _caches_lock:
+        cache = _caches.get(server)
+        if cache is None:
+            cache = SymbolInfoCache(fetch, ttl=ttl)
+            _caches[server] = cache
+        return cache
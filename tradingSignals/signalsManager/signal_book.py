@@ -0,0 +1,139 @@
+import logging
+import numpy as np
+
+MAX_TAKE_PROFITS = 3
+
+
+def signal_levels(signal):
+    """Entry, stop loss and take-profit levels of a signal as floats."""
+    entry_price = float(signal["entry_price"])
+    stop_loss = float(signal.get("stop_loss", 0) or 0)
+
+    # Extract take-profit targets (TP1, TP2, TP3)
+    take_profits = []
+    for i in range(1, MAX_TAKE_PROFITS + 1):
+        tp_key = f"take_profit{i}" if i > 1 else "take_profit"
+        if tp_key in signal:
+            take_profits.append(float(signal[tp_key]))
+
+    return entry_price, stop_loss, take_profits
+
+
+def threshold_crossings(last_pcts, current_pcts, thresholds):
+    """
+    First threshold crossed by each signal between two progress readings
+
+    Returns:
+    --------
+    tuple
+        (crossed_up, crossed_down) float arrays holding the crossed threshold, or
+        NaN where the first crossing was in the other direction or there was none
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    last = np.asarray(last_pcts, dtype=float)[:, None]
+    current = np.asarray(current_pcts, dtype=float)[:, None]
+    up = (last < thresholds) & (current >= thresholds)
+    down = (last >= thresholds) & (current < thresholds)
+    crossed = up | down
+
+    rows = np.arange(len(last))
+    first = crossed.argmax(axis=1)
+    any_crossed = crossed[rows, first]
+    crossed_up = np.where(any_crossed & up[rows, first], thresholds[first], np.nan)
+    crossed_down = np.where(any_crossed & down[rows, first], thresholds[first], np.nan)
+    return crossed_up, crossed_down
+
+
+class SignalBook:
+    """
+    Columnar view of the active signals for vectorized evaluation
+
+    Levels are held as parallel arrays (entry, stop loss, TP1-TP3, direction sign,
+    symbol index and pip factor), so progress, stop and take-profit hits of the
+    whole book are computed against a price vector in a handful of NumPy
+    operations. The book is rebuilt only when signals are added or removed.
+    """
+
+    def __init__(self, pip_factor):
+        """
+        Parameters:
+        -----------
+        pip_factor: callable
+            pip_factor(symbol) -> pips per unit of price for that symbol
+        """
+        self.pip_factor = pip_factor
+        self.logger = logging.getLogger('SignalBook')
+        self.build({})
+
+    def __len__(self):
+        return len(self.signal_ids)
+
+    def build(self, active_signals):
+        """Rebuild the arrays from {signal_id: signal}; signals with malformed levels are left out."""
+        rows = []
+        for signal_id, signal in list(active_signals.items()):
+            try:
+                rows.append((signal_id, signal["symbol"], signal["direction"]) + signal_levels(signal))
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.error(f"Error reading levels for signal {signal_id}: {e}")
+
+        n = len(rows)
+        self.signal_ids = [row[0] for row in rows]
+        self.directions = [row[2] for row in rows]
+        self.symbols = sorted({row[1] for row in rows})
+        symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        self.row_index = {signal_id: i for i, signal_id in enumerate(self.signal_ids)}
+        self.symbol_idx = np.array([symbol_index[row[1]] for row in rows], dtype=np.intp)
+        self.side = np.array([1.0 if row[2] == "BUY" else -1.0 for row in rows])
+        self.entry = np.array([row[3] for row in rows], dtype=float)
+        self.stop = np.array([row[4] for row in rows], dtype=float)
+        self.tps = np.full((n, MAX_TAKE_PROFITS), np.nan)
+        self.tp_count = np.zeros(n, dtype=np.intp)
+        for i, row in enumerate(rows):
+            take_profits = row[5][:MAX_TAKE_PROFITS]
+            self.tps[i, :len(take_profits)] = take_profits
+            self.tp_count[i] = len(take_profits)
+        self.tp_valid = np.arange(MAX_TAKE_PROFITS) < self.tp_count[:, None]
+        self.take_profits = [row[5][:MAX_TAKE_PROFITS] for row in rows]
+
+        symbol_pips = np.array([self.pip_factor(symbol) for symbol in self.symbols], dtype=float)
+        self.pips = symbol_pips[self.symbol_idx] if n else np.zeros(0)
+
+    def symbol_of(self, i):
+        return self.symbols[self.symbol_idx[i]]
+
+    def evaluate(self, prices):
+        """
+        Evaluate the whole book against a tick snapshot
+
+        Parameters:
+        -----------
+        prices: dict
+            {symbol: price}; signals on symbols without a price are masked out
+
+        Returns:
+        --------
+        dict of arrays, one row per signal in the book:
+            priced, price, pct_to_tps (n x 3), pct_to_tp1, tps_hit (n x 3),
+            stop_hit, in_profit, profit_pips
+        """
+        symbol_prices = np.array([prices.get(symbol, np.nan) for symbol in self.symbols], dtype=float)
+        price = symbol_prices[self.symbol_idx] if len(self) else np.zeros(0)
+
+        move = price - self.entry
+        entry_to_tp = self.tps - self.entry[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_to_tps = np.where(entry_to_tp != 0, move[:, None] / entry_to_tp * 100, 0.0)
+        tps_hit = (self.side[:, None] * (price[:, None] - self.tps) >= 0) & self.tp_valid
+
+        return {
+            "priced": ~np.isnan(price),
+            "price": price,
+            "pct_to_tps": pct_to_tps,
+            "pct_to_tp1": np.where(self.tp_count > 0, pct_to_tps[:, 0], 0.0),
+            "tps_hit": tps_hit,
+            "stop_hit": (self.stop > 0) & (self.side * (price - self.stop) <= 0),
+            "in_profit": self.side * move > 0,
+            "profit_pips": self.side * move * self.pips
+        }
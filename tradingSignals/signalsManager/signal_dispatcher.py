@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import os
+import time as time_module
 from datetime import datetime, timedelta, time
 from dotenv import load_dotenv
 import pytz
@@ -11,10 +12,15 @@ from tradingSignals.signalsManager.signal_tracker import SignalTracker
 from tradingSignals.signalsManager.signal_follow import SignalFollowUpGenerator
 from tradingSignals.mt5_Fn.mt5_accountManager import MultiAccountExecutor
 from tradingSignals.mt5_Fn.mt5_signal_generator import MT5SignalGenerator
+from tradingSignals.mt5_Fn.mt5_gateway import get_mt5_gateway
+from telegram_outbox import get_outbound_queue
 
 load_dotenv()
 ADMIN_USER_ID = [7823596188, 7396303047]
 
+# Orders in which run_signal_pipeline can execute, broadcast and track a signal
+PIPELINE_ORDERS = ("execute_first", "concurrent", "broadcast_first")
+
 class SignalDispatcher:
     """Manages trading signal generation and distribution"""
     
@@ -23,6 +29,12 @@ class SignalDispatcher:
         self.signals_channel_id = signals_channel_id
         self.logger = logging.getLogger('SignalDispatcher')
         
+        # Channel posts and admin alerts share the bot's rate-limited outbound queue
+        self.outbox = get_outbound_queue(bot)
+        
+        # All MT5 terminal access from coroutines goes through the gateway thread
+        self.mt5_gateway = get_mt5_gateway()
+        
         # Initialize MT5 signal generator
         self.signal_generator = MT5SignalGenerator(
             username = os.getenv("MT5_USERNAME"),
@@ -46,6 +58,14 @@ class SignalDispatcher:
         self.signal_executor = MultiAccountExecutor()
         
         self.auto_execute = False
+        
+        # Signal pipeline ordering and per-signal stage latency (ms after the decision)
+        self.pipeline_order = os.getenv("SIGNAL_PIPELINE_ORDER", "execute_first").lower()
+        if self.pipeline_order not in PIPELINE_ORDERS:
+            self.logger.warning(f"Unknown SIGNAL_PIPELINE_ORDER '{self.pipeline_order}', using execute_first")
+            self.pipeline_order = "execute_first"
+        self.signal_latencies = {}  # {signal_id: {stage: ms}}
+        self.max_latency_records = 200
         # self.signal_tracker = self.signal_generator.signal_history 
 
         
@@ -75,7 +95,7 @@ class SignalDispatcher:
             self.logger.warning("Groq client not initialized - no API key provided")
         
         # Initialize signal tracker
-        self.signal_tracker = SignalTracker()
+        self.signal_tracker = SignalTracker(gateway=self.mt5_gateway)
         self.signal_tracker.register_update_callback(self.handle_signal_updates)
         self.logger.info("Signal tracker initialized with callback")
         
@@ -208,19 +228,15 @@ class SignalDispatcher:
                             signal_data, status, self._determine_message_type(status)
                         )
                     
-                    # Send to channel
-                    await self.bot.send_message(
-                        chat_id=self.signals_channel_id,
+                    # Queue for the channel; the outbound queue paces channel posts
+                    self.outbox.send(
+                        self.signals_channel_id,
                         text=message,
                         parse_mode='HTML'
                     )
                     
                     update_count += 1
-                    self.logger.info(f"Sent follow-up message for signal {signal_id}")
-                    
-                    # Add a small delay between messages to prevent flooding
-                    if len(signals_to_update) > 1:
-                        await asyncio.sleep(3)
+                    self.logger.info(f"Queued follow-up message for signal {signal_id}")
                     
                 except Exception as e:
                     self.logger.error(f"Error handling signal update: {e}")
@@ -297,105 +313,28 @@ class SignalDispatcher:
             self.logger.info("Skipping signal check - weekend market closure")
             return
             
-        # Try to generate a signal
-        signal = self.signal_generator.generate_signal()
+        # Only the bar refresh talks to MT5, so only it runs on the gateway; the
+        # evaluation runs on the scan pool and leaves the gateway free for orders and tick polls
+        await self.mt5_gateway.run(self.signal_generator.prefetch_bars)
+        signal = await asyncio.to_thread(self.signal_generator.generate_signal, prefetched=True)
+        
+        decided_at = time_module.time()
         
         if signal:
             try:
-                # Extract signal info from formatted message
-                signal_info = self.extract_signal_info(signal)
-                
-                # Send the signal message to the channel
-                await self.bot.send_message(
-                    chat_id=self.signals_channel_id,
-                    text=signal,
-                    parse_mode='HTML'
-                )
+                # The generator returns a TradingSignal: levels as fields, message in .text
+                signal_info = signal.to_dict()
+                signal_info['signal_id'] = self.signal_tracker.make_signal_id(signal_info)
                 
                 # Update tracking values
                 self.last_signal_time = now
                 self.signals_sent_today += 1
                 self.signals_sent_this_hour += 1
                 
-                # Add to signal tracker and get the signal_id
-                if signal_info:
-                    signal_id = self.signal_tracker.add_signal(signal_info)
-                    
-                    # Add signal_id to the signal_info dict for the executor
-                    signal_info['signal_id'] = signal_id
-                    
-                    # Execute the signal automatically
-                    try:
-                        execution_result = self.signal_executor.execute_signal(signal_info)
-                        
-                        if execution_result["success"]:
-                            accounts_executed = execution_result["accounts_executed"]
-                            total_accounts = execution_result["total_accounts"]
-                            self.logger.info(f"Signal {signal_id} executed on {accounts_executed}/{total_accounts} accounts")
-                            
-                            # Format account details for the admin notification
-                            account_details = ""
-                            for account_name, result in execution_result["details"].items():
-                                if result["success"]:
-                                    orders_placed = result.get("order_count", 0)
-                                    total_lots = result.get("total_lot_size", 0)
-                                    account_details += f"• {account_name}: ✅ {orders_placed} orders, {total_lots:.2f} lots\n"
-                                else:
-                                    error = result.get("error", "Unknown error")
-                                    account_details += f"• {account_name}: ❌ Error: {error}\n"
-                            
-                            # Send execution notification to admin only
-                            admin_msg = f"""
-                    🤖 <b>SIGNAL AUTO-EXECUTED</b> 🤖
-
-                    Symbol: {signal_info['symbol']} {signal_info['direction']}
-                    Executed on {accounts_executed}/{total_accounts} accounts
-
-                    <b>Account Details:</b>
-                    {account_details}
-
-                    Signal ID: {signal_id}
-                    """
-                            # Send to admin only
-                            for admin_id in ADMIN_USER_ID:
-                                try:
-                                    await self.bot.send_message(
-                                        chat_id=admin_id,
-                                        text=admin_msg,
-                                        parse_mode='HTML'
-                                    )
-                                except Exception as e:
-                                    self.logger.error(f"Failed to send execution notification to admin {admin_id}: {e}")
-                        else:
-                            self.logger.error(f"Failed to execute signal {signal_id} on any account: {execution_result['error']}")
-                            
-                            # Notify admin of execution failure
-                            for admin_id in ADMIN_USER_ID:
-                                try:
-                                    await self.bot.send_message(
-                                        chat_id=admin_id,
-                                        text=f"⚠️ EXECUTION FAILED: {signal_info['symbol']} {signal_info['direction']}\n\nError: {execution_result['error']}",
-                                        parse_mode='HTML'
-                                    )
-                                except Exception as e:
-                                    self.logger.error(f"Failed to send execution error to admin {admin_id}: {e}")
-                                    
-                    except Exception as e:
-                        self.logger.error(f"Error during signal execution: {e}")
-                        
-                        # Notify admin of execution exception
-                        for admin_id in ADMIN_USER_ID:
-                            try:
-                                await self.bot.send_message(
-                                    chat_id=admin_id,
-                                    text=f"⚠️ EXECUTION ERROR: {signal_info['symbol']} {signal_info['direction']}\n\nException: {str(e)}",
-                                    parse_mode='HTML'
-                                )
-                            except Exception as notify_error:
-                                self.logger.error(f"Failed to send execution exception to admin {admin_id}: {notify_error}")
-                    
-                    # Schedule follow-up message
-                    asyncio.create_task(self.send_signal_followup(signal_info))
+                await self.run_signal_pipeline(signal, signal_info, decided_at)
+                
+                # Schedule follow-up message
+                asyncio.create_task(self.send_signal_followup(signal_info))
                 
                 self.logger.info(f"Sent trading signal at {now} - Daily: {self.signals_sent_today}/{self.signal_generator.max_signals_per_day}, Hourly: {self.signals_sent_this_hour}/{self.signal_generator.max_signals_per_hour}")
                 
@@ -408,6 +347,152 @@ class SignalDispatcher:
         if updated_count > 0:
             self.logger.info(f"Processed updates for {updated_count} signals")
 
+    async def run_signal_pipeline(self, signal, signal_info, decided_at):
+        """
+        Execute, broadcast and track one signal in the configured order.
+        
+        pipeline_order:
+            execute_first   - orders are sent on our accounts, then the channel broadcast
+                              and tracker write happen (default)
+            concurrent      - execution and broadcast start together
+            broadcast_first - previous behaviour: broadcast, track, then execute
+        
+        Stage times (ms after the signal was decided) are logged and kept in
+        signal_latencies[signal_id].
+        """
+        timings = {"decided_at": decided_at}
+        
+        if self.pipeline_order == "broadcast_first":
+            await self._broadcast_signal(signal, timings)
+            self._track_signal(signal_info, timings)
+            execution_result = await self._execute_signal(signal_info, timings)
+        else:
+            execution = asyncio.create_task(self._execute_signal(signal_info, timings))
+            if self.pipeline_order == "execute_first":
+                await asyncio.wait({execution})
+            await self._broadcast_signal(signal, timings)
+            self._track_signal(signal_info, timings)
+            execution_result = await execution
+        
+        latency = self._record_signal_latency(signal_info['signal_id'], timings)
+        await self._report_execution(signal_info, execution_result, latency)
+        return execution_result
+    
+    def _stage_ms(self, timings, stage):
+        timings[stage] = round((time_module.time() - timings["decided_at"]) * 1000, 1)
+    
+    async def _broadcast_signal(self, signal, timings):
+        """Send the signal message to the channel."""
+        try:
+            await self.outbox.send(
+                self.signals_channel_id,
+                text=signal.text,
+                parse_mode='HTML'
+            )
+        except Exception as e:
+            self.logger.error(f"Error broadcasting signal: {e}")
+        self._stage_ms(timings, "broadcast_ms")
+    
+    def _track_signal(self, signal_info, timings):
+        """Add the signal to the tracker (persisted by the signal store)."""
+        self.signal_tracker.add_signal(signal_info)
+        self._stage_ms(timings, "tracked_ms")
+    
+    async def _execute_signal(self, signal_info, timings):
+        """Execute the signal on every account; returns the execution result or the exception raised."""
+        self._stage_ms(timings, "execution_started_ms")
+        try:
+            execution_result = await self.signal_executor.execute_signal_async(signal_info, self.mt5_gateway)
+        except Exception as e:
+            self.logger.error(f"Error during signal execution: {e}")
+            execution_result = e
+        self._stage_ms(timings, "execution_done_ms")
+        
+        if isinstance(execution_result, dict):
+            placed_times = [
+                order["placed_at"]
+                for detail in execution_result.get("details", {}).values()
+                for order in detail.get("orders", [])
+                if order.get("placed_at")
+            ]
+            if placed_times:
+                timings["order_placed_ms"] = round((min(placed_times) - timings["decided_at"]) * 1000, 1)
+        return execution_result
+    
+    def _record_signal_latency(self, signal_id, timings):
+        latency = {stage: value for stage, value in timings.items() if stage != "decided_at"}
+        self.signal_latencies[signal_id] = latency
+        
+        # Keep only the most recent signals
+        while len(self.signal_latencies) > self.max_latency_records:
+            self.signal_latencies.pop(next(iter(self.signal_latencies)))
+        
+        self.logger.info(f"Signal {signal_id} pipeline ({self.pipeline_order}) stage latency: {latency}")
+        return latency
+    
+    async def _report_execution(self, signal_info, execution_result, latency):
+        """Send the execution outcome to the admins."""
+        signal_id = signal_info['signal_id']
+        
+        if isinstance(execution_result, Exception):
+            # Notify admin of execution exception
+            self.outbox.notify_admins(
+                ADMIN_USER_ID,
+                text=f"⚠️ EXECUTION ERROR: {signal_info['symbol']} {signal_info['direction']}\n\nException: {str(execution_result)}",
+                parse_mode='HTML'
+            )
+            return
+        
+        if execution_result["success"]:
+            accounts_executed = execution_result["accounts_executed"]
+            total_accounts = execution_result["total_accounts"]
+            self.logger.info(f"Signal {signal_id} executed on {accounts_executed}/{total_accounts} accounts")
+            
+            # Format account details for the admin notification
+            account_details = ""
+            for account_name, result in execution_result["details"].items():
+                if result["success"]:
+                    orders_placed = result.get("order_count", 0)
+                    total_lots = result.get("total_lot_size", 0)
+                    order_ms = result.get("latency", {}).get("dispatch_to_order_ms")
+                    order_text = f", placed in {order_ms:.0f} ms" if order_ms is not None else ""
+                    account_details += f"• {account_name}: ✅ {orders_placed} orders, {total_lots:.2f} lots{order_text}\n"
+                else:
+                    error = result.get("error", "Unknown error")
+                    account_details += f"• {account_name}: ❌ Error: {error}\n"
+            
+            order_placed_ms = latency.get("order_placed_ms")
+            order_line = f"Decision to order placed: {order_placed_ms:.0f} ms" if order_placed_ms is not None else ""
+            
+            # Send execution notification to admin only
+            admin_msg = f"""
+                    🤖 <b>SIGNAL AUTO-EXECUTED</b> 🤖
+
+                    Symbol: {signal_info['symbol']} {signal_info['direction']}
+                    Executed on {accounts_executed}/{total_accounts} accounts
+                    {order_line}
+
+                    <b>Account Details:</b>
+                    {account_details}
+
+                    Signal ID: {signal_id}
+                    """
+            # Send to admin only
+            self.outbox.notify_admins(
+                ADMIN_USER_ID,
+                text=admin_msg,
+                parse_mode='HTML'
+            )
+        else:
+            self.logger.error(f"Failed to execute signal {signal_id} on any account: {execution_result['error']}")
+            
+            # Notify admin of execution failure
+            self.outbox.notify_admins(
+                ADMIN_USER_ID,
+                text=f"⚠️ EXECUTION FAILED: {signal_info['symbol']} {signal_info['direction']}\n\nError: {execution_result['error']}",
+                parse_mode='HTML'
+            )
+    
     def update_market_hours(self, **kwargs):
         """
         Update market hours configuration.
@@ -435,7 +520,12 @@ class SignalDispatcher:
             self.market_timezone = pytz.timezone(self.market_hours_config['timezone'])
 
     def extract_signal_info(self, signal_message):
-        """Extract structured signal information from a formatted signal message string"""
+        """
+        Extract structured signal information from a formatted signal message string
+        
+        Only needed for messages that did not come from MT5SignalGenerator (which
+        returns a TradingSignal with the fields already set).
+        """
         try:
             # Initialize empty signal info dictionary
             signal_info = {}
@@ -623,8 +713,8 @@ class SignalDispatcher:
     """
             
             # Send to channel
-            await self.bot.send_message(
-                chat_id=self.signals_channel_id,
+            await self.outbox.send(
+                self.signals_channel_id,
                 text=message,
                 parse_mode='HTML'
             )
@@ -648,7 +738,7 @@ class SignalDispatcher:
             # Handle both single-account and multi-account executors
             if isinstance(self.signal_executor, MultiAccountExecutor):
                 # Multi-account execution
-                result = self.signal_executor.apply_trailing_stop()
+                result = await self.mt5_gateway.run(self.signal_executor.apply_trailing_stop)
                 
                 if result["success"]:
                     accounts_updated = result["accounts_updated"]
@@ -685,15 +775,11 @@ class SignalDispatcher:
     """
                             
                             # Send to admin only
-                            for admin_id in ADMIN_USER_ID:
-                                try:
-                                    await self.bot.send_message(
-                                        chat_id=admin_id,
-                                        text=admin_msg,
-                                        parse_mode='HTML'
-                                    )
-                                except Exception as e:
-                                    self.logger.error(f"Failed to send trailing stop notification to admin {admin_id}: {e}")
+                            self.outbox.notify_admins(
+                                ADMIN_USER_ID,
+                                text=admin_msg,
+                                parse_mode='HTML'
+                            )
                     else:
                         self.logger.info(f"No trailing stops updated on any account.")
                 else:
@@ -701,7 +787,7 @@ class SignalDispatcher:
                     
             else:
                 # Single-account execution (original implementation)
-                result = self.signal_executor.apply_trailing_stop()
+                result = await self.mt5_gateway.run(self.signal_executor.apply_trailing_stop)
                 
                 if result["success"]:
                     if result["positions_updated"] > 0:
@@ -722,15 +808,11 @@ class SignalDispatcher:
     """
                         
                         # Send to admin only
-                        for admin_id in ADMIN_USER_ID:
-                            try:
-                                await self.bot.send_message(
-                                    chat_id=admin_id,
-                                    text=admin_msg,
-                                    parse_mode='HTML'
-                                )
-                            except Exception as e:
-                                self.logger.error(f"Failed to send trailing stop notification to admin {admin_id}: {e}")
+                        self.outbox.notify_admins(
+                            ADMIN_USER_ID,
+                            text=admin_msg,
+                            parse_mode='HTML'
+                        )
                     else:
                         self.logger.info(f"No trailing stops updated. Checked {result['positions_checked']} positions.")
                 else:
@@ -758,8 +840,8 @@ class SignalDispatcher:
                 
                 # Try sending message with error catching
                 try:
-                    await self.bot.send_message(
-                        chat_id=self.signals_channel_id,
+                    await self.outbox.send(
+                        self.signals_channel_id,
                         text=message,
                         parse_mode='HTML'
                     )
@@ -784,7 +866,7 @@ class SignalDispatcher:
                 return
             
             # Generate daily stats
-            result = self.signal_executor.generate_daily_stats()
+            result = await self.mt5_gateway.run(self.signal_executor.generate_daily_stats)
             
             if not result["success"]:
                 self.logger.error(f"Failed to generate daily stats: {result.get('error', 'Unknown error')}")
@@ -833,16 +915,11 @@ class SignalDispatcher:
                 stats_msg += f"\n\n<b>Active Positions:</b>\n{active_details}"
             
             # Send to admin
-            for admin_id in ADMIN_USER_ID:
-                try:
-                    await self.bot.send_message(
-                        chat_id=admin_id,
-                        text=stats_msg,
-                        parse_mode='HTML'
-                    )
-                    self.logger.info(f"Sent daily stats to admin {admin_id}")
-                except Exception as e:
-                    self.logger.error(f"Failed to send daily stats to admin {admin_id}: {e}")
+            self.outbox.notify_admins(
+                ADMIN_USER_ID,
+                text=stats_msg,
+                parse_mode='HTML'
+            )
             
         except Exception as e:
             self.logger.error(f"Error in send_daily_stats: {e}")
@@ -0,0 +1,160 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+
+
+class SignalStore:
+    """
+    SQLite store for tracked signals
+
+    Active signals are upserted one row at a time and removed in batches;
+    removed signals are moved into a closed-signal history table in the same
+    transaction. The database runs in WAL mode so writes are small appends and
+    readers never block the monitor loop.
+    """
+
+    def __init__(self, db_path="./bot_data/signals.db"):
+        self.db_path = db_path
+        self.logger = logging.getLogger('SignalStore')
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS active_signals (
+                    signal_id TEXT PRIMARY KEY,
+                    symbol TEXT NOT NULL,
+                    direction TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS closed_signals (
+                    signal_id TEXT PRIMARY KEY,
+                    symbol TEXT NOT NULL,
+                    direction TEXT NOT NULL,
+                    strategy TEXT,
+                    opened_at TEXT NOT NULL,
+                    closed_at TEXT NOT NULL,
+                    outcome TEXT NOT NULL,
+                    tps_hit INTEGER NOT NULL DEFAULT 0,
+                    final_pct REAL,
+                    data TEXT NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_closed_signals_closed_at ON closed_signals (closed_at)"
+            )
+
+    @staticmethod
+    def _encode(signal):
+        """JSON for a signal dict, with datetimes as ISO strings."""
+        return json.dumps(signal, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+
+    @staticmethod
+    def _timestamp(signal):
+        timestamp = signal.get("timestamp", datetime.now())
+        return timestamp.isoformat() if isinstance(timestamp, datetime) else str(timestamp)
+
+    def is_empty(self):
+        with self._lock:
+            active = self._conn.execute("SELECT COUNT(*) FROM active_signals").fetchone()[0]
+            closed = self._conn.execute("SELECT COUNT(*) FROM closed_signals").fetchone()[0]
+        return active == 0 and closed == 0
+
+    def upsert(self, signal_id, signal):
+        """Insert or replace one active signal."""
+        self.upsert_many({signal_id: signal})
+
+    def upsert_many(self, signals):
+        """Insert or replace several active signals in one transaction."""
+        rows = [
+            (signal_id, signal["symbol"], signal["direction"], self._timestamp(signal), self._encode(signal))
+            for signal_id, signal in signals.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO active_signals (signal_id, symbol, direction, timestamp, data)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(signal_id) DO UPDATE SET
+                    symbol = excluded.symbol,
+                    direction = excluded.direction,
+                    timestamp = excluded.timestamp,
+                    data = excluded.data
+                """,
+                rows
+            )
+
+    def load_active(self):
+        """Return {signal_id: signal dict} with timestamps as strings (as stored)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT signal_id, data FROM active_signals").fetchall()
+        return {row["signal_id"]: json.loads(row["data"]) for row in rows}
+
+    def close_many(self, closures):
+        """
+        Move signals from the active table into the closed-signal history
+
+        Parameters:
+        -----------
+        closures: list
+            (signal_id, signal, outcome, status) tuples; outcome is one of
+            'take_profit', 'stop_loss', 'expired' or 'removed', status is the
+            last computed status dict or None
+        """
+        closed_at = datetime.now().isoformat()
+        rows = []
+        for signal_id, signal, outcome, status in closures:
+            status = status or {}
+            rows.append((
+                signal_id,
+                signal["symbol"],
+                signal["direction"],
+                signal.get("strategy"),
+                self._timestamp(signal),
+                closed_at,
+                outcome,
+                sum(1 for hit in status.get("tps_hit", []) if hit),
+                status.get("pct_to_tp1"),
+                self._encode(signal)
+            ))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO closed_signals
+                    (signal_id, symbol, direction, strategy, opened_at, closed_at, outcome, tps_hit, final_pct, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            self._conn.executemany(
+                "DELETE FROM active_signals WHERE signal_id = ?",
+                [(row[0],) for row in rows]
+            )
+
+    def history(self, days=7):
+        """Outcome counts of signals closed within the last `days` days."""
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT outcome, COUNT(*) AS n FROM closed_signals WHERE closed_at >= ? GROUP BY outcome",
+                (since,)
+            ).fetchall()
+        return {row["outcome"]: row["n"] for row in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
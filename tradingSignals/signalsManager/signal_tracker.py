@@ -1,36 +1,59 @@
 import asyncio
 import logging
+import time
 import json
 import os
+import numpy as np
 import polars as pl
 from datetime import datetime, timedelta
 import MetaTrader5 as mt5
 
+from tradingSignals.mt5_Fn.mt5_gateway import get_mt5_gateway
+from tradingSignals.signalsManager.signal_store import SignalStore
+from tradingSignals.signalsManager.signal_book import SignalBook, threshold_crossings
+
 class SignalTracker:
     """Class for tracking active trading signals and their progress."""
     
-    def __init__(self, storage_path="./bot_data/active_signals.json"):
+    def __init__(self, storage_path="./bot_data/active_signals.json", gateway=None, db_path="./bot_data/signals.db"):
         """
         Initialize the signal tracker.
         
         Args:
-            storage_path (str): Path to store active signals
+            storage_path (str): Legacy JSON file of active signals, imported once into the store
+            gateway (MT5Gateway, optional): Gateway for non-blocking MT5 access
+            db_path (str): SQLite database holding active and closed signals
         """
         self.storage_path = storage_path
+        self.gateway = gateway or get_mt5_gateway()
         self.logger = logging.getLogger('SignalTracker')
+        self.store = SignalStore(db_path)
         self.active_signals = {}
-        self.load_signals()
         
-        # Track signal updates to avoid spamming users
-        self.signal_updates = {}  # {signal_id: {last_update_time, last_update_pct}}
+        # Columnar copy of the active signals' levels, rebuilt when signals are added or removed
+        self.signal_book = SignalBook(lambda symbol: self.calculate_pips(symbol, 1.0))
+        self._book_dirty = True
+        self.load_signals()
         
         # Initialize MT5 connection
         self.mt5_connected = False
+        self._selected_symbols = set()  # symbols already enabled in Market Watch
         self.init_mt5()
         
-        # Track milestones for each signal
+        # Track milestones for each signal (the only per-signal update state)
         self.signal_milestones = {}
         
+        # Status computations made by evaluate_signals, and per-cycle monitor metrics
+        self.status_computations = 0
+        self.monitor_stats = {
+            "cycles": 0,
+            "status_computations": 0,
+            "signals_tracked": 0,
+            "updates_emitted": 0,
+            "signals_removed": 0,
+            "cycle_ms": 0.0
+        }
+        
         # Important thresholds to track
         self.important_thresholds = [25, 50, 75, 90]
         
@@ -59,6 +82,7 @@ class SignalTracker:
             
             self.logger.info("Successfully connected to MT5")
             self.mt5_connected = True
+            self._selected_symbols.clear()
             return True
             
         except Exception as e:
@@ -67,51 +91,56 @@ class SignalTracker:
             return False
     
     def load_signals(self):
-        """Load active signals from storage."""
+        """Load active signals from the store, importing the legacy JSON file on first run."""
         try:
-            if os.path.exists(self.storage_path):
+            if self.store.is_empty() and os.path.exists(self.storage_path):
                 with open(self.storage_path, 'r') as f:
-                    self.active_signals = json.load(f)
-                    
-                    # Convert string timestamps back to datetime objects
-                    for signal_id, signal in self.active_signals.items():
-                        if 'timestamp' in signal and isinstance(signal['timestamp'], str):
-                            try:
-                                signal['timestamp'] = datetime.fromisoformat(signal['timestamp'])
-                            except ValueError:
-                                # If datetime string format is not ISO
-                                signal['timestamp'] = datetime.strptime(signal['timestamp'], '%Y-%m-%d %H:%M:%S')
-                
-                self.logger.info(f"Loaded {len(self.active_signals)} active signals from {self.storage_path}")
-            else:
-                self.logger.info(f"No active signals file found at {self.storage_path}")
-                self.active_signals = {}
+                    legacy_signals = json.load(f)
+                self.store.upsert_many(legacy_signals)
+                self.logger.info(f"Imported {len(legacy_signals)} active signals from {self.storage_path}")
+            
+            self.active_signals = self.store.load_active()
+            self._book_dirty = True
+            
+            # Convert string timestamps back to datetime objects
+            for signal_id, signal in self.active_signals.items():
+                if 'timestamp' in signal and isinstance(signal['timestamp'], str):
+                    try:
+                        signal['timestamp'] = datetime.fromisoformat(signal['timestamp'])
+                    except ValueError:
+                        # If datetime string format is not ISO
+                        signal['timestamp'] = datetime.strptime(signal['timestamp'], '%Y-%m-%d %H:%M:%S')
+            
+            self.logger.info(f"Loaded {len(self.active_signals)} active signals from {self.store.db_path}")
         except Exception as e:
             self.logger.error(f"Error loading active signals: {e}")
             self.active_signals = {}
     
     def save_signals(self):
-        """Save active signals to storage."""
+        """Write every active signal to the store (add_signal/remove_signal already persist per row)."""
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
-            
-            # Convert datetime objects to strings for JSON serialization
-            signals_to_save = {}
-            for signal_id, signal in self.active_signals.items():
-                signals_to_save[signal_id] = signal.copy()
-                if 'timestamp' in signals_to_save[signal_id] and isinstance(signals_to_save[signal_id]['timestamp'], datetime):
-                    signals_to_save[signal_id]['timestamp'] = signals_to_save[signal_id]['timestamp'].isoformat()
-            
-            with open(self.storage_path, 'w') as f:
-                json.dump(signals_to_save, f, indent=2)
-            
-            self.logger.info(f"Saved {len(self.active_signals)} active signals to {self.storage_path}")
+            self.store.upsert_many(self.active_signals)
+            self.logger.info(f"Saved {len(self.active_signals)} active signals to {self.store.db_path}")
             return True
         except Exception as e:
             self.logger.error(f"Error saving active signals: {e}")
             return False
     
+    def make_signal_id(self, signal_data):
+        """
+        ID under which add_signal tracks a signal: SYMBOL_DIRECTION_YYYYmmddHHMMSS.
+        
+        Deterministic, so callers can know the ID before the signal is stored.
+        """
+        timestamp = signal_data.get('timestamp', datetime.now())
+        if isinstance(timestamp, str):
+            try:
+                timestamp = datetime.fromisoformat(timestamp)
+            except ValueError:
+                timestamp = datetime.now()
+        
+        return f"{signal_data['symbol']}_{signal_data['direction']}_{timestamp.strftime('%Y%m%d%H%M%S')}"
+    
     def add_signal(self, signal_data):
         """
         Add a new signal to track.
@@ -130,43 +159,23 @@ class SignalTracker:
                     self.logger.error(f"Signal missing required field: {field}")
                     return None
             
-            # Create a signal ID
-            timestamp = signal_data.get('timestamp', datetime.now())
-            if isinstance(timestamp, str):
-                try:
-                    timestamp = datetime.fromisoformat(timestamp)
-                except ValueError:
-                    timestamp = datetime.now()
-            
-            signal_id = f"{signal_data['symbol']}_{signal_data['direction']}_{timestamp.strftime('%Y%m%d%H%M%S')}"
-            
             # Add timestamp if not provided
             if 'timestamp' not in signal_data:
-                signal_data['timestamp'] = timestamp
+                signal_data['timestamp'] = datetime.now()
+            
+            # Create a signal ID
+            signal_id = self.make_signal_id(signal_data)
             
             # Store the signal
             self.active_signals[signal_id] = signal_data
-            
-            # Initialize update tracking
-            self.signal_updates[signal_id] = {
-                'last_update_time': datetime.now() - timedelta(hours=1),  # Allow immediate update
-                'last_update_pct': 0,
-                'updates_sent': 0,
-                'completed_tps': []
-            }
+            self._book_dirty = True
             
             # Save to storage
-            self.save_signals()
+            self.store.upsert(signal_id, signal_data)
             
             self.logger.info(f"Added new signal: {signal_id}")
             # Initialize milestone tracking for this signal
-            self.signal_milestones[signal_id] = {
-                'last_pct': 0,
-                'reached_milestones': set(),
-                'last_update_time': datetime.now() - timedelta(hours=1),  # Allow immediate update
-                'take_profits_hit': set(),
-                'stop_loss_hit': False
-            }
+            self.signal_milestones[signal_id] = self._new_milestones()
             
             # Start the monitor if not running
             if not self.monitor_running and hasattr(self, 'update_callback'):
@@ -179,6 +188,18 @@ class SignalTracker:
             self.logger.error(f"Error adding signal: {e}")
             return None
         
+    def _new_milestones(self):
+        """Fresh milestone state for a signal; the first update is allowed immediately."""
+        return {
+            'last_pct': 0,
+            'reached_milestones': set(),
+            'last_update_time': datetime.now() - timedelta(hours=1),
+            'take_profits_hit': set(),
+            'stop_loss_hit': False,
+            'updates_sent': 0,
+            'last_status': None
+        }
+    
     async def continuous_price_monitor(self):
         """Continuously monitor prices for all active signals."""
         self.monitor_running = True
@@ -187,93 +208,12 @@ class SignalTracker:
         try:
             while True:
                 try:
-                    signals_to_update = []
-                    now = datetime.now()
-                    
-                    # Check each active signal
-                    for signal_id, signal in list(self.active_signals.items()):
-                        try:
-                            # Skip if updated too recently
-                            if signal_id in self.signal_milestones:
-                                milestone_data = self.signal_milestones[signal_id]
-                                last_update_time = milestone_data['last_update_time']
-                                minutes_since_update = (now - last_update_time).total_seconds() / 60
-                                
-                                if minutes_since_update < self.min_update_interval_minutes:
-                                    continue
-                            
-                            # Get current status
-                            status = self.check_signal_status(signal_id)
-                            if not status:
-                                continue
-                            
-                            # Check for significant changes
-                            update_needed = False
-                            
-                            # Get milestone data
-                            if signal_id in self.signal_milestones:
-                                milestone_data = self.signal_milestones[signal_id]
-                                last_pct = milestone_data['last_pct']
-                                reached_milestones = milestone_data['reached_milestones']
-                                take_profits_hit = milestone_data['take_profits_hit']
-                                stop_loss_hit = milestone_data['stop_loss_hit']
-                                
-                                current_pct = status['pct_to_tp1']
-                                pct_change = abs(current_pct - last_pct)
-                                
-                                # Check stop loss hit
-                                if status['stop_hit'] and not stop_loss_hit:
-                                    update_needed = True
-                                    milestone_data['stop_loss_hit'] = True
-                                
-                                # Check for take profits hit
-                                for i, hit in enumerate(status['tps_hit']):
-                                    if hit and i not in take_profits_hit:
-                                        update_needed = True
-                                        take_profits_hit.add(i)
-                                
-                                # Check for crossing thresholds
-                                for threshold in self.important_thresholds:
-                                    # Check if crossed threshold (in either direction)
-                                    crossed_up = last_pct < threshold and current_pct >= threshold
-                                    crossed_down = last_pct >= threshold and current_pct < threshold
-                                    
-                                    if crossed_up or crossed_down:
-                                        if crossed_up:
-                                            reached_milestones.add(threshold)
-                                        elif crossed_down and threshold in reached_milestones:
-                                            reached_milestones.remove(threshold)
-                                        
-                                        update_needed = True
-                                        break
-                                
-                                # Check for significant movement
-                                if pct_change >= self.min_price_change_pct:
-                                    update_needed = True
-                                
-                                # If update needed, add to list
-                                if update_needed:
-                                    self.logger.info(f"Signal {signal_id} needs update: last {last_pct:.1f}%, current {current_pct:.1f}%")
-                                    signals_to_update.append({
-                                        "signal_id": signal_id,
-                                        "signal": signal,
-                                        "status": status
-                                    })
-                                    
-                                    # Update tracking data
-                                    milestone_data['last_pct'] = current_pct
-                                    milestone_data['last_update_time'] = now
-                            
-                        except Exception as e:
-                            self.logger.error(f"Error monitoring signal {signal_id}: {e}")
+                    signals_to_update = await self.run_monitor_cycle()
                     
                     # If there are signals to update, call the callback
                     if signals_to_update and hasattr(self, 'update_callback'):
                         asyncio.create_task(self.update_callback(signals_to_update))
                     
-                    # Cleanup completed signals
-                    await self.cleanup_completed_signals_async()
-                    
                     # Sleep before next check
                     await asyncio.sleep(15)  # Check every 15 seconds
                     
@@ -288,38 +228,113 @@ class SignalTracker:
             self.logger.error(f"Continuous price monitor crashed: {e}")
             self.monitor_running = False
     
-    def remove_signal(self, signal_id):
+    async def run_monitor_cycle(self, max_age_hours=72):
+        """
+        One monitor pass: a single tick snapshot, one status per signal, and every
+        decision taken from those statuses.
+        
+        Update events, completion events (signals whose stop loss or final take
+        profit was hit carry an "outcome") and cleanup all come from the same
+        statuses, so no signal is evaluated twice in a cycle.
+        
+        Args:
+            max_age_hours (int): Signals older than this are expired
+        
+        Returns:
+            list: Signals requiring updates (same layout as check_signals_for_updates)
+        """
+        started = time.perf_counter()
+        computations_before = self.status_computations
+        
+        prices = await self.get_current_prices_async(
+            signal['symbol'] for signal in list(self.active_signals.values())
+        )
+        now = datetime.now()
+        statuses = self.evaluate_signals(prices)
+        
+        signals_to_update = self._collect_updates(statuses, now)
+        removals = self._cleanup_decisions(statuses, now, max_age_hours)
+        
+        outcomes = {signal_id: outcome for signal_id, outcome, _ in removals}
+        for signal_update in signals_to_update:
+            signal_update["outcome"] = outcomes.get(signal_update["signal_id"])
+        
+        signals_tracked = len(self.active_signals)
+        removed = self.remove_signals(removals)
+        
+        self.monitor_stats.update({
+            "cycles": self.monitor_stats["cycles"] + 1,
+            "status_computations": self.status_computations - computations_before,
+            "signals_tracked": signals_tracked,
+            "updates_emitted": len(signals_to_update),
+            "signals_removed": removed,
+            "cycle_ms": round((time.perf_counter() - started) * 1000, 2)
+        })
+        
+        if signals_tracked:
+            self.logger.debug(f"Monitor cycle: {self.monitor_stats}")
+        return signals_to_update
+    
+    def get_monitor_stats(self):
+        """Metrics of the last monitor cycle (status_computations should equal signals_tracked)."""
+        return dict(self.monitor_stats)
+    
+    def remove_signal(self, signal_id, outcome="removed", status=None):
         """
         Remove a signal from tracking.
         
         Args:
             signal_id (str): ID of the signal to remove
+            outcome (str): Outcome recorded in the signal history
+            status (dict, optional): Last computed status of the signal
         
         Returns:
             bool: True if successful, False otherwise
         """
+        if signal_id not in self.active_signals:
+            self.logger.warning(f"Signal not found for removal: {signal_id}")
+            return False
+        return self.remove_signals([(signal_id, outcome, status)]) == 1
+    
+    def remove_signals(self, removals):
+        """
+        Remove several signals in one store transaction and record them in the history.
+        
+        Args:
+            removals (list): (signal_id, outcome, status) tuples; outcome is 'take_profit',
+                'stop_loss', 'expired' or 'removed'
+        
+        Returns:
+            int: Number of signals removed
+        """
         try:
-            if signal_id in self.active_signals:
+            closures = [
+                (signal_id, self.active_signals[signal_id], outcome, status)
+                for signal_id, outcome, status in removals
+                if signal_id in self.active_signals
+            ]
+            if not closures:
+                return 0
+            
+            self.store.close_many(closures)
+            
+            self._book_dirty = True
+            for signal_id, _, outcome, _ in closures:
                 del self.active_signals[signal_id]
-                if signal_id in self.signal_updates:
-                    del self.signal_updates[signal_id]
-                
-                self.save_signals()
-                self.logger.info(f"Removed signal: {signal_id}")
-                return True
-            else:
-                self.logger.warning(f"Signal not found for removal: {signal_id}")
-                return False
+                self.signal_milestones.pop(signal_id, None)
+                self.logger.info(f"Removed signal: {signal_id} ({outcome})")
+            return len(closures)
         except Exception as e:
-            self.logger.error(f"Error removing signal: {e}")
-            return False
+            self.logger.error(f"Error removing signals: {e}")
+            return 0
     
-    def check_signal_status(self, signal_id):
+    def check_signal_status(self, signal_id, current_price=None):
         """
         Check the current status of a signal.
         
         Args:
             signal_id (str): ID of the signal to check
+            current_price (float, optional): Price already fetched from MT5; queried if omitted
         
         Returns:
             dict: Status information including current price, percent to target, etc.
@@ -333,88 +348,101 @@ class SignalTracker:
             symbol = signal["symbol"]
             
             # Get current price from MT5
-            current_price = self.get_current_price(symbol)
+            if current_price is None:
+                current_price = self.get_current_price(symbol)
             if current_price is None:
                 self.logger.warning(f"Could not get current price for {symbol}")
                 return None
             
-            # Extract values, converting strings to float if needed
-            direction = signal["direction"]
-            entry_price = float(signal["entry_price"]) if isinstance(signal["entry_price"], str) else signal["entry_price"]
-            stop_loss = float(signal["stop_loss"]) if "stop_loss" in signal and isinstance(signal["stop_loss"], str) else signal.get("stop_loss", 0)
-            
-            # Extract take-profit targets
-            take_profits = []
-            for i in range(1, 4):  # Look for TP1, TP2, TP3
-                tp_key = f"take_profit{i}" if i > 1 else "take_profit"
-                if tp_key in signal:
-                    tp_value = signal[tp_key]
-                    tp_value = float(tp_value) if isinstance(tp_value, str) else tp_value
-                    take_profits.append(tp_value)
-            
-            # Calculate status based on direction
-            if direction == "BUY":
-                in_profit = current_price > entry_price
-                profit_pips = self.calculate_pips(symbol, current_price - entry_price)
-                
-                # Calculate percentages to take profits
-                pct_to_tps = []
-                for tp in take_profits:
-                    entry_to_tp = tp - entry_price
-                    current_to_tp = tp - current_price
-                    pct_complete = ((entry_price - current_price) / entry_to_tp) * -100 if entry_to_tp != 0 else 0
-                    pct_to_tps.append(pct_complete)
-                
-                # Check if stop loss hit
-                stop_hit = stop_loss > 0 and current_price <= stop_loss
-                
-                # Check if take profits hit
-                tps_hit = [current_price >= tp for tp in take_profits]
-                
-            else:  # SELL signal
-                in_profit = current_price < entry_price
-                profit_pips = self.calculate_pips(symbol, entry_price - current_price)
-                
-                # Calculate percentages to take profits
-                pct_to_tps = []
-                for tp in take_profits:
-                    entry_to_tp = entry_price - tp
-                    current_to_tp = current_price - tp
-                    pct_complete = ((entry_price - current_price) / entry_to_tp) * 100 if entry_to_tp != 0 else 0
-                    pct_to_tps.append(pct_complete)
-                
-                # Check if stop loss hit
-                stop_hit = stop_loss > 0 and current_price >= stop_loss
-                
-                # Check if take profits hit
-                tps_hit = [current_price <= tp for tp in take_profits]
-            
-            # Create status object
-            status = {
-                "signal_id": signal_id,
-                "symbol": symbol,
-                "direction": direction,
-                "entry_price": entry_price,
-                "current_price": current_price,
-                "stop_loss": stop_loss,
-                "take_profits": take_profits,
-                "in_profit": in_profit,
-                "profit_pips": profit_pips,
-                "pct_to_tp1": pct_to_tps[0] if pct_to_tps else 0,
-                "pct_to_tps": pct_to_tps,
-                "stop_hit": stop_hit,
-                "tps_hit": tps_hit
-            }
-            
-            # Check if we should update last status
-            if signal_id in self.signal_updates:
-                self.signal_updates[signal_id]["last_status"] = status
-            
-            return status
+            return self.evaluate_symbol_signals(symbol, [signal_id], current_price)[0]
             
         except Exception as e:
             self.logger.error(f"Error checking signal status: {e}")
             return None
+    
+    def _current_book(self):
+        """The signal book, rebuilt first if the active signals changed."""
+        if self._book_dirty:
+            self.signal_book.build(self.active_signals)
+            self._book_dirty = False
+        return self.signal_book
+    
+    def evaluate_symbol_signals(self, symbol, signal_ids, current_price):
+        """
+        Compute the status of several signals on one symbol against a single price.
+        
+        Args:
+            symbol (str): Symbol shared by the signals
+            signal_ids (list): IDs of active signals on that symbol
+            current_price (float): Current price for the symbol
+        
+        Returns:
+            list: Status dicts (same layout as check_signal_status), in input order;
+                  signals with malformed levels are skipped
+        """
+        statuses = self.evaluate_signals({symbol: current_price}, signal_ids)
+        return [statuses[signal_id] for signal_id in signal_ids if signal_id in statuses]
+    
+    def evaluate_signals(self, prices, signal_ids=None):
+        """
+        Compute the status of every active signal whose symbol has a price.
+        
+        The whole signal book is evaluated in one vectorized pass (see SignalBook);
+        status dicts are then built only for the signals that were priced.
+        
+        Args:
+            prices (dict): {symbol: price} tick snapshot
+            signal_ids (iterable, optional): Restrict the result to these signals
+        
+        Returns:
+            dict: {signal_id: status}
+        """
+        book = self._current_book()
+        result = book.evaluate(prices)
+        
+        selected = result["priced"]
+        if signal_ids is not None:
+            wanted = np.zeros(len(book), dtype=bool)
+            wanted[[book.row_index[s] for s in signal_ids if s in book.row_index]] = True
+            selected = selected & wanted
+        
+        statuses = {}
+        for i in np.flatnonzero(selected):
+            signal_id = book.signal_ids[i]
+            count = book.tp_count[i]
+            pct_list = result["pct_to_tps"][i, :count].tolist()
+            statuses[signal_id] = {
+                "signal_id": signal_id,
+                "symbol": book.symbol_of(i),
+                "direction": book.directions[i],
+                "entry_price": float(book.entry[i]),
+                "current_price": float(result["price"][i]),
+                "stop_loss": float(book.stop[i]),
+                "take_profits": list(book.take_profits[i]),
+                "in_profit": bool(result["in_profit"][i]),
+                "profit_pips": float(result["profit_pips"][i]),
+                "pct_to_tp1": pct_list[0] if pct_list else 0,
+                "pct_to_tps": pct_list,
+                "stop_hit": bool(result["stop_hit"][i]),
+                "tps_hit": result["tps_hit"][i, :count].tolist()
+            }
+        
+        self.status_computations += len(statuses)
+        return statuses
+    
+    def _threshold_crossings(self, last_pcts, current_pcts):
+        """
+        First important threshold crossed by each signal between two progress readings.
+        
+        Returns:
+            tuple: (crossed_up, crossed_down) lists holding a threshold or None per signal
+        """
+        crossed_up, crossed_down = threshold_crossings(last_pcts, current_pcts, self.important_thresholds)
+        return (
+            [None if np.isnan(v) else v.item() for v in crossed_up],
+            [None if np.isnan(v) else v.item() for v in crossed_down]
+        )
+    
     def calculate_pips(self, symbol, price_difference):
         """
         Calculate pips based on the asset type.
@@ -457,15 +485,18 @@ class SignalTracker:
                 if not self.init_mt5():
                     return None
             
-            # Ensure symbol is selected
-            if not mt5.symbol_select(symbol, True):
-                self.logger.error(f"Failed to select symbol {symbol}: {mt5.last_error()}")
-                return None
+            # Ensure symbol is selected (once per connection)
+            if symbol not in self._selected_symbols:
+                if not mt5.symbol_select(symbol, True):
+                    self.logger.error(f"Failed to select symbol {symbol}: {mt5.last_error()}")
+                    return None
+                self._selected_symbols.add(symbol)
             
             # Get current tick
             tick = mt5.symbol_info_tick(symbol)
             if tick is None:
                 self.logger.error(f"Failed to get tick for {symbol}: {mt5.last_error()}")
+                self._selected_symbols.discard(symbol)
                 return None
             
             # Return average of bid and ask
@@ -475,156 +506,232 @@ class SignalTracker:
             self.logger.error(f"Error getting current price for {symbol}: {e}")
             return None
     
-    def check_signals_for_updates(self, min_pct_change=5, min_update_interval_minutes=5):
+    async def get_current_price_async(self, symbol):
+        """Get current price on the MT5 gateway thread without blocking the event loop."""
+        return await self.gateway.run(self.get_current_price, symbol)
+    
+    def get_tick_snapshot(self, symbols):
         """
-        Check all active signals for significant changes that warrant an update.
+        Get one current price per distinct symbol.
+        
+        Returns:
+            dict: {symbol: price}; symbols without a price are omitted
+        """
+        prices = {}
+        for symbol in set(symbols):
+            price = self.get_current_price(symbol)
+            if price is not None:
+                prices[symbol] = price
+        return prices
+    
+    async def get_current_prices_async(self, symbols):
+        """Tick snapshot for several symbols in a single MT5 gateway call."""
+        return await self.gateway.run(self.get_tick_snapshot, list(symbols))
+    
+    async def check_signal_status_async(self, signal_id):
+        """Async version of check_signal_status; the price is fetched through the MT5 gateway."""
+        signal = self.active_signals.get(signal_id)
+        if signal is None:
+            self.logger.warning(f"Signal not found for status check: {signal_id}")
+            return None
+        
+        current_price = await self.get_current_price_async(signal["symbol"])
+        if current_price is None:
+            self.logger.warning(f"Could not get current price for {signal['symbol']}")
+            return None
+        
+        return self.check_signal_status(signal_id, current_price=current_price)
+    
+    def _collect_updates(self, statuses, now, min_pct_change=None, min_update_interval_minutes=None):
+        """
+        Decide which evaluated signals need a follow-up message.
+        
+        A signal is reported when its stop loss or a new take profit is hit (regardless
+        of the update interval, so completions are never swallowed), or - once the
+        update interval has passed - when it crosses an important threshold or moves
+        at least min_pct_change. signal_milestones is updated for reported signals.
         
         Args:
-            min_pct_change (float): Minimum percentage change to trigger update
-            min_update_interval_minutes (int): Minimum minutes between updates
+            statuses (dict): {signal_id: status} from evaluate_signals
+            now (datetime): Time of the price snapshot
+            min_pct_change (float, optional): Defaults to min_price_change_pct
+            min_update_interval_minutes (int, optional): Defaults to min_update_interval_minutes
         
         Returns:
             list: Signals requiring updates
         """
-        try:
-            signals_to_update = []
-            now = datetime.now()
-            
-            for signal_id, signal in self.active_signals.items():
-                try:
-                    # Skip if updated too recently
-                    if signal_id in self.signal_updates:
-                        last_update = self.signal_updates[signal_id]['last_update_time']
-                        time_since_update = (now - last_update).total_seconds() / 60
-                        
-                        if time_since_update < min_update_interval_minutes:
-                            continue
-                    
-                    # Check current status
-                    status = self.check_signal_status(signal_id)
-                    if not status:
-                        continue
-                    
-                    # Get the last update percentage
-                    last_pct = 0
-                    if signal_id in self.signal_updates:
-                        last_pct = self.signal_updates[signal_id].get('last_update_pct', 0)
-                    
-                    current_pct = status['pct_to_tp1']
-                    pct_change = abs(current_pct - last_pct)
-                    
-                    # Check for significant changes
-                    update_needed = False
-                    
-                    # Hitting take profits or stop loss
-                    if any(status['tps_hit']) or status['stop_hit']:
+        if min_pct_change is None:
+            min_pct_change = self.min_price_change_pct
+        if min_update_interval_minutes is None:
+            min_update_interval_minutes = self.min_update_interval_minutes
+        
+        tracked = []
+        for signal_id, status in statuses.items():
+            if signal_id not in self.active_signals:
+                continue
+            milestone_data = self.signal_milestones.setdefault(signal_id, self._new_milestones())
+            milestone_data['last_status'] = status
+            tracked.append((signal_id, status, milestone_data))
+        
+        if not tracked:
+            return []
+        
+        last_pcts = np.array([milestone_data['last_pct'] for _, _, milestone_data in tracked], dtype=float)
+        current_pcts = np.array([status['pct_to_tp1'] for _, status, _ in tracked], dtype=float)
+        crossed_up, crossed_down = self._threshold_crossings(last_pcts, current_pcts)
+        significant_move = np.abs(current_pcts - last_pcts) >= min_pct_change
+        
+        signals_to_update = []
+        for i, (signal_id, status, milestone_data) in enumerate(tracked):
+            try:
+                reached_milestones = milestone_data['reached_milestones']
+                take_profits_hit = milestone_data['take_profits_hit']
+                update_needed = False
+                
+                # Check stop loss hit
+                if status['stop_hit'] and not milestone_data['stop_loss_hit']:
+                    update_needed = True
+                    milestone_data['stop_loss_hit'] = True
+                
+                # Check for take profits hit
+                for tp_index, hit in enumerate(status['tps_hit']):
+                    if hit and tp_index not in take_profits_hit:
                         update_needed = True
-                    
-                    # Significant movement toward TP1
-                    elif pct_change >= min_pct_change:
+                        take_profits_hit.add(tp_index)
+                
+                # Progress updates respect the minimum interval between messages
+                minutes_since_update = (now - milestone_data['last_update_time']).total_seconds() / 60
+                if minutes_since_update >= min_update_interval_minutes:
+                    # Check for crossing thresholds (first crossed threshold only)
+                    if crossed_up[i] is not None:
+                        reached_milestones.add(crossed_up[i])
+                        update_needed = True
+                    elif crossed_down[i] is not None:
+                        reached_milestones.discard(crossed_down[i])
                         update_needed = True
                     
-                    # Crossing important thresholds (25%, 50%, 75%, 90%)
-                    important_thresholds = [25, 50, 75, 90]
-                    for threshold in important_thresholds:
-                        if (last_pct < threshold and current_pct >= threshold) or (last_pct > threshold and current_pct <= threshold):
-                            update_needed = True
-                            break
-                    
-                    # Check for newly hit take profits
-                    if signal_id in self.signal_updates:
-                        completed_tps = self.signal_updates[signal_id].get('completed_tps', [])
-                        for i, hit in enumerate(status['tps_hit']):
-                            if hit and i not in completed_tps:
-                                update_needed = True
-                                completed_tps.append(i)
-                                self.signal_updates[signal_id]['completed_tps'] = completed_tps
-                    
-                    if update_needed:
-                        self.logger.info(f"Signal {signal_id} needs update: last {last_pct:.1f}%, current {current_pct:.1f}%")
-                        signals_to_update.append({
-                            "signal_id": signal_id,
-                            "signal": signal,
-                            "status": status
-                        })
-                        
-                        # Update tracking data
-                        if signal_id in self.signal_updates:
-                            self.signal_updates[signal_id]['last_update_pct'] = current_pct
-                            self.signal_updates[signal_id]['last_update_time'] = now
-                            self.signal_updates[signal_id]['updates_sent'] += 1
+                    # Check for significant movement
+                    if significant_move[i]:
+                        update_needed = True
+                
+                # If update needed, add to list
+                if update_needed:
+                    last_pct = milestone_data['last_pct']
+                    current_pct = status['pct_to_tp1']
+                    self.logger.info(f"Signal {signal_id} needs update: last {last_pct:.1f}%, current {current_pct:.1f}%")
+                    signals_to_update.append({
+                        "signal_id": signal_id,
+                        "signal": self.active_signals[signal_id],
+                        "status": status
+                    })
                     
-                except Exception as e:
-                    self.logger.error(f"Error processing signal {signal_id}: {e}")
-            
-            return signals_to_update
+                    # Update tracking data
+                    milestone_data['last_pct'] = current_pct
+                    milestone_data['last_update_time'] = now
+                    milestone_data['updates_sent'] += 1
+                
+            except Exception as e:
+                self.logger.error(f"Error processing signal {signal_id}: {e}")
+        
+        return signals_to_update
+    
+    def check_signals_for_updates(self, min_pct_change=None, min_update_interval_minutes=None, prices=None):
+        """
+        Check all active signals for significant changes that warrant an update.
+        
+        Args:
+            min_pct_change (float, optional): Minimum percentage change to trigger update
+            min_update_interval_minutes (int, optional): Minimum minutes between updates
+            prices (dict, optional): {symbol: price} already fetched from MT5
+        
+        Returns:
+            list: Signals requiring updates
+        """
+        try:
+            if prices is None:
+                prices = self.get_tick_snapshot(signal['symbol'] for signal in self.active_signals.values())
+            statuses = self.evaluate_signals(prices)
+            return self._collect_updates(statuses, datetime.now(), min_pct_change, min_update_interval_minutes)
             
         except Exception as e:
             self.logger.error(f"Error checking signals for updates: {e}")
             return []
     
-    def cleanup_completed_signals(self, max_age_hours=72):
+    def _cleanup_decisions(self, statuses, now, max_age_hours=72):
+        """
+        Signals to close, decided from already computed statuses.
+        
+        Returns:
+            list: (signal_id, outcome, status) tuples for remove_signals
+        """
+        removals = []
+        for signal_id, signal in list(self.active_signals.items()):
+            try:
+                # Check age
+                timestamp = signal['timestamp']
+                if isinstance(timestamp, str):
+                    try:
+                        timestamp = datetime.fromisoformat(timestamp)
+                    except ValueError:
+                        timestamp = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
+                
+                age_hours = (now - timestamp).total_seconds() / 3600
+                
+                if age_hours > max_age_hours:
+                    removals.append((signal_id, "expired", statuses.get(signal_id)))
+                    continue
+                
+                status = statuses.get(signal_id)
+                if not status:
+                    continue
+                
+                # Remove if stop loss hit
+                if status['stop_hit']:
+                    removals.append((signal_id, "stop_loss", status))
+                    continue
+                
+                # Remove if all take profits hit
+                if all(status['tps_hit']):
+                    removals.append((signal_id, "take_profit", status))
+                    continue
+                
+            except Exception as e:
+                self.logger.error(f"Error checking signal {signal_id} for cleanup: {e}")
+        
+        return removals
+    
+    def cleanup_completed_signals(self, max_age_hours=72, prices=None):
         """
         Remove signals that are completed or too old.
         
         Args:
             max_age_hours (int): Maximum age in hours for signals to be kept
+            prices (dict, optional): {symbol: price} already fetched from MT5
         
         Returns:
             int: Number of signals removed
         """
         try:
-            signals_to_remove = []
-            now = datetime.now()
+            if prices is None:
+                prices = self.get_tick_snapshot(s['symbol'] for s in self.active_signals.values())
+            statuses = self.evaluate_signals(prices)
             
-            for signal_id, signal in self.active_signals.items():
-                try:
-                    # Check age
-                    timestamp = signal['timestamp']
-                    if isinstance(timestamp, str):
-                        try:
-                            timestamp = datetime.fromisoformat(timestamp)
-                        except ValueError:
-                            timestamp = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
-                    
-                    age_hours = (now - timestamp).total_seconds() / 3600
-                    
-                    if age_hours > max_age_hours:
-                        signals_to_remove.append(signal_id)
-                        continue
-                    
-                    # Check status
-                    status = self.check_signal_status(signal_id)
-                    if not status:
-                        continue
-                    
-                    # Remove if stop loss hit
-                    if status['stop_hit']:
-                        signals_to_remove.append(signal_id)
-                        continue
-                    
-                    # Remove if all take profits hit
-                    if all(status['tps_hit']):
-                        signals_to_remove.append(signal_id)
-                        continue
-                    
-                except Exception as e:
-                    self.logger.error(f"Error checking signal {signal_id} for cleanup: {e}")
+            removed = self.remove_signals(self._cleanup_decisions(statuses, datetime.now(), max_age_hours))
             
-            # Remove signals
-            for signal_id in signals_to_remove:
-                self.remove_signal(signal_id)
-            
-            self.logger.info(f"Cleaned up {len(signals_to_remove)} completed signals")
-            return len(signals_to_remove)
+            self.logger.info(f"Cleaned up {removed} completed signals")
+            return removed
             
         except Exception as e:
             self.logger.error(f"Error cleaning up signals: {e}")
             return 0
     
-    async def cleanup_completed_signals_async(self):
-        """Async version of cleanup_completed_signals."""
-        return self.cleanup_completed_signals()  
+    async def cleanup_completed_signals_async(self, max_age_hours=72, prices=None):
+        """Async version of cleanup_completed_signals; prices are fetched through the MT5 gateway."""
+        if prices is None:
+            prices = await self.get_current_prices_async(
+                signal['symbol'] for signal in list(self.active_signals.values())
+            )
+        return self.cleanup_completed_signals(max_age_hours, prices=prices)
  
     def get_signal_history(self, days=7):
         """
@@ -636,12 +743,23 @@ class SignalTracker:
         Returns:
             dict: Statistics on signal performance
         """
-        # This would typically query a database or logs, but for now we'll just return basic stats
+        try:
+            outcomes = self.store.history(days)
+        except Exception as e:
+            self.logger.error(f"Error reading signal history: {e}")
+            outcomes = {}
+        
+        successful = outcomes.get("take_profit", 0)
+        failed = outcomes.get("stop_loss", 0)
+        closed = sum(outcomes.values())
+        
         return {
-            "total_signals": len(self.active_signals),
+            "total_signals": closed + len(self.active_signals),
             "active_signals": len(self.active_signals),
-            "successful_signals": 0,
-            "failed_signals": 0
+            "successful_signals": successful,
+            "failed_signals": failed,
+            "expired_signals": outcomes.get("expired", 0),
+            "win_rate": round(successful / (successful + failed) * 100, 1) if successful + failed else 0.0
         }
 
     def register_update_callback(self, callback_function):
@@ -652,9 +770,15 @@ class SignalTracker:
     async def monitor_active_signals(self):
         """
         Monitor active signals for significant changes and trigger callback when needed
+        
+        While the continuous price monitor is running it already performs this pass
+        every cycle, so this call does nothing rather than evaluating signals again.
         """
         try:
-            signals_to_update = self.check_signals_for_updates()
+            if self.monitor_running:
+                return 0
+            
+            signals_to_update = await self.run_monitor_cycle()
             
             # If there are signals that need updates and a callback is registered
             if signals_to_update and hasattr(self, 'update_callback'):
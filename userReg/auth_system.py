@@ -5,6 +5,7 @@ import random
 import string
 from datetime import datetime, timedelta
 from mySQL.mysql_manager import get_mysql_connection
+from mySQL.account_lookup import get_account_lookup
 
 class TradingAccountAuth:
     def __init__(self, db_path=None):
@@ -40,18 +41,19 @@ class TradingAccountAuth:
             print(f"Account {account_number} validation: FAILED - not numeric")
             return False
 
-    def verify_account(self, account_number, user_id):
+    async def verify_account(self, account_number, user_id):
         """Verify if the account number exists in the real-time MySQL database."""
+        lookup = get_account_lookup()
         try:
             print(f"Verifying account {account_number} against MySQL database")
             
-            # First check if MySQL is available
-            if not self.mysql_db or not self.mysql_db.is_connected():
+            # First check if MySQL (or its local mirror) is available
+            if not await lookup.available():
                 print("MySQL not available, falling back to CSV method")
-                return self._verify_account_csv_fallback(account_number, user_id)
+                return await lookup.run(self._verify_account_csv_fallback, account_number, user_id)
             
-            # Verify account exists in MySQL
-            verification_result = self.mysql_db.verify_account_exists(account_number)
+            # Verify account exists in MySQL (off the event loop, with a timeout)
+            verification_result = await lookup.verify_account(account_number)
             
             if verification_result['exists']:
                 account_owner = verification_result['name']
@@ -72,7 +74,7 @@ class TradingAccountAuth:
                     "account_email": account_email,
                     "account_balance": account_balance,
                     "account_group": account_group,
-                    "verification_method": "mysql"
+                    "verification_method": verification_result.get('source', 'mysql')
                 }
                 
                 return True
@@ -84,7 +86,7 @@ class TradingAccountAuth:
         except Exception as e:
             print(f"Error verifying account against DataBase: {e}")
             # Fall back to CSV method
-            return self._verify_account_csv_fallback(account_number, user_id)
+            return await lookup.run(self._verify_account_csv_fallback, account_number, user_id)
     
     def _verify_account_csv_fallback(self, account_number, user_id):
         """Fallback method using CSV file if MySQL is unavailable."""
@@ -718,7 +718,7 @@ async def handle_account_verification(update: Update, context: ContextTypes.DEFA
             return TRADING_ACCOUNT
         
         # Verify the account
-        if auth.verify_account(account_number, user_id):
+        if await auth.verify_account(account_number, user_id):
             # Account verified successfully
             await update.message.reply_text("Trading account verified successfully! You now have full access to the group.")
             
@@ -774,8 +774,8 @@ async def enhanced_trading_account(update: Update, context: ContextTypes.DEFAULT
         return TRADING_ACCOUNT
     
     # Connect to MySQL and verify account
-    mysql_db = get_mysql_connection()
-    if not mysql_db.is_connected():
+    lookup = get_account_lookup()
+    if not await lookup.available():
         await update.message.reply_text(
             "⚠️ Unable to verify account at the moment. Please try again later."
         )
@@ -784,7 +784,7 @@ async def enhanced_trading_account(update: Update, context: ContextTypes.DEFAULT
     # Get real account information including balance
     try:
         account_int = int(account_number)
-        account_info = mysql_db.verify_account_exists(account_number)
+        account_info = await lookup.verify_account(account_number)
 
         if not account_info['exists']:
             # Account not found...
@@ -875,9 +875,9 @@ async def update_local_db_vip_status(user_id, service_type, granted_by_admin_id)
         
         if user_info and user_info.get('trading_account'):
             try:
-                mysql_db = get_mysql_connection()
-                if mysql_db and mysql_db.is_connected():
-                    account_info = mysql_db.verify_account_exists(user_info.get('trading_account'))
+                lookup = get_account_lookup()
+                if await lookup.available():
+                    account_info = await lookup.verify_account(user_info.get('trading_account'))
                     if account_info['exists']:
                         real_time_balance = float(account_info.get('balance', 0))
             except Exception as e:
@@ -1462,8 +1462,8 @@ async def process_account_number_text(update, context, user_id, message_text):
             return
         
         # Connect to MySQL and verify
-        mysql_db = get_mysql_connection()
-        if not mysql_db.is_connected():
+        lookup = get_account_lookup()
+        if not await lookup.available():
             await update.message.reply_text(
                 "<b>⚠️ Connection Issue</b>\n\n"
                 "Unable to verify account at the moment. Please try again later.",
@@ -1475,7 +1475,7 @@ async def process_account_number_text(update, context, user_id, message_text):
             return
         
         try:
-            account_info = mysql_db.verify_account_exists(account_number)
+            account_info = await lookup.verify_account(account_number)
 
             if not account_info['exists']:
                 await handle_account_not_found(update, context, user_id, account_number)
@@ -2645,10 +2645,10 @@ async def handle_vip_request(query, context, user_id, callback_data):
     account_number = user_info.get("trading_account", "Unknown")
     account_balance = user_info.get("account_balance", 0)
     if account_number:
-        mysql_db = get_mysql_connection()
-        if mysql_db.is_connected():
+        lookup = get_account_lookup()
+        if await lookup.available():
             try:
-                account_info = mysql_db.verify_account_exists(account_number)
+                account_info = await lookup.verify_account(account_number)
                 if account_info['exists']:
                     account_balance = float(account_info.get('balance', 0))
                 else: